@@ -0,0 +1,277 @@
+# (1 + epsilon) approximate shortest paths for latency critical queries
+#
+# Main functions:
+#     1) ApproximateGraph.dij() --> Returns distances within a factor of
+#                                   1 + epsilon of the shortest ones
+#     2) ApproximateGraph.dij_paths() --> Returns the paths those
+#                                         distances are the lengths of
+#     3) approx_dij() --> One off query, rounds the graph and searches it
+#
+# Two ways of trading exactness for speed, each with the same guarantee:
+# the distance returned is the real length of a path and at most
+# (1 + epsilon) times the shortest distance.
+#     Rounded weights (default) -- every weight is rounded up to a whole
+#         number of units of epsilon * (smallest positive weight), so no
+#         edge grows by more than a factor of 1 + epsilon. Dijkstra on
+#         the rounded weights keeps the nodes in buckets of equal rounded
+#         distance and only the distinct bucket keys go through the heap,
+#         the larger epsilon the fewer buckets and heap operations.
+#     Weighted A* (heuristic given) -- nodes are taken in the order of
+#         distance + (1 + epsilon) * heuristic and never reopened, so the
+#         search heads for the target and touches a fraction of the
+#         graph. The heuristic must be a consistent lower bound of the
+#         distance to the target (e.g. straight line distance times the
+#         smallest weight per unit of length).
+# Queries to a target also return a lower bound of the shortest
+# distance, so the true distance is known to lie between the two.
+#
+# Graph representation of the input is the same as the engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import math
+import heapq
+import collections
+from src.Dijkstra import NoPathError
+
+
+class ApproximateGraph(object):
+    '''Copy of a graph with weights rounded for (1 + epsilon) approximate
+    searches, queries take and return the original nodes
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        epsilon -- allowed relative error, > 0
+    Attributes:
+        nodes -- tuple of the nodes, position --> node
+        index -- dict node --> position
+        adj -- tuple with the (position, rounded weight, weight) edges of
+               each position
+        unit -- length of one rounded weight unit
+    Raises:
+        TypeError -- if graph is not a dict or a weight is not a number
+        ValueError -- if epsilon is not positive, a weight is negative or
+                      an edge goes to a node that is not a key
+    '''
+
+    def __init__(self, graph, epsilon=0.1):
+        if not isinstance(graph, dict):
+            raise TypeError('Graph input must be a dictionary')
+        if not epsilon > 0:
+            raise ValueError('epsilon must be positive')
+
+        nodes = tuple(graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        smallest = math.inf
+        for v in nodes:
+            for u, w in graph[v]:
+                if u not in index:
+                    raise ValueError('edge %r --> %r goes to a node that is '
+                                     'not in the graph' % (v, u))
+                if isinstance(w, bool) or not isinstance(w, (int, float)):
+                    raise TypeError('weight of %r --> %r is not a number'
+                                    % (v, u))
+                if w < 0:
+                    raise ValueError('approximate searches require '
+                                     'non-negative weights')
+                if 0 < w < smallest:
+                    smallest = w
+
+        self.epsilon = epsilon
+        self.unit = epsilon * smallest if smallest < math.inf else 1.0
+        unit = self.unit
+        ceil = math.ceil
+        self.nodes = nodes
+        self.index = index
+        self.adj = tuple(tuple((index[u], ceil(w / unit), w)
+                               for u, w in graph[v]) for v in nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def _position(self, node, name):
+        try:
+            return self.index[node]
+        except (KeyError, TypeError):
+            raise ValueError('%s argument not a valid node' % name)
+
+    def dij(self, s, t=None, heuristic=None):
+        '''Calculates distances within a factor of 1 + epsilon of the
+        shortest ones, the search stops as soon as t is reached if it is
+        given
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find the distance to
+            heuristic -- Optional function node --> consistent lower
+                         bound of its distance to t, searches with
+                         weighted A* instead of the rounded weights
+        Return:
+            (distance, lower bound) of the shortest distance to t if t is
+            given, else dict with the distance of every node (infinity if
+            unreachable)
+        Raises:
+            ValueError -- if s or t are not valid nodes or a heuristic is
+                          given without t
+            NoPathError -- if there is no path to target node
+        '''
+        dist, prev, bound = self._search(s, t, heuristic)
+        if t is None:
+            distances = dict.fromkeys(self.nodes, math.inf)
+            nodes = self.nodes
+            for i, d in dist.items():
+                distances[nodes[i]] = d
+            return distances
+
+        ti = self.index[t]
+        if ti not in prev:
+            raise NoPathError()
+        return dist[ti], bound
+
+    def dij_paths(self, s, t=None, heuristic=None):
+        '''Constructs paths at most 1 + epsilon times longer than the
+        shortest ones
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find the path to
+            heuristic -- Optional function node --> consistent lower
+                         bound of its distance to t, searches with
+                         weighted A* instead of the rounded weights
+        Return:
+            list of nodes from s to t if t is given, else dict with the
+            path to every node ([] if unreachable)
+        Raises:
+            ValueError -- if s or t are not valid nodes or a heuristic is
+                          given without t
+            NoPathError -- if there is no path to target node
+        '''
+        dist, prev, bound = self._search(s, t, heuristic)
+        nodes = self.nodes
+        si = self.index[s]
+        if t is not None:
+            return _walk(nodes, prev, si, self.index[t])
+
+        paths = {node: [] for node in nodes}
+        for i in prev:
+            paths[nodes[i]] = _walk(nodes, prev, si, i)
+        return paths
+
+    def _search(self, s, t, heuristic):
+        '''Returns (dist, prev, lower bound) dicts keyed by position'''
+        si = self._position(s, 's')
+        ti = self._position(t, 't') if t is not None else -1
+        if heuristic is None:
+            return self._bucket_search(si, ti)
+        if t is None:
+            raise ValueError('a heuristic needs a target node')
+        return self._weighted_astar(si, ti, heuristic)
+
+    def _bucket_search(self, si, ti):
+        '''Dijkstra on the rounded weights, nodes wait in a bucket per
+        rounded distance and the heap only orders the bucket keys
+        '''
+        adj = self.adj
+        units = {si: 0}
+        dist = {si: 0}
+        prev = {si: si}
+        buckets = {0: [si]}
+        keys = [0]
+
+        while keys:
+            key = heapq.heappop(keys)
+            # Zero weight edges can refill the bucket of the current key,
+            # that key is pushed again and taken next
+            for vi in buckets.pop(key):
+                if units[vi] != key:
+                    continue
+                if vi == ti:
+                    return dist, prev, key * self.unit / (1 + self.epsilon)
+                dv = dist[vi]
+                for ui, k, w in adj[vi]:
+                    nk = key + k
+                    if nk < units.get(ui, nk + 1):
+                        units[ui] = nk
+                        dist[ui] = dv + w
+                        prev[ui] = vi
+                        bucket = buckets.get(nk)
+                        if bucket is None:
+                            buckets[nk] = [ui]
+                            heapq.heappush(keys, nk)
+                        else:
+                            bucket.append(ui)
+        return dist, prev, None
+
+    def _weighted_astar(self, si, ti, heuristic):
+        '''A* with the heuristic weighted by 1 + epsilon, no node is
+        expanded twice
+        '''
+        adj = self.adj
+        nodes = self.nodes
+        weight = 1 + self.epsilon
+        dist = {si: 0}
+        prev = {si: si}
+        closed = set()
+        estimate = {}
+        PQ = [(0, si)]
+
+        while PQ:
+            f, vi = heapq.heappop(PQ)
+            if vi in closed:
+                continue
+            if vi == ti:
+                return dist, prev, dist[ti] / weight
+            closed.add(vi)
+            dv = dist[vi]
+            for ui, k, w in adj[vi]:
+                if ui in closed:
+                    continue
+                nd = dv + w
+                if nd < dist.get(ui, math.inf):
+                    dist[ui] = nd
+                    prev[ui] = vi
+                    h = estimate.get(ui)
+                    if h is None:
+                        h = estimate[ui] = weight * heuristic(nodes[ui])
+                    heapq.heappush(PQ, (nd + h, ui))
+        return dist, prev, None
+
+
+def approx_dij(adjacentList, s, t=None, epsilon=0.1, heuristic=None):
+    '''Calculates distances within a factor of 1 + epsilon of the
+    shortest ones, see ApproximateGraph.dij(). The rounding is done for
+    every call, build an ApproximateGraph once for repeated queries
+
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pairs
+                        represents the directed graph
+        s -- source node to start with
+        t -- Optional target node to find the distance to
+        epsilon -- allowed relative error, > 0
+        heuristic -- Optional function node --> consistent lower bound
+                     of its distance to t
+    Return:
+        (distance, lower bound) if t is given, else dict with the
+        distance of every node
+    Raises:
+        TypeError -- if adjacentList is not a dict
+        ValueError -- if s or t are not valid nodes, epsilon is not
+                      positive or a weight is negative
+        NoPathError -- if there is no path to target node
+    '''
+    return ApproximateGraph(adjacentList, epsilon).dij(s, t, heuristic)
+
+
+def _walk(nodes, prev, si, ti):
+    '''Walks the previous positions back from ti to si'''
+    if ti not in prev:
+        raise NoPathError()
+
+    path = collections.deque([nodes[ti]])
+    while ti != si:
+        ti = prev[ti]
+        path.appendleft(nodes[ti])
+    return list(path)
@@ -0,0 +1,228 @@
+# Implementation of breadth first search shortest paths for graphs whose
+# weights are all the same (BFS) or are all 0 or 1 (0-1 BFS)
+#
+# Both run in O(V + E) without a heap and are drop in replacements for
+# Dijkstra's dij() and dij_paths() on those graphs
+#
+# Main functions:
+#     1) bfs() --> Returns shortest distances for uniform weights
+#     2) bfs_paths() --> Returns shortest paths for uniform weights
+#     3) zero_one_bfs() --> Returns shortest distances for {0, 1} weights
+#     4) zero_one_bfs_paths() --> Returns shortest paths for {0, 1} weights
+#
+# Graph representation is the same as Dijkstra:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import collections
+from src.Dijkstra import NoPathError, shortest_path
+
+
+def bfs(adjacentList, s, t=None):
+    '''Calculates shortest distances for each node from a source when
+    every edge has the same weight
+
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pairs
+                        represents the directed graph
+        s -- int representing the source node to start with
+        t -- int representing the target node to find shortest dist to,
+             the search stops once it is dequeued
+    Returns:
+        dict with shortest distances for all nodes or shortest distance
+        to target if target param is given
+    Raises:
+        ValueError -- if the weights are not all the same or negative
+        NoPathError -- if there is no path to target node
+    '''
+    distances, prev = construct_paths(adjacentList, s, _targets(t))
+    return _distance_result(distances, t)
+
+
+def bfs_paths(adjacentList, s, t=None):
+    '''Constructs shortest paths for every node in graph when every edge
+    has the same weight unless a target node is specified
+
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pair
+                        representing the directed graph
+        s -- int representing the source node to start with
+        t -- int representing the target node to find shortest path to,
+             the search stops once it is dequeued
+    Return:
+        dict with the shortest paths for each node in graph if target
+        is None, else list with shortest path from src to target node
+    Raises:
+        ValueError -- if the weights are not all the same or negative
+        NoPathError -- if there is no path to target node
+    '''
+    distances, prev = construct_paths(adjacentList, s, _targets(t))
+    return _path_result(adjacentList, s, t, prev)
+
+
+def zero_one_bfs(adjacentList, s, t=None):
+    '''Calculates shortest distances for each node from a source when
+    every edge has a weight of 0 or 1
+
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pairs
+                        represents the directed graph
+        s -- int representing the source node to start with
+        t -- int representing the target node to find shortest dist to,
+             the search stops once it is dequeued
+    Returns:
+        dict with shortest distances for all nodes or shortest distance
+        to target if target param is given
+    Raises:
+        ValueError -- if a weight is not 0 or 1
+        NoPathError -- if there is no path to target node
+    '''
+    distances, prev = construct_paths_01(adjacentList, s, _targets(t))
+    return _distance_result(distances, t)
+
+
+def zero_one_bfs_paths(adjacentList, s, t=None):
+    '''Constructs shortest paths for every node in graph when every edge
+    has a weight of 0 or 1 unless a target node is specified
+
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pair
+                        representing the directed graph
+        s -- int representing the source node to start with
+        t -- int representing the target node to find shortest path to,
+             the search stops once it is dequeued
+    Return:
+        dict with the shortest paths for each node in graph if target
+        is None, else list with shortest path from src to target node
+    Raises:
+        ValueError -- if a weight is not 0 or 1
+        NoPathError -- if there is no path to target node
+    '''
+    distances, prev = construct_paths_01(adjacentList, s, _targets(t))
+    return _path_result(adjacentList, s, t, prev)
+
+
+def construct_paths(adjacentList, s, targets=None):
+    '''Runs BFS keeping track of previous nodes for each node
+
+    The first time a node is reached is by the fewest edges, with equal
+    non-negative weights that is also the shortest distance
+
+    Arguments:
+        targets -- Optional collection of nodes, the search stops once
+                   all of them are dequeued. Only the edges scanned
+                   until then are checked to have the same weight
+    Return:
+        (distances, prev) dicts in the same format as
+        Dijkstra.construct_paths()
+    Raises:
+        ValueError -- if the weights are not all the same or negative
+    '''
+    infinity = float('inf')
+    prev = {x: x for x in adjacentList}
+    distances = {x: infinity for x in adjacentList}
+    distances[s] = 0
+    queue = collections.deque([s])
+    weight = None
+    remaining = set(targets) if targets is not None else None
+
+    while queue:
+        v = queue.popleft()
+        if remaining is not None:
+            remaining.discard(v)
+            if not remaining:
+                break
+        dist_v = distances[v]
+        for u, w in adjacentList[v]:
+            if w != weight:
+                if weight is not None:
+                    raise ValueError('BFS requires every weight to be the same')
+                if w < 0:
+                    raise ValueError('BFS requires non-negative weights')
+                weight = w
+            if distances[u] == infinity:
+                distances[u] = dist_v + w
+                prev[u] = v
+                queue.append(u)
+
+    return distances, prev
+
+
+def construct_paths_01(adjacentList, s, targets=None):
+    '''Runs 0-1 BFS keeping track of previous nodes for each node
+
+    Nodes reached by a 0 weight edge go to the front of the deque and
+    nodes reached by a 1 weight edge go to the back, so the deque is
+    always sorted by distance and acts as the priority queue
+
+    Arguments:
+        targets -- Optional collection of nodes, the search stops once
+                   all of them are settled. Only the edges scanned until
+                   then are checked to weigh 0 or 1
+    Return:
+        (distances, prev) dicts in the same format as
+        Dijkstra.construct_paths()
+    Raises:
+        ValueError -- if a weight is not 0 or 1
+    '''
+    infinity = float('inf')
+    prev = {x: x for x in adjacentList}
+    distances = {x: infinity for x in adjacentList}
+    distances[s] = 0
+    queue = collections.deque([s])
+    settled = set()
+    remaining = set(targets) if targets is not None else None
+
+    while queue:
+        v = queue.popleft()
+        # Nodes can be in the deque more than once, skip the later copies
+        if v in settled:
+            continue
+        settled.add(v)
+        if remaining is not None:
+            remaining.discard(v)
+            if not remaining:
+                break
+        dist_v = distances[v]
+
+        for u, w in adjacentList[v]:
+            if dist_v + w < distances[u]:
+                distances[u] = dist_v + w
+                prev[u] = v
+                if w == 0:
+                    queue.appendleft(u)
+                elif w == 1:
+                    queue.append(u)
+                else:
+                    raise ValueError('0-1 BFS requires weights of 0 or 1')
+            elif w != 0 and w != 1:
+                raise ValueError('0-1 BFS requires weights of 0 or 1')
+
+    return distances, prev
+
+
+def _targets(t):
+    '''Targets to stop at for a query to t (None for every node)'''
+    return [t] if t is not None else None
+
+
+def _distance_result(distances, t):
+    '''Returns the distances the same way as Dijkstra.dij()'''
+    if t is not None:
+        if distances[t] == float('inf'):
+            raise NoPathError()
+        return distances[t]
+    return distances
+
+
+def _path_result(adjacentList, s, t, prev):
+    '''Returns the paths the same way as Dijkstra.dij_paths()'''
+    if t is not None:
+        return shortest_path(s, t, prev)
+
+    shortest_paths = {node: [] for node in adjacentList}
+    for node in shortest_paths:
+        try:
+            shortest_paths[node] = shortest_path(s, node, prev)
+        except NoPathError:
+            pass
+    return shortest_paths
@@ -0,0 +1,397 @@
+# Batch shortest path queries from the command line
+#
+#     python -m src GRAPH [QUERIES] [--algorithm NAME] [--format jsonl|csv]
+#                         [--paths] [--workers N] [--chunk-size N]
+#                         [--profile MODE] [--profile-out PREFIX]
+#
+# The graph file is loaded once and (source, target) queries are streamed
+# from QUERIES (stdin if missing or '-'), one per line separated by spaces,
+# tabs or a comma. Results are written to stdout as soon as each chunk of
+# queries is answered, in the same order as the queries.
+#
+# Main functions:
+#     1) load_graph() --> Returns the graph dict from an edge list or JSON
+#                         adjacency file
+#     2) read_queries() --> Yields (source, target) pairs from lines
+#     3) answer_queries() --> Yields a result dict for each query
+#     4) write_results() --> Writes results as JSON Lines or CSV
+#     5) main() --> Command line entry point
+#
+# Queries in a chunk that share a source are answered by one search. With
+# the 'dijkstra' engine it stops once all of that source's targets are
+# settled, the other engines build the full tree. Targets the reachability
+# index shows can't be reached are answered without searching. With
+# workers > 1 the chunks are answered in worker processes that each load
+# the graph state once, at most 2 chunks per worker are in flight so
+# memory stays bounded on any number of queries.
+#
+# With --profile the whole run is profiled with src.Profiling, the phase
+# and per function breakdown goes to stderr and with --profile-out the
+# cProfile stats and collapsed stacks are written to PREFIX.prof and
+# PREFIX.folded. Only the main process is profiled, use --workers 1.
+# Profiling with both modes reads all the queries up front and answers
+# them twice, the cProfile run's output is thrown away.
+#
+# Graph files:
+#     - '.json' --> {"node": [[to, weight], ...], ...}
+#     - other   --> edge list, one "from to weight" edge per line, blank
+#                   lines and lines starting with '#' are skipped
+# Node names that are ints are read as ints, weights as int or float.
+import os
+import sys
+import csv
+import json
+import argparse
+import contextlib
+import collections
+import concurrent.futures
+import src.Dijkstra as Dijkstra
+import src.ShortestPaths as SP
+from src.Profiling import MODES, profile_call
+
+ALGORITHMS = ('auto', 'bfs', 'zero_one_bfs', 'dag', 'dijkstra', 'bellman_ford')
+
+# Graph state of a worker process, set once by _init_worker()
+_worker = {}
+
+
+def load_graph(path):
+    '''Loads a graph file into the dict representation
+
+    Arguments:
+        path -- path of a '.json' adjacency file or an edge list file
+    Return:
+        dict containing (node: (edge, weight)) pairs, every node that is
+        only the head of an edge is added with no edges
+    Raises:
+        ValueError -- if a line of an edge list doesn't have 3 fields
+    '''
+    graph = {}
+    with open(path) as f:
+        if path.endswith('.json'):
+            for v, edges in json.load(f).items():
+                graph[parse_node(v)] = [(parse_node(u), w) for u, w in edges]
+        else:
+            for line_no, line in enumerate(f, 1):
+                fields = _split(line)
+                if not fields or fields[0].startswith('#'):
+                    continue
+                if len(fields) != 3:
+                    raise ValueError('line %i: expected "from to weight"'
+                                     % line_no)
+                v, u, w = fields
+                graph.setdefault(parse_node(v), []).append(
+                    (parse_node(u), _parse_weight(w)))
+
+    for v in list(graph):
+        for u, w in graph[v]:
+            graph.setdefault(u, [])
+    return graph
+
+
+def read_queries(lines):
+    '''Yields (source, target) pairs from query lines, blank lines and
+    lines starting with '#' are skipped
+
+    Raises:
+        ValueError -- if a line doesn't have 2 fields
+    '''
+    for line_no, line in enumerate(lines, 1):
+        fields = _split(line)
+        if not fields or fields[0].startswith('#'):
+            continue
+        if len(fields) != 2:
+            raise ValueError('query %i: expected "source target"' % line_no)
+        yield parse_node(fields[0]), parse_node(fields[1])
+
+
+def parse_node(token):
+    '''Returns the node name as an int if it is one'''
+    if isinstance(token, str):
+        try:
+            return int(token)
+        except ValueError:
+            return token
+    return token
+
+
+def _parse_weight(token):
+    try:
+        return int(token)
+    except ValueError:
+        return float(token)
+
+
+def _split(line):
+    return line.replace(',', ' ').split()
+
+
+def answer_queries(graph, queries, algorithm='auto', paths=False,
+                   workers=1, chunk_size=4096):
+    '''Answers a stream of queries lazily, in order
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        queries -- iterable of (source, target) pairs
+        algorithm -- 'auto' to select the engine for the graph or the
+                     name of a ShortestPaths engine
+        paths -- if True the results also have the shortest path
+        workers -- number of processes to answer the chunks with
+        chunk_size -- number of queries answered together
+    Return:
+        generator of dicts with 'source', 'target' and 'distance' (None
+        if there is no path), 'path' if paths is True and 'error' if the
+        query couldn't be answered
+    Raises:
+        ValueError -- if the algorithm is unknown or can't be used on
+                      the graph
+    '''
+    engine = SP.select_engine(graph) if algorithm == 'auto' else algorithm
+    SP.check_engine(graph, engine)
+
+    chunks = _chunks(queries, chunk_size)
+    state = (graph, engine, paths)
+    if workers <= 1:
+        _init_worker(state)
+        for chunk in chunks:
+            for result in _answer_chunk(chunk):
+                yield result
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker,
+            initargs=(state,)) as pool:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_answer_chunk, chunk))
+            if len(pending) >= 2 * workers:
+                for result in pending.popleft().result():
+                    yield result
+        while pending:
+            for result in pending.popleft().result():
+                yield result
+
+
+def _chunks(queries, chunk_size):
+    chunk = []
+    for query in queries:
+        chunk.append(query)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _init_worker(state):
+    '''Stores the graph state once per process and builds the cached
+    graph properties and reachability index up front
+    '''
+    graph, engine, paths = state
+    index, nodes = Dijkstra.node_index(graph)
+    _worker.update(graph=graph, engine=engine, paths=paths,
+                   index=index, nodes=nodes,
+                   reach=SP.reachability_index(graph),
+                   integer=SP.graph_properties(graph).is_integer)
+
+
+def _answer_chunk(chunk):
+    '''Answers a chunk of queries with one search per distinct source'''
+    graph = _worker['graph']
+    reach = _worker['reach']
+
+    targets = collections.defaultdict(set)
+    for s, t in chunk:
+        if s in graph and t in graph and reach.can_reach(s, t):
+            targets[s].add(t)
+
+    answers = {}
+    for s in targets:
+        try:
+            answers[s] = _search(s, targets[s])
+        except SP.NegativeCycleError:
+            answers[s] = None
+
+    return [_result(s, t, answers) for s, t in chunk]
+
+
+def _search(s, targets):
+    '''Runs one search from s
+
+    Return:
+        dict target --> (distance, path or None) for the reachable
+        targets
+    '''
+    graph = _worker['graph']
+    paths = _worker['paths']
+    answers = {}
+
+    if _worker['engine'] == 'dijkstra':
+        index = _worker['index']
+        nodes = _worker['nodes']
+        si = index[s]
+        _, _, dist, prev = Dijkstra.construct_arrays(
+            graph, s, targets=[index[t] for t in targets])
+        for t in targets:
+            ti = index[t]
+            if prev[ti] != -1:
+                path = Dijkstra.array_path(nodes, prev, si, ti) \
+                    if paths else None
+                answers[t] = (dist[ti], path)
+        return answers
+
+    distances, prev = SP.shortest_path_tree(graph, s, _worker['engine'])
+    for t in targets:
+        if t in distances:
+            path = Dijkstra.shortest_path(s, t, prev) if paths else None
+            answers[t] = (distances[t], path)
+    return answers
+
+
+def _result(s, t, answers):
+    '''Builds the output dict of one query'''
+    result = {'source': s, 'target': t, 'distance': None}
+    if _worker['paths']:
+        result['path'] = None
+
+    graph = _worker['graph']
+    if s not in graph or t not in graph:
+        result['error'] = 'invalid node'
+    elif answers.get(s, {}) is None:
+        result['error'] = 'negative cycle'
+    elif t not in answers.get(s, {}):
+        result['error'] = 'no path'
+    else:
+        distance, path = answers[s][t]
+        result['distance'] = int(distance) if _worker['integer'] \
+            else distance
+        if path is not None:
+            result['path'] = path
+    return result
+
+
+def write_results(results, out, fmt='jsonl'):
+    '''Writes each result as soon as it is produced
+
+    Arguments:
+        results -- iterable of result dicts from answer_queries()
+        out -- text file to write to
+        fmt -- 'jsonl' for one JSON object per line or 'csv' with a
+               source,target,distance[,path],error header row, paths
+               are space separated and missing values are empty
+    Return:
+        number of results written
+    '''
+    count = 0
+    writer = None
+    for result in results:
+        if fmt == 'csv':
+            if writer is None:
+                # Only failed queries have an error, the columns can't
+                # come from the first result
+                fields = ['source', 'target', 'distance']
+                if 'path' in result:
+                    fields.append('path')
+                fields.append('error')
+                writer = csv.DictWriter(out, fields, restval='',
+                                        lineterminator='\n')
+                writer.writeheader()
+            writer.writerow({key: _csv_field(value)
+                             for key, value in result.items()})
+        else:
+            out.write(json.dumps(result) + '\n')
+        count += 1
+    return count
+
+
+def _csv_field(value):
+    if value is None:
+        return ''
+    if isinstance(value, list):
+        return ' '.join(str(node) for node in value)
+    return value
+
+
+def _profile_run(graph, queries, args):
+    '''Answers the queries under the profiler, the breakdown goes to
+    stderr and the files to --profile-out
+    '''
+    def run(out):
+        results = answer_queries(graph, queries, args.algorithm, args.paths,
+                                 args.workers, args.chunk_size)
+        return write_results(results, out, args.format)
+
+    if args.profile == 'both':
+        # Both runs need the same queries, the first one's output is
+        # thrown away
+        queries = list(queries)
+        with open(os.devnull, 'w') as devnull:
+            _, report = profile_call(run, devnull, mode='cprofile')
+        _, sampled = profile_call(run, sys.stdout, mode='sample')
+        report.samples = sampled.samples
+        report.sample_phases = sampled.sample_phases
+    else:
+        _, report = profile_call(run, sys.stdout, mode=args.profile)
+
+    sys.stdout.flush()
+    sys.stderr.write(report.format() + '\n')
+    if args.profile_out:
+        if report.stats is not None:
+            report.dump_stats(args.profile_out + '.prof')
+        if report.samples is not None:
+            report.write_collapsed(args.profile_out + '.folded')
+
+
+def main(argv=None):
+    '''Command line entry point, returns the exit status'''
+    parser = argparse.ArgumentParser(
+        prog='python -m src',
+        description='Answers a stream of shortest path queries on a graph '
+                    'that is loaded once')
+    parser.add_argument('graph', help='edge list or .json adjacency file')
+    parser.add_argument('queries', nargs='?', default='-',
+                        help='file of "source target" lines (default stdin)')
+    parser.add_argument('-a', '--algorithm', default='auto',
+                        choices=ALGORITHMS,
+                        help='engine to answer with (default auto)')
+    parser.add_argument('-f', '--format', default='jsonl',
+                        choices=['jsonl', 'csv'], help='output format')
+    parser.add_argument('-p', '--paths', action='store_true',
+                        help='also output the shortest paths')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                        help='number of worker processes')
+    parser.add_argument('-c', '--chunk-size', type=int, default=4096,
+                        help='queries answered together')
+    parser.add_argument('--profile', choices=MODES,
+                        help='profile the run, breakdown written to stderr')
+    parser.add_argument('--profile-out', metavar='PREFIX',
+                        help='write PREFIX.prof and PREFIX.folded')
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+
+    try:
+        graph = load_graph(args.graph)
+        # Only close the queries file if it was opened here, not stdin
+        if args.queries == '-':
+            lines = contextlib.nullcontext(sys.stdin)
+        else:
+            lines = open(args.queries)
+        with lines as lines:
+            queries = read_queries(lines)
+            if args.profile:
+                _profile_run(graph, queries, args)
+            else:
+                results = answer_queries(graph, queries, args.algorithm,
+                                         args.paths, args.workers,
+                                         args.chunk_size)
+                write_results(results, sys.stdout, args.format)
+    except BrokenPipeError:
+        # The reader closed the output early (e.g. piped into head)
+        return 1
+    except (OSError, ValueError) as e:
+        sys.stderr.write('error: %s\n' % e)
+        return 2
+    return 0
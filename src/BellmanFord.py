@@ -3,6 +3,19 @@
 # Main functions:
 #     1) bellman_ford() --> Returns shortest distances
 #     2) bf_paths() --> Returns shortest paths
+#     3) construct_hop_paths() --> Returns distances using at most k edges
+#
+# Implicit graphs:
+#     In place of the dict a function neighbors(node) returning the
+#     [(Edge to, Weight)] of node can be given, nodes can then be any
+#     hashable. Distances and previous nodes are only stored for the nodes
+#     that are reached (construct_sparse_paths()). On graphs too large to
+#     build (or infinite) max_hops bounds the search
+#
+# Array graphs:
+#     A scipy.sparse matrix or a (src, dst, weight) tuple of NumPy arrays
+#     can be given in place of the dict, nodes are then 0..V-1. They are
+#     read in place through SparseGraph.CSRGraph, no dict is built
 #
 # Graph representation:
 #     Use dict datastructure to represent Graph:
@@ -11,7 +24,12 @@
 #     Example:
 #         1 --> 2 (weight of 5)
 #         represented as (1: [(2, 5)])
+import array
+import operator
 import collections
+import collections.abc
+from src.MultiWeightGraph import select_metric
+from src.SparseGraph import as_graph, search_view
 
 class NoPathError(Exception):
     '''Exception for when there is no path from source to node'''
@@ -22,58 +40,112 @@ class NegativeCycleError(Exception):
     pass
 
 
-def bellman_ford(graph, src, target=None):
+def bellman_ford(graph, src, target=None, max_hops=None, arrays=False,
+                 reach=None, weight=None):
     '''Calculates shortest distances for each node from a source
 
     Arguments:
         graph -- dict containing (node: (edge, weight)) pairs
-                 represents the directed graph
+                 represents the directed graph, or a neighbors(node)
+                 function for implicit graphs
         src -- int representing the source node to start with
         target -- Optional param giving target node to find shortest
                   distance from src
+        max_hops -- Optional param giving the max number of edges a
+                    path can use, only that many passes are run
+        arrays -- if True return the array('d') of distances indexed
+                  by node instead of converting it to a dict
+        reach -- Optional Reachability.ReachabilityIndex of graph, used
+                 to fail fast when target can't be reached and to only
+                 relax the nodes src can reach
+        weight -- name of the weight column to use when graph is a
+                  MultiWeightGraph
     Return:
         None if negative cycle detected or graph is None,
         Else dict with shortest distances for all nodes or shortest
-        distance to target if target param is given
+        distance to target if target param is given.
+        With max_hops the distances only use paths of at most max_hops
+        edges and negative cycles are not checked for
     Raises:
-        ValueError -- if src or target are not valid nodes
+        ValueError -- if src or target are not valid nodes or weight is
+                      not a column
         TypeError -- if src & target aren't ints or graph is not a dict
         NoPathError -- if there is no path to target node
         NegativeCycleError -- if there is a negative cycle in the graph
     '''
     if graph is None:
         return None
-    if not isinstance(graph, dict):
+    graph = as_graph(select_metric(graph, weight))
+
+    if callable(graph):
+        # Implicit graph, only the reached nodes are ever stored
+        if max_hops is not None:
+            history = construct_hop_paths(graph, src, max_hops)
+            d = {node: history[node][-1][1] for node in history}
+        else:
+            d, prev = construct_sparse_paths(graph, src)
+        if target is not None:
+            if target not in d:
+                raise NoPathError()
+            return d[target]
+        return d
+
+    if not isinstance(graph, collections.abc.Mapping):
         raise TypeError('Graph input must be a dictionary')
-    if not isinstance(src, int):
-        raise TypeError('Expected: int Got: %s' % (type(src)))
-    if target is not None and not isinstance(target, int):
-        raise TypeError('Expected: int Got: %s' % (type(target)))
+    src = _node_id(src)
+    if target is not None:
+        target = _node_id(target)
+
+    _fail_fast(graph, src, target, reach)
 
-    # List containing distances for shortest route
+    if max_hops is not None:
+        history = construct_hop_paths(graph, src, max_hops)
+        d = {node: history[node][-1][1] for node in history}
+
+        if target is not None:
+            if target not in graph:
+                raise ValueError('target argument not a valid source')
+            if target not in d:
+                raise NoPathError()
+            return d[target]
+
+        return d
+
+    # Typed array containing distances for shortest route
     # Initializing distance array taken from pseudo-code
-    d = [float('Inf') for v in graph]
+    d = array.array('d', [float('Inf')]) * len(graph)
     try:
         d[src] = 0
     except IndexError:
         raise ValueError('src argument not a valid node')
 
+    # Only the nodes src can reach need relaxing, in topological order
+    # of their components so most distances settle in the first pass
+    nodes = reach.reachable_nodes(src) if reach is not None else graph
+
+    edges = search_view(graph)
+
     # Loop through the graph finding the shortest paths with 'k' hops
     # Code taken from pseudo-code
-    for k in range(1, len(graph)):
+    for k in range(1, len(nodes)):
+        changed = False
         # Check for each vertex within the graph
-        for v in graph:
+        for v in nodes:
             # Grab each edge connected to 'v' & their weight
-            for u, w in graph[v]:
+            for u, w in edges[v]:
                 # Update weight & prev node if there's a shorter path
                 if d[v] + w < d[u]:
                     d[u] = d[v] + w
+                    changed = True
+        # Nothing changed so no later pass will change anything either
+        if not changed:
+            break
 
     # Check for any negative cycles
     # Code taken from pseudo-code
-    for v in graph:
+    for v in nodes:
         if d[v] != float('Inf'):
-            for u, w in graph[v]:
+            for u, w in edges[v]:
                 # Check if 'n-th' hop creates a shorter dist
                 if d[v] + w < d[u]:
                     # Negative Cycle found!
@@ -88,62 +160,102 @@ def bellman_ford(graph, src, target=None):
 
         return d[target]
 
+    if arrays:
+        return d
+
     return {node: d[node] for node in graph if d[node] != float('Inf')}
 
 
-def bf_paths(graph, src, target=None):
+def bf_paths(graph, src, target=None, max_hops=None, reach=None,
+             weight=None):
     '''Constructs shortest paths for every node in graph based on
     shortest distances unless a target node is specified
 
     Arguments:
         graph -- dict containing (node: (edge, weight)) pair
-                 representing the directed graph
+                 representing the directed graph, or a neighbors(node)
+                 function for implicit graphs
         src -- int representing the source node to start with
+        target -- Optional param giving target node to find shortest
+                  path from src
+        max_hops -- Optional param giving the max number of edges a
+                    path can use
+        reach -- Optional Reachability.ReachabilityIndex of graph, used
+                 to fail fast when target can't be reached and to only
+                 relax the nodes src can reach
+        weight -- name of the weight column to use when graph is a
+                  MultiWeightGraph
     Return:
         dict with the shortest paths for each node in graph if target
         is None, else list with shortest path from src to target node
     Raises:
+        ValueError -- if weight is not a column
         TypeError -- if src & target aren't ints or graph is not a dict
         NoPathError -- if there is no path to target node
         NegativeCycleError -- if there is a negative cycle in the graph
     '''
     if graph is None:
         return None
-    if not isinstance(graph, dict):
+    graph = as_graph(select_metric(graph, weight))
+
+    if callable(graph):
+        # Implicit graph, only the reached nodes are ever stored
+        if max_hops is not None:
+            history = construct_hop_paths(graph, src, max_hops)
+            if target is not None:
+                return hop_path(src, target, history)
+            return {node: hop_path(src, node, history) for node in history}
+
+        d, prev = construct_sparse_paths(graph, src)
+        if target is not None:
+            return sparse_path(src, target, prev)
+        return {node: sparse_path(src, node, prev) for node in d}
+
+    if not isinstance(graph, collections.abc.Mapping):
         raise TypeError('Graph input must be a dictionary')
-    if not isinstance(src, int):
-        raise TypeError('Expected: int Got: %s' % (type(src)))
-    if target is not None and not isinstance(target, int):
-        raise TypeError('Expected: int Got: %s' % (type(target)))
+    src = _node_id(src)
+    if target is not None:
+        target = _node_id(target)
 
-    # Get the shortest distances and previous node for each node
-    d = construct_paths(graph, src)
+    _fail_fast(graph, src, target, reach)
 
-    if d is None:
-        return
+    if max_hops is not None:
+        history = construct_hop_paths(graph, src, max_hops)
+
+        if target is not None:
+            if target not in graph:
+                raise ValueError('target argument not a valid node')
+            return hop_path(src, target, history)
+
+        shortest_paths = {node: [] for node in graph}
+        for node in history:
+            shortest_paths[node] = hop_path(src, node, history)
+        return shortest_paths
+
+    # Get the shortest distances and previous node for each node
+    d, prev = construct_paths(graph, src, reach)
 
     # Construct shortest path route
     shortest_paths = {node: [] for node in graph}
 
     if target is not None:
-        return shortest_path(src, target, d)
+        return shortest_path(src, target, prev)
 
     for node in shortest_paths:
-        try:
-            shortest_paths[node] = shortest_path(src, node, d)
-        except NoPathError:
-            pass
+        if prev[node] != -1:
+            shortest_paths[node] = shortest_path(src, node, prev)
 
     return shortest_paths
 
-def shortest_path(src, target, path_list):
+def shortest_path(src, target, prev_list):
     '''Construct the shortest path from source to target node with
     given list of previous nodes
 
     Arguments:
         src -- int representing the source node
         target -- int representing the target node
-        path_list -- list with previous node for each node in graph
+        prev_list -- array with previous node for each node in graph,
+                     -1 for nodes that weren't reached
     Return:
         list containing the path from source to target node
     Raises:
@@ -154,78 +266,257 @@ def shortest_path(src, target, path_list):
     path.append(target)
 
     try:
-        prev = path_list[target][1]
+        prev = prev_list[target]
     except IndexError:
         raise ValueError('target argument not a valid node') 
 
-    if prev is None:
+    if prev == -1:
         raise NoPathError()
 
-    # Check if path is only the target and the source
-    if prev == 0 and target != 0:
+    # Loop through and append previous nodes to list until the source
+    node = target
+    while node != src:
+        # Append to front of list for order
         path.appendleft(prev)
-        return list(path)
-    elif target != 0:
-        # Loop through and append previous nodes to list
-        while prev != src:
-            if prev is None:
-                raise NoPathError()
-            # Append to front of list for order
-            path.appendleft(prev)
-            prev = path_list[prev][1]
+        node = prev
         try:
-            path.appendleft(src)
+            prev = prev_list[node]
         except IndexError:
-            raise ValueError('src argument not a valid node') 
+            raise ValueError('src argument not a valid node')
+        if prev == -1:
+            raise NoPathError()
 
     return list(path)
 
 
-def construct_paths(graph, src):
+def construct_paths(graph, src, reach=None):
     '''Runs Bellman Ford keeping track of previous nodes for each node
 
     Arguments:
         graph -- dict containing (node: (edge, weight)) pair 
                  representing the directed graph
         src -- int representing the source node to start with
+        reach -- Optional Reachability.ReachabilityIndex of graph, only
+                 the nodes src can reach are relaxed
     Return:
-        list containing the distances and previous node for each node
+        (dist, prev) typed arrays indexed by node, array('d') with the
+        distances and array('q') with the previous node for each node
+        (-1 for nodes that weren't reached)
     Raises:
         ValueError -- if src is not a valid node
         NegativeCycleError -- if there is a negative cycle in the graph
     '''
-    # List containing distances and previous node for shortest route
+    # Flat arrays for distances and previous node for shortest route,
+    # updating them doesn't allocate anything per relaxation
     # Initializing distance array taken from pseudo-code
-    d = [(float('Inf'), None) for v in graph]
+    d = array.array('d', [float('Inf')]) * len(graph)
+    prev = array.array('q', [-1]) * len(graph)
     try:
-        d[src] = (0, src)
+        d[src] = 0
+        prev[src] = src
     except IndexError:
         raise ValueError('src argument not a valid node')
 
+    nodes = reach.reachable_nodes(src) if reach is not None else graph
+
+    edges = search_view(graph)
+
     # Loop through the graph finding the shortest paths with 'k' hops
     # Code taken from pseudo-code
-    for k in range(1, len(graph)):
+    for k in range(1, len(nodes)):
+        changed = False
         # Check for each vertex within the graph
-        for v in graph:
+        for v in nodes:
             # Grab each edge connected to 'v' & their weight
-            for u, w in graph[v]:
+            for u, w in edges[v]:
                 # Update weight & prev node if there's a shorter path
-                dist_v = d[v][0]
-                dist_u = d[u][0]
-                if dist_v + w < dist_u:
-                    d[u] = (dist_v + w, v)
+                if d[v] + w < d[u]:
+                    d[u] = d[v] + w
+                    prev[u] = v
+                    changed = True
+        if not changed:
+            break
 
     # Check for any negative cycles
     # Code taken from pseudo-code
-    for v in graph:
-        for u, w in graph[v]:
+    for v in nodes:
+        for u, w in edges[v]:
             # Check if 'n-th' hop creates a shorter dist
-            dist_v = d[v][0]
-            dist_u = d[u][0]
-            if dist_v + w < dist_u:
+            if d[v] + w < d[u]:
                 raise NegativeCycleError()
     
-    return d
+    return d, prev
+
+
+def construct_sparse_paths(neighbors, src):
+    '''Runs Bellman Ford storing state only for the nodes it reaches,
+    each pass only relaxes the edges out of nodes that changed in the
+    pass before
+
+    Without negative cycles a change in pass k means there is a
+    shortest path with at least k edges whose nodes were all reached,
+    so more passes with changes than reached nodes means a negative cycle
+
+    Arguments:
+        neighbors -- function returning the [(edge, weight)] of a node
+        src -- source node to start with
+    Return:
+        (distances, prev) dicts with only the nodes that were reached,
+        prev of src is src
+    Raises:
+        NegativeCycleError -- if a negative cycle is reachable from src
+    '''
+    distances = {src: 0}
+    prev = {src: src}
+    frontier = [src]
+    passes = 0
+
+    while frontier:
+        changed = {}
+        for v in frontier:
+            dist_v = distances[v]
+            for u, w in neighbors(v):
+                if dist_v + w < distances.get(u, float('Inf')):
+                    distances[u] = dist_v + w
+                    prev[u] = v
+                    changed[u] = None
+        frontier = list(changed)
+
+        if frontier:
+            passes += 1
+            if passes > len(distances):
+                raise NegativeCycleError()
+
+    return distances, prev
+
+
+def sparse_path(src, target, prev):
+    '''Construct the shortest path from source to target node with the
+    prev dict from construct_sparse_paths()
+
+    Raises:
+        NoPathError -- if there is no path to target node
+    '''
+    if target not in prev:
+        raise NoPathError()
+
+    path = collections.deque([target])
+    while target != src:
+        target = prev[target]
+        path.appendleft(target)
+    return list(path)
+
+
+def _node_id(node):
+    '''Returns node as an int, NumPy integers included
+
+    Raises:
+        TypeError -- if node is not an integer
+    '''
+    try:
+        return operator.index(node)
+    except TypeError:
+        raise TypeError('Expected: int Got: %s' % (type(node)))
+
+
+def _fail_fast(graph, src, target, reach):
+    '''Raises NoPathError if the reachability index shows src can't
+    reach target, invalid nodes are left for the caller to report
+    '''
+    if reach is None or target is None:
+        return
+    if src in graph and target in graph and not reach.can_reach(src, target):
+        raise NoPathError()
+
+
+def construct_hop_paths(graph, src, max_hops):
+    '''Runs max_hops passes of Bellman Ford, each pass only relaxing the
+    edges out of nodes that changed in the pass before it
+
+    Every pass reads the distances from the end of the previous pass so
+    after pass k each distance is exactly the shortest using at most k
+    edges, and the work only depends on the region within max_hops
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pair
+                 representing the directed graph, or a neighbors(node)
+                 function for implicit graphs
+        src -- int representing the source node to start with
+        max_hops -- int giving the number of passes to run
+    Return:
+        dict with a list of (pass, distance, previous node) for each
+        time a reached node's distance changed, in pass order
+    Raises:
+        ValueError -- if src is not a valid node
+        TypeError -- if max_hops is not an int
+    '''
+    if not isinstance(max_hops, int):
+        raise TypeError('Expected: int Got: %s' % (type(max_hops)))
+    if callable(graph):
+        neighbors = graph
+    else:
+        if src not in graph:
+            raise ValueError('src argument not a valid node')
+        neighbors = search_view(graph).__getitem__
+
+    history = {src: [(0, 0, src)]}
+    changed = {src: 0}
+
+    for k in range(1, max_hops + 1):
+        # Best update for each node in this pass, the current distances
+        # in history aren't touched until the pass is over
+        updates = {}
+        for v, dist_v in changed.items():
+            for u, w in neighbors(v):
+                if u in updates:
+                    dist_u = updates[u][0]
+                elif u in history:
+                    dist_u = history[u][-1][1]
+                else:
+                    dist_u = float('Inf')
+                if dist_v + w < dist_u:
+                    updates[u] = (dist_v + w, v)
+
+        if not updates:
+            break
+
+        changed = {}
+        for u, (dist_u, v) in updates.items():
+            history.setdefault(u, []).append((k, dist_u, v))
+            changed[u] = dist_u
+
+    return history
+
+
+def hop_path(src, target, history):
+    '''Construct the shortest path from source to target node using at
+    most the number of edges history was built with
+
+    Arguments:
+        src -- int representing the source node
+        target -- int representing the target node
+        history -- dict returned by construct_hop_paths()
+    Return:
+        list containing the path from source to target node
+    Raises:
+        NoPathError -- if there is no path to target node
+    '''
+    if target not in history:
+        raise NoPathError()
+
+    path = collections.deque([target])
+    k, dist, prev = history[target][-1]
+
+    # The previous node's entry that was used is the last one from
+    # before the pass the current node changed in
+    while k > 0:
+        path.appendleft(prev)
+        for entry in reversed(history[prev]):
+            if entry[0] < k:
+                break
+        k, dist, prev = entry
+
+    return list(path)
 
 
 if __name__ == '__main__':
@@ -3,6 +3,23 @@
 # Main functions:
 #     1) dij() --> Returns shortest distances
 #     2) dij_paths() --> Returns shortest paths
+#     3) construct_paths() --> Returns distances and previous nodes
+#     4) construct_arrays() --> Same as construct_paths() but as typed arrays
+#
+# dij() and dij_paths() also take a collection of targets, the search
+# stops as soon as every reachable target is settled
+#
+# Implicit graphs:
+#     In place of the dict a function neighbors(node) returning the
+#     [(Edge to, Weight)] of node can be given. Distances and previous
+#     nodes are then only stored for the nodes the search touches
+#     (construct_sparse()), so with a target, targets or max_distance
+#     graphs too large to build (or infinite) can be searched
+#
+# Array graphs:
+#     A scipy.sparse matrix or a (src, dst, weight) tuple of NumPy arrays
+#     can be given in place of the dict, nodes are then 0..V-1. They are
+#     read in place through SparseGraph.CSRGraph, no dict is built
 #
 # Graph representation:
 #     Use dict datastructure to represent Graph:
@@ -12,7 +29,11 @@
 #         1 --> 2 (weight of 5)
 #         represented as (1: [(2, 5)])
 import heapq
+import array
+import operator
 import collections
+from src.MultiWeightGraph import select_metric
+from src.SparseGraph import as_graph, search_view
 
 
 class NoPathError(Exception):
@@ -23,123 +44,432 @@ class NoPathError(Exception):
 #while loop: add node v with the smallest distance of the nodes that are "one step" away
 #now consider all nodes "one step" from v and see if there are smaller distance, if yes then update with decrease key and add that to the priority queue
 #returns the shortest distance from a single source to the specified node t if there is one, or all the shortest paths
-def dij(adjacentList, s, t=None):
+def dij(adjacentList, s, t=None, max_distance=None, arrays=False, reach=None,
+        targets=None, weight=None):
     '''Calculates shortest distances for each node from a source
     Arguments:
         adjacentList -- dict containing (node: (edge, weight)) pairs
-                        represents the directed graph
+                        represents the directed graph, or a
+                        neighbors(node) function for implicit graphs
         s -- int representing the source node to start with
-        t -- int representing the target node to find shortest dist to
+        t -- int representing the target node to find shortest dist to,
+             the search stops as soon as it is settled
+        targets -- Optional collection of target nodes (instead of t),
+                   the search stops once every reachable one is settled
+        max_distance -- Optional radius, nodes further than it from s
+                        are not expanded or returned
+        weight -- name of the weight column to use when adjacentList
+                  is a MultiWeightGraph
+        arrays -- if True return the typed arrays from
+                  construct_arrays() instead of converting them to a dict
+        reach -- Optional Reachability.ReachabilityIndex of the graph
+                 to fail fast when t can't be reached
     Returns:
-        dict with shortest distances for all nodes or shortest distance
-        to target if target param is given
+        dict with shortest distances for all nodes (only the nodes
+        within max_distance if it is given) or shortest distance
+        to target if target param is given.
+        If targets is given a dict with the shortest distance to each
+        target, infinity for the ones that can't be reached.
+        If arrays is True (and no target) the (dist, prev) arrays
     Raises:
-        NoPathError -- if there is no path to target node   
+        NoPathError -- if there is no path to target node
+                       (within max_distance if it is given)
+        ValueError -- if both t and targets are given or a target is
+                      not a node in the graph or weight is not a column
     '''
-    infinity = float('inf')    
-    PQ = []
-    visited = {}
-    visited[s] = 0 #the source is visited
-    nodes = {x:x for x in adjacentList}
-    prev = {x:x for x in adjacentList} #list of previous nodes vistied, to keep the shortest path
-    distances = {x:infinity for x in adjacentList}
-    distances[s] = 0
-    item = [s, distances[s]]#the distance from the source is 0
-    #the priority queue has a format of the (node name, distance from source)
-    heapq.heappush(PQ, item)#like the pseudo-code: push (s,0) into PQ
-
-    for n in nodes: 
-        item = [n, infinity]
-        heapq.heappush(PQ, item)#like the pseudo-code: insert each node with distance infinity
-
-  
-    while(PQ):
-        v = heapq.heappop(PQ) #like the pseudo-code: extractmin from the priority queue
-        vNode = v[0]
-        vDist = v[1]
-        for u in adjacentList[vNode]: #nested for loop
-            uNode = u[0]
-            uvDist = u[1]
-
-            if uNode not in visited or uvDist < visited[uNode]:
-                visited[uNode] = uvDist
-                if distances[uNode] > distances[vNode] + uvDist: #like the pseudo-code: decreasekey part
-                    distances[uNode] = distances[vNode] + uvDist #update the distance if necesary
-                    item = [uNode, distances[uNode]]
-                    heapq.heappush(PQ, item)#push the updated value onto the priority queue
-                    prev[uNode] = vNode #updating previous list
-
-    if t is not None: #there is a destination node given 
-        if distances[t] == infinity: #no path to t 
+    infinity = float('inf')
+    adjacentList = as_graph(select_metric(adjacentList, weight))
+    _fail_fast(s, t, reach)
+    if targets is not None:
+        targets = list(targets) #read more than once, generators too
+
+    if callable(adjacentList):
+        distances, prev = _implicit_search(adjacentList, s, t, targets,
+                                           max_distance, arrays)
+        if targets is not None:
+            return {target: distances.get(target, infinity)
+                    for target in targets}
+        if t is not None:
+            if t not in distances:
+                raise NoPathError()
+            return distances[t]
+        return distances
+
+    if targets is not None:
+        index, nodes, dist, prev, wanted = _search_targets(
+            adjacentList, s, t, targets, max_distance, reach)
+        return {target: dist[ti] if ti is not None else infinity
+                for target, ti in wanted}
+
+    if max_distance is not None and not arrays:
+        # Bounded searches keep sparse dicts so they only pay for the region
+        distances, prev = construct_sparse(
+            search_view(adjacentList).__getitem__, s, max_distance,
+            [t] if t is not None else None)
+        if t is not None: #there is a destination node given 
+            if distances.get(t, infinity) == infinity: #no path to t 
+                raise NoPathError()
+            return distances[t]
+        return distances
+
+    if t is not None: #there is a destination node given, stop once it is settled
+        ti = node_index(adjacentList)[0][t]
+        index, nodes, dist, prev = construct_arrays(adjacentList, s,
+                                                    max_distance, [ti])
+        if dist[ti] == infinity: #no path to t 
             raise NoPathError()
-        else:
-            return distances[t]#return the shortest distance to the destination node
+        return dist[ti] #return the shortest distance to the destination node
+
+    index, nodes, dist, prev = construct_arrays(adjacentList, s, max_distance)
+
+    if arrays:
+        return dist, prev
     
-    return distances #if no specific destination node is given return the shortest distances to all nodes from the source node
+    return dict(zip(nodes, dist)) #if no specific destination node is given return the shortest distances to all nodes from the source node
 
-#gives the shortest path, very similar to above code  
-def dij_paths(adjacentList, s, t=None): 
+#gives the shortest path, same search as above code  
+def dij_paths(adjacentList, s, t=None, max_distance=None, reach=None,
+              targets=None, weight=None): 
     '''Constructs shortest paths for every node in graph based on 
     shortest distances unless a target node is specified
     Arguments:
         adjacentList -- dict containing (node: (edge, weight)) pair 
-                        representing the directed graph
+                        representing the directed graph, or a
+                        neighbors(node) function for implicit graphs
         s -- int representing the source node to start with
-        t -- int representing the target node to find shortest path to
+        t -- int representing the target node to find shortest path to,
+             the search stops as soon as it is settled
+        targets -- Optional collection of target nodes (instead of t),
+                   the search stops once every reachable one is settled
+        max_distance -- Optional radius, nodes further than it from s
+                        are not expanded or returned
+        reach -- Optional Reachability.ReachabilityIndex of the graph
+                 to fail fast when t can't be reached
+        weight -- name of the weight column to use when adjacentList
+                  is a MultiWeightGraph
     Return:
-        dict with the shortest paths for each node in graph if target 
-        is None, else list with shortest path from src to target node
+        dict with the shortest paths for each node in graph (only the
+        nodes within max_distance if it is given) if target 
+        is None, else list with shortest path from src to target node.
+        If targets is given a dict with the shortest path to each
+        target, [] for the ones that can't be reached
     Raises:
         NoPathError -- if there is no path to target node  
+                       (within max_distance if it is given)
+        ValueError -- if both t and targets are given or a target is
+                      not a node in the graph or weight is not a column
     '''
-    infinity = float('inf')    
-    PQ = []
-    visited = {}
-    visited[s] = 0 #the source is visited
-    nodes = {x:x for x in adjacentList}
-    prev = {x:x for x in adjacentList} #list of previous nodes vistied, to keep the shortest path
-    distances = { x:infinity for x in adjacentList}
-    distances[s] = 0
-    item = [s, distances[s]]
-    heapq.heappush(PQ, item)
-
-    for n in nodes: 
-        item = [n, infinity]
-        heapq.heappush(PQ, item) 
+    adjacentList = as_graph(select_metric(adjacentList, weight))
+    _fail_fast(s, t, reach)
+    if targets is not None:
+        targets = list(targets) #read more than once, generators too
 
-    
+    if callable(adjacentList):
+        distances, prev = _implicit_search(adjacentList, s, t, targets,
+                                           max_distance)
+        if t is not None:
+            return shortest_path(s, t, prev)
+        if targets is not None:
+            return {target: shortest_path(s, target, prev)
+                    if target in distances else [] for target in targets}
+        return {node: shortest_path(s, node, prev) for node in distances}
 
-    while(PQ):
-        v = heapq.heappop(PQ)
-        vNode = v[0]
-        vDist = v[1]
-        
-        for u in adjacentList[vNode]: 
-            uNode = u[0]
-            uvDist = u[1]
-
-            if uNode not in visited or uvDist < visited[uNode]:
-                visited[uNode] = uvDist
-                if distances[uNode] > distances[vNode] + uvDist: 
-                    distances[uNode] = distances[vNode] + uvDist 
-                    item = [uNode, distances[uNode]]
-                    heapq.heappush(PQ, item)
-                    prev[uNode] = vNode #once you have pushed the node u onto the priority queue not that the previous node was v so you can return the path
+    if targets is not None:
+        index, nodes, dist, prev, wanted = _search_targets(
+            adjacentList, s, t, targets, max_distance, reach)
+        si = index[s]
+        return {target: array_path(nodes, prev, si, ti) if ti is not None
+                else [] for target, ti in wanted}
 
-    if t is not None:
-        return shortest_path(s, t, prev)
+    if max_distance is not None:
+        distances, prev = construct_sparse(
+            search_view(adjacentList).__getitem__, s, max_distance,
+            [t] if t is not None else None)
+
+        if t is not None:
+            return shortest_path(s, t, prev)
+
+        shortest_paths = {node: [] for node in distances}
+        for node in shortest_paths:
+            shortest_paths[node] = shortest_path(s, node, prev)
+        return shortest_paths
+
+    if t is not None: #stop as soon as t is settled
+        ti = node_index(adjacentList)[0][t]
+        index, nodes, dist, prev = construct_arrays(adjacentList, s,
+                                                    targets=[ti])
+        return array_path(nodes, prev, index[s], ti)
+
+    index, nodes, dist, prev = construct_arrays(adjacentList, s)
+    si = index[s]
     
     # Construct shortest path route
     shortest_paths = {node: [] for node in adjacentList}
 
-    for node in shortest_paths:
-        try:
-            shortest_paths[node] = shortest_path(s, node, prev)
-        except NoPathError:
-            pass
+    for i, node in enumerate(nodes):
+        if prev[i] != -1:
+            shortest_paths[node] = array_path(nodes, prev, si, i)
     
     return shortest_paths
 
+def _fail_fast(s, t, reach):
+    '''Raises NoPathError without searching if reach shows s can't reach t'''
+    if reach is not None and t is not None and not reach.can_reach(s, t):
+        raise NoPathError()
+
+def _implicit_search(neighbors, s, t, targets, max_distance, arrays=False):
+    '''Runs construct_sparse() for dij() and dij_paths() on an implicit
+    graph, stopping once t or every target is settled
+    '''
+    if t is not None and targets is not None:
+        raise ValueError('give either t or targets, not both')
+    if arrays:
+        raise ValueError('arrays=True needs a graph dict')
+
+    wanted = [t] if t is not None else targets
+    return construct_sparse(neighbors, s, max_distance, wanted)
+
+def _search_targets(adjacentList, s, t, targets, max_distance, reach):
+    '''Runs construct_arrays() until every target that can be reached
+    is settled, targets the reachability index rules out aren't waited on
+    Return:
+        (index, nodes, dist, prev, wanted) where wanted is a list of
+        (target, position) with a position of None for the targets that
+        weren't reached
+    '''
+    if t is not None:
+        raise ValueError('give either t or targets, not both')
+
+    index, nodes = node_index(adjacentList)
+    wanted = []
+    try:
+        for target in targets:
+            ti = index[target]
+            if reach is not None and not reach.can_reach(s, target):
+                ti = None
+            wanted.append((target, ti))
+    except (KeyError, TypeError):
+        raise ValueError('targets must be nodes in the graph')
+
+    positions = [ti for target, ti in wanted if ti is not None]
+    if positions:
+        index, nodes, dist, prev = construct_arrays(adjacentList, s,
+                                                    max_distance, positions)
+    else:
+        dist = prev = None
+    wanted = [(target, ti if ti is not None and prev[ti] != -1 else None)
+              for target, ti in wanted]
+    return index, nodes, dist, prev, wanted
+
+def construct_arrays(adjacentList, s, max_distance=None, targets=None):
+    '''Runs Dijkstra keeping the distances and previous nodes in flat
+    typed arrays indexed by the position of each node in adjacentList,
+    nothing is allocated per relaxation besides the heap entry
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pair 
+                        representing the directed graph
+        s -- int representing the source node to start with
+        max_distance -- Optional radius, nodes further than it from s
+                        are never pushed
+        targets -- Optional collection of node positions, the search
+                   stops as soon as all of them are settled
+    Return:
+        (index, nodes, dist, prev) where index maps node --> position,
+        nodes maps position --> node, dist is an array('d') with
+        infinity for unreachable nodes and prev is an array('q') with
+        the position of the previous node or -1 if unreachable.
+        For graphs whose nodes are 0..V-1 in order index is a RangeIndex
+        and nodes is range(V) so no dict is built
+    '''
+    infinity = float('inf')    
+    limit = infinity if max_distance is None else max_distance
+    index, nodes = node_index(adjacentList)
+    n = len(nodes)
+    dist = array.array('d', [infinity]) * n
+    prev = array.array('q', [-1]) * n #position of the previous node vistied, to keep the shortest path
+
+    si = index[s]
+    dist[si] = 0
+    prev[si] = si
+    PQ = [(0, si)] #the priority queue has a format of (distance from source, node position)
+    remaining = set(targets) if targets is not None else None
+    lookup = edge_index(index)
+    adj = search_view(adjacentList)
+
+    while(PQ):
+        vDist, vi = heapq.heappop(PQ) #like the pseudo-code: extractmin from the priority queue
+        if vDist > dist[vi]: #stale entry, a shorter distance was already pushed for this node
+            continue
+        if remaining is not None: #vi is settled, stop once every target is
+            remaining.discard(vi)
+            if not remaining:
+                break
+        for uNode, uvDist in adj[nodes[vi]]:
+            ui = lookup[uNode]
+            uDist = vDist + uvDist
+            if uDist < dist[ui] and uDist <= limit: #like the pseudo-code: decreasekey part
+                dist[ui] = uDist
+                prev[ui] = vi
+                heapq.heappush(PQ, (uDist, ui))
+
+    return index, nodes, dist, prev
+
+class RangeIndex(object):
+    '''node --> position index of a graph whose nodes are 0..V-1, no dict
+    is built. Lookups fail like the dict's would: anything that is not an
+    integer in 0..V-1 raises KeyError, -1 doesn't wrap around to V-1
+    Attributes:
+        positions -- range(V), unchecked lookups for edges of the graph
+    '''
+    __slots__ = ('positions',)
+
+    def __init__(self, n):
+        self.positions = range(n)
+
+    def __getitem__(self, node):
+        if type(node) is not int:
+            try:
+                node = operator.index(node) #NumPy integers, not floats
+            except TypeError:
+                raise KeyError(node)
+        if 0 <= node < len(self.positions):
+            return node
+        raise KeyError(node)
+
+    def __contains__(self, node):
+        try:
+            self[node]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, node, default=None):
+        try:
+            return self[node]
+        except KeyError:
+            return default
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __iter__(self):
+        return iter(self.positions)
+
+def node_index(adjacentList):
+    '''Returns (index, nodes) mapping each node to its position in
+    adjacentList and back, a RangeIndex and range are used when the nodes
+    are 0..V-1
+    '''
+    n = len(adjacentList)
+    if list(adjacentList) == list(range(n)):
+        return RangeIndex(n), range(n)
+    nodes = list(adjacentList)
+    return {node: i for i, node in enumerate(nodes)}, nodes
+
+def edge_index(index):
+    '''Returns the lookup to use for the heads of the graph's own edges in
+    hot loops, the unchecked range of a RangeIndex
+    '''
+    if type(index) is RangeIndex:
+        return index.positions
+    return index
+
+def construct_paths(adjacentList, s, max_distance=None):
+    '''Runs Dijkstra keeping track of previous nodes for each node
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pair 
+                        representing the directed graph
+        s -- int representing the source node to start with
+        max_distance -- Optional radius, nodes further than it from s
+                        are never pushed so the work only depends on
+                        the size of the region within the radius
+    Return:
+        (distances, prev) dicts with the shortest distance and the
+        previous node for each node, unreachable nodes have a distance
+        of infinity and are their own previous node.
+        With max_distance only the nodes within it are in the dicts
+    '''
+    if max_distance is None:
+        # Convert the arrays to dicts
+        index, nodes, dist, prev_i = construct_arrays(adjacentList, s)
+        prev = {node: nodes[p] if p != -1 else node
+                for node, p in zip(nodes, prev_i)}
+        return dict(zip(nodes, dist)), prev
+
+    return construct_sparse(search_view(adjacentList).__getitem__, s,
+                            max_distance)
+
+def construct_sparse(neighbors, s, max_distance=None, targets=None,
+                     prune=None):
+    '''Runs Dijkstra storing state only for the nodes it touches
+    Arguments:
+        neighbors -- function returning the [(edge, weight)] of a node
+        s -- source node to start with
+        max_distance -- Optional radius, nodes further than it from s
+                        are never pushed
+        targets -- Optional collection of nodes, the search stops as
+                   soon as all of them are settled
+        prune -- Optional function (node, distance) called as each node
+                 is settled, the edges of the node aren't relaxed if it
+                 returns True (pruned searches, e.g. HubLabels)
+    Return:
+        (distances, prev) dicts with only the nodes that were reached,
+        prev of s is s
+    '''
+    infinity = float('inf')
+    limit = infinity if max_distance is None else max_distance
+    remaining = set(targets) if targets is not None else None
+
+    PQ = []
+    prev = {s: s} #list of previous nodes vistied, to keep the shortest path
+    distances = {s: 0} #only the nodes that have been reached, the rest are infinity
+    count = 0 #tie breaker so nodes never have to be compared
+    #the priority queue has a format of (distance from source, count, node) so it is ordered by distance
+    heapq.heappush(PQ, (0, count, s))#like the pseudo-code: push (s,0) into PQ
+
+    while(PQ):
+        vDist, _, vNode = heapq.heappop(PQ) #like the pseudo-code: extractmin from the priority queue
+        if vDist > distances[vNode]: #stale entry, a shorter distance was already pushed for this node
+            continue
+        if remaining is not None: #vNode is settled, stop once every target is
+            remaining.discard(vNode)
+            if not remaining:
+                break
+        if prune is not None and prune(vNode, vDist):
+            continue
+        for uNode, uvDist in neighbors(vNode): #nested for loop
+            uDist = vDist + uvDist
+            if uDist <= limit and distances.get(uNode, infinity) > uDist: #like the pseudo-code: decreasekey part
+                distances[uNode] = uDist #update the distance if necesary
+                count += 1
+                heapq.heappush(PQ, (uDist, count, uNode))#push the updated value onto the priority queue
+                prev[uNode] = vNode #once you have pushed the node u onto the priority queue note that the previous node was v so you can return the path
+
+    return distances, prev
+
+def array_path(nodes, prev, si, ti):
+    '''Construct the shortest path from source to target position with
+    the prev array from construct_arrays()
+    Arguments:
+        nodes -- maps position --> node
+        prev -- array('q') with the previous position for each node
+        si -- position of the source node
+        ti -- position of the target node
+    Return:
+        list containing the path from source to target node
+    Raises:
+        NoPathError -- if there is no path to target node  
+    '''
+    if prev[ti] == -1:
+        raise NoPathError()
+
+    path = collections.deque([nodes[ti]])
+    while ti != si:
+        ti = prev[ti]
+        path.appendleft(nodes[ti])
+
+    return list(path)
+
 def shortest_path(s, t, prev):
     '''Construct the shortest path from source to target node with
     given list of previous nodes
@@ -156,25 +486,18 @@ def shortest_path(s, t, prev):
     path = collections.deque()
 
     path.append(t)
-    prev_node = prev[t]
+    curr_node = t
+    prev_node = prev.get(t, t)
 
-    if prev_node == t and t != 0:
-        raise NoPathError()
+    # Walk back through the previous nodes until the source is reached,
+    # a node that is its own previous node (other than s) was never reached
+    while curr_node != s:
+        if prev_node == curr_node:
+            raise NoPathError()
 
-    if prev_node == 0 and t != 0:
         path.appendleft(prev_node)
-        return list(path)
-    elif t != 0:
-        curr_node = t
-        while prev_node != s:
-            if prev_node == curr_node:
-                raise NoPathError()
-            
-            path.appendleft(prev_node)
-            curr_node = prev_node
-            prev_node = prev[prev_node]
-            
-        path.appendleft(s)
+        curr_node = prev_node
+        prev_node = prev[prev_node]
         
     return list(path)
         
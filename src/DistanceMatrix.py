@@ -0,0 +1,209 @@
+# Many-to-many shortest distance tables
+#
+# Main functions:
+#     1) distance_matrix() --> Returns a NumPy matrix of the shortest
+#                              distance from every source to every target
+#
+# Methods:
+#     - 'dijkstra' --> one Dijkstra per source that stops as soon as every
+#                      target is settled
+#     - 'buckets'  --> bucket based many-to-many. A size limited backward
+#                      search from each target leaves (target, distance)
+#                      entries in buckets at the nodes it settles, then
+#                      each forward search combines its distances with the
+#                      buckets it meets and stops as soon as every entry of
+#                      its row is certified, so the work near the targets
+#                      is shared by every source
+#
+# Both methods can run the sources in parallel across worker processes,
+# the graph (and buckets) are sent once to each worker, not per source.
+#
+# Graph representation is the same as Dijkstra (non-negative weights):
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import heapq
+import concurrent.futures
+import numpy as np
+import src.Dijkstra as Dijkstra
+
+# Graph state of a worker process, set once by _init_worker()
+_worker = {}
+
+
+def distance_matrix(graph, sources, targets, method='dijkstra', workers=1,
+                    bucket_limit=256):
+    '''Calculates the shortest distance from every source to every target
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        sources -- list of source nodes (rows)
+        targets -- list of target nodes (columns)
+        method -- 'dijkstra' or 'buckets'
+        workers -- number of processes to split the sources across
+        bucket_limit -- max number of nodes each backward search of the
+                        'buckets' method settles
+    Return:
+        float64 NumPy array of shape (len(sources), len(targets)) with
+        inf where a target can't be reached
+    Raises:
+        ValueError -- if a source or target is not a valid node, the
+                      method is unknown or bucket_limit is less than 1
+    '''
+    if method not in ('dijkstra', 'buckets'):
+        raise ValueError('Unknown method: %s' % method)
+    if bucket_limit < 1:
+        raise ValueError('bucket_limit must be at least 1')
+
+    index, nodes = Dijkstra.node_index(graph)
+    try:
+        source_pos = [index[s] for s in sources]
+        target_pos = [index[t] for t in targets]
+    except (KeyError, TypeError):
+        raise ValueError('sources and targets must be nodes in the graph')
+
+    matrix = np.full((len(source_pos), len(target_pos)), np.inf)
+    if not source_pos or not target_pos:
+        return matrix
+
+    buckets = radius = None
+    if method == 'buckets':
+        buckets, radius = _backward_buckets(graph, index, nodes, target_pos,
+                                            bucket_limit)
+
+    state = (graph, target_pos, buckets, radius)
+    if workers <= 1:
+        _init_worker(state)
+        rows = _rows(source_pos)
+    else:
+        # Contiguous chunks keep the results in source order
+        size = -(-len(source_pos) // workers)
+        chunks = [source_pos[i:i + size]
+                  for i in range(0, len(source_pos), size)]
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker,
+                initargs=(state,)) as pool:
+            rows = [row for chunk in pool.map(_rows, chunks) for row in chunk]
+
+    for i, row in enumerate(rows):
+        matrix[i] = row
+    return matrix
+
+
+def _init_worker(state):
+    '''Stores the graph state once per process'''
+    graph, target_pos, buckets, radius = state
+    index, nodes = Dijkstra.node_index(graph)
+    _worker.update(graph=graph, index=index, nodes=nodes,
+                   target_pos=target_pos, buckets=buckets, radius=radius)
+
+
+def _rows(source_pos):
+    '''Returns the matrix rows of the sources with the worker's state'''
+    if _worker['buckets'] is None:
+        return [_dijkstra_row(si) for si in source_pos]
+    return [_bucket_row(si) for si in source_pos]
+
+
+def _dijkstra_row(si):
+    '''Dijkstra from si that stops once every target is settled'''
+    target_pos = _worker['target_pos']
+    index, nodes, dist, prev = Dijkstra.construct_arrays(
+        _worker['graph'], _worker['nodes'][si], targets=target_pos)
+    return [dist[ti] for ti in target_pos]
+
+
+def _backward_buckets(graph, index, nodes, target_pos, limit):
+    '''Runs a backward Dijkstra from each target settling at most limit
+    nodes
+
+    Return:
+        (buckets, radius) where buckets maps node position --> list of
+        (column, distance to that target) and radius[j] is a distance
+        such that every node closer than it to target j has an entry
+        (inf if the search settled everything that can reach it)
+    '''
+    reverse = [[] for _ in nodes]
+    for v in graph:
+        vi = index[v]
+        for u, w in graph[v]:
+            reverse[index[u]].append((vi, w))
+
+    buckets = {}
+    radius = []
+    for j, ti in enumerate(target_pos):
+        dist = {ti: 0}
+        PQ = [(0, ti)]
+        settled = 0
+        reached = float('inf')
+
+        while PQ:
+            d, v = heapq.heappop(PQ)
+            if d > dist[v]:
+                continue
+            if settled == limit:
+                # Everything closer than d is already settled
+                reached = d
+                break
+            settled += 1
+            buckets.setdefault(v, []).append((j, d))
+            for u, w in reverse[v]:
+                if d + w < dist.get(u, float('inf')):
+                    dist[u] = d + w
+                    heapq.heappush(PQ, (d + w, u))
+
+        radius.append(reached)
+
+    return buckets, radius
+
+
+def _bucket_row(si):
+    '''Forward Dijkstra from si combining its distances with the buckets
+
+    When a node v is settled its own bucket and the buckets at the heads
+    of its edges are scanned. If the forward search has settled every
+    node closer than d and the entry for target j is less than d plus
+    its backward radius, the shortest path must cross an edge from a
+    settled node into a node in j's bucket, so the entry is final.
+    '''
+    graph = _worker['graph']
+    index = Dijkstra.edge_index(_worker['index'])
+    nodes = _worker['nodes']
+    buckets = _worker['buckets']
+    radius = _worker['radius']
+    infinity = float('inf')
+
+    # Columns whose backward search was exhaustive are exact from the
+    # source's own bucket alone
+    row = [infinity] * len(radius)
+    for j, dj in buckets.get(si, ()):
+        row[j] = dj
+    open_cols = set(j for j, r in enumerate(radius) if r != infinity)
+    dist = {si: 0}
+    PQ = [(0, si)]
+
+    while PQ:
+        d, vi = heapq.heappop(PQ)
+        if d > dist[vi]:
+            continue
+
+        # Columns whose entry can't improve any more are done
+        for j in [j for j in open_cols if row[j] < d + radius[j]]:
+            open_cols.discard(j)
+        if not open_cols:
+            break
+
+        for j, dj in buckets.get(vi, ()):
+            if d + dj < row[j]:
+                row[j] = d + dj
+
+        for uNode, w in graph[nodes[vi]]:
+            ui = index[uNode]
+            for j, dj in buckets.get(ui, ()):
+                if d + w + dj < row[j]:
+                    row[j] = d + w + dj
+            if d + w < dist.get(ui, infinity):
+                dist[ui] = d + w
+                heapq.heappush(PQ, (d + w, ui))
+
+    return row
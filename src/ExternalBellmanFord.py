@@ -0,0 +1,407 @@
+# Out of core Bellman Ford over an edge file on disk
+#
+# Main functions:
+#     1) EdgeFileWriter() --> Writes edges to an edge file batch by batch
+#     2) write_edge_file() --> Writes a graph dict, scipy.sparse matrix
+#                              or (src, dst, weight) arrays to an edge file
+#     3) EdgeFile() --> Memory maps an edge file and reads it by chunks
+#     4) external_bellman_ford() --> Returns the shortest distance and
+#                                    previous node arrays, reading the
+#                                    edges from the file on every pass
+#
+# For graphs whose edges don't fit in memory. Only the distance and
+# previous node arrays (16 bytes per node) and one chunk of edges are in
+# memory at a time, each pass reads the chunks it needs in file order:
+#     - edges are stored sorted by source, so a chunk holds the edges of
+#       a contiguous range of sources. A chunk is only read if one of its
+#       sources changed distance in the previous pass (or earlier in
+#       this one), late passes only touch the few chunks still changing
+#     - the file is mapped with MADV_SEQUENTIAL, the next chunk to be
+#       read is requested (MADV_WILLNEED) before the current one is
+#       relaxed so the disk reads ahead while NumPy works, and the pages
+#       of a chunk are dropped (MADV_DONTNEED) once it is relaxed so the
+#       mapping doesn't fill memory
+#     - the edges of a chunk are relaxed with NumPy, again while the
+#       chunk is in memory if that improved sources of its own, and
+#       distances improved by a chunk are seen by the chunks after it in
+#       the same pass
+# Nodes are 0..V-1 as with bellman_ford() on a dict. A negative cycle is
+# reported if distances still change after V passes.
+#
+# File layout, every integer little endian:
+#     8 bytes    magic b'SPEDGES\0'
+#     uint32     format version
+#     uint32     length of the JSON header
+#     header     number of nodes and edges, edges per chunk and the dtype
+#                of the node ids, padded to HEADER_SIZE bytes
+#     records    (src, dst, weight) records sorted by src, node ids are
+#                int32 if there are fewer than 2^31 nodes else int64,
+#                weights float64
+import json
+import mmap
+import struct
+import numpy as np
+from src.BellmanFord import NoPathError, NegativeCycleError
+from src.SparseGraph import as_graph
+
+MAGIC = b'SPEDGES\0'
+VERSION = 1
+HEADER_SIZE = 4096
+CHUNK_EDGES = 1 << 16
+_PREFIX = struct.Struct('<8sII')
+
+
+class EdgeFileError(Exception):
+    '''Exception for when a file is not an edge file this version can read'''
+    pass
+
+
+def _record_dtype(num_nodes):
+    index = '<i4' if num_nodes < 2 ** 31 else '<i8'
+    return np.dtype([('src', index), ('dst', index), ('weight', '<f8')])
+
+
+class EdgeFileWriter(object):
+    '''Writes an edge file from batches of edges in order of source,
+    usable as a context manager
+
+    Arguments:
+        path -- file to write
+        num_nodes -- number of nodes, ids are 0..num_nodes-1
+        chunk_edges -- number of edges per chunk
+    Raises:
+        ValueError -- if num_nodes or chunk_edges is negative or zero
+    '''
+
+    def __init__(self, path, num_nodes, chunk_edges=CHUNK_EDGES):
+        if num_nodes < 0 or chunk_edges < 1:
+            raise ValueError('num_nodes must be >= 0 and chunk_edges >= 1')
+        self.num_nodes = num_nodes
+        self.chunk_edges = chunk_edges
+        self.num_edges = 0
+        self._dtype = _record_dtype(num_nodes)
+        self._last = 0
+        self._file = open(path, 'wb')
+        self._file.write(b'\0' * HEADER_SIZE)
+
+    def add(self, src, dst, weight):
+        '''Appends a batch of edges, sources must not go below the last
+        source of the batches before
+
+        Arguments:
+            src -- array with the node each edge comes from, sorted
+            dst -- array with the node each edge goes to
+            weight -- array with the weight of each edge
+        Raises:
+            ValueError -- if the arrays have different lengths, a node is
+                          not in 0..num_nodes-1 or src is out of order
+        '''
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.asarray(weight, dtype=np.float64)
+        if not src.shape == dst.shape == weight.shape or src.ndim != 1:
+            raise ValueError('src, dst and weight must be 1D arrays of '
+                             'the same length')
+        if not src.size:
+            return
+        if (min(src.min(), dst.min()) < 0 or
+                max(src.max(), dst.max()) >= self.num_nodes):
+            raise ValueError('edge nodes must be in 0..%i'
+                             % (self.num_nodes - 1))
+        if src[0] < self._last or np.any(src[1:] < src[:-1]):
+            raise ValueError('edges must be added in order of source')
+
+        records = np.empty(len(src), dtype=self._dtype)
+        records['src'] = src
+        records['dst'] = dst
+        records['weight'] = weight
+        self._file.write(records.tobytes())
+        self.num_edges += len(src)
+        self._last = int(src[-1])
+
+    def close(self):
+        '''Writes the header and closes the file'''
+        if self._file.closed:
+            return
+        header = json.dumps({'num_nodes': self.num_nodes,
+                             'num_edges': self.num_edges,
+                             'chunk_edges': self.chunk_edges,
+                             'dtype': self._dtype.descr}).encode()
+        self._file.seek(0)
+        self._file.write(_PREFIX.pack(MAGIC, VERSION, len(header)) + header)
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_edge_file(path, graph, chunk_edges=CHUNK_EDGES):
+    '''Writes a graph that fits in memory to an edge file
+
+    Arguments:
+        path -- file to write
+        graph -- dict containing (node: (edge, weight)) pairs with nodes
+                 0..V-1, scipy.sparse matrix or (src, dst, weight) tuple
+                 of arrays
+        chunk_edges -- number of edges per chunk
+    Raises:
+        ValueError -- if a node is not in 0..V-1
+    '''
+    graph = as_graph(graph)
+    num_nodes = len(graph)
+    with EdgeFileWriter(path, num_nodes, chunk_edges) as writer:
+        if hasattr(graph, 'indptr'):
+            src = np.repeat(np.arange(num_nodes), np.diff(graph.indptr))
+            writer.add(src, graph.indices, graph.data)
+            return
+
+        if set(graph) != set(range(num_nodes)):
+            raise ValueError('nodes must be 0..%i' % (num_nodes - 1))
+        batch = []
+        for v in range(num_nodes):
+            batch.extend((v, u, w) for u, w in graph[v])
+            if len(batch) >= chunk_edges:
+                writer.add(*zip(*batch))
+                batch = []
+        if batch:
+            writer.add(*zip(*batch))
+
+
+class EdgeFile(object):
+    '''Read only memory map of an edge file
+
+    Arguments:
+        path -- file written by EdgeFileWriter or write_edge_file()
+    Attributes:
+        num_nodes -- number of nodes
+        num_edges -- number of edges
+        chunk_edges -- number of edges per chunk
+        num_chunks -- number of chunks
+        records -- structured array view of every (src, dst, weight)
+    Raises:
+        EdgeFileError -- if the file is not an edge file or has a
+                         different format version
+    '''
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise EdgeFileError('%s is empty' % path)
+
+        mm = self._mm
+        if len(mm) < HEADER_SIZE:
+            raise EdgeFileError('%s is not an edge file' % path)
+        magic, version, header_len = _PREFIX.unpack_from(mm)
+        if magic != MAGIC:
+            raise EdgeFileError('%s is not an edge file' % path)
+        if version != VERSION:
+            raise EdgeFileError('edge file version %i, expected %i'
+                                % (version, VERSION))
+
+        header = json.loads(mm[_PREFIX.size:_PREFIX.size + header_len])
+        self.num_nodes = header['num_nodes']
+        self.num_edges = header['num_edges']
+        self.chunk_edges = header['chunk_edges']
+        self.num_chunks = -(-self.num_edges // self.chunk_edges)
+        dtype = np.dtype([tuple(field) for field in header['dtype']])
+        if len(mm) < HEADER_SIZE + self.num_edges * dtype.itemsize:
+            raise EdgeFileError('%s is truncated' % path)
+        self.records = np.frombuffer(mm, dtype=dtype, count=self.num_edges,
+                                     offset=HEADER_SIZE)
+        self._advise(mmap.MADV_SEQUENTIAL if hasattr(mmap, 'MADV_SEQUENTIAL')
+                     else None, 0, len(mm))
+
+    def _advise(self, option, start, length):
+        '''madvise() where the platform has it, start is rounded down to
+        a page
+        '''
+        if option is None or not hasattr(self._mm, 'madvise'):
+            return
+        aligned = start - start % mmap.PAGESIZE
+        self._mm.madvise(option, aligned, length + start - aligned)
+
+    def _byte_range(self, i):
+        size = self.records.dtype.itemsize
+        a = i * self.chunk_edges
+        b = min(a + self.chunk_edges, self.num_edges)
+        return HEADER_SIZE + a * size, (b - a) * size
+
+    def source_range(self, i):
+        '''Returns the (first, last) source of chunk i'''
+        a = i * self.chunk_edges
+        b = min(a + self.chunk_edges, self.num_edges)
+        return int(self.records['src'][a]), int(self.records['src'][b - 1])
+
+    def prefetch(self, i):
+        '''Asks the OS to start reading chunk i'''
+        if hasattr(mmap, 'MADV_WILLNEED'):
+            self._advise(mmap.MADV_WILLNEED, *self._byte_range(i))
+
+    def release(self, i):
+        '''Lets the OS drop the pages of chunk i'''
+        if hasattr(mmap, 'MADV_DONTNEED'):
+            self._advise(mmap.MADV_DONTNEED, *self._byte_range(i))
+
+    def chunk(self, i):
+        '''Returns the (src, dst, weight) arrays of chunk i, read from the
+        file into memory
+        '''
+        a = i * self.chunk_edges
+        records = self.records[a:a + self.chunk_edges]
+        return (records['src'].astype(np.int64),
+                records['dst'].astype(np.int64),
+                records['weight'].copy())
+
+    def close(self):
+        '''Unmaps the file, arrays still viewing it keep it mapped'''
+        self.records = None
+        try:
+            self._mm.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def external_bellman_ford(edges, src, target=None, stats=None):
+    '''Runs Bellman Ford reading the edges from an edge file every pass
+
+    Arguments:
+        edges -- EdgeFile or path of an edge file
+        src -- source node to start with
+        target -- Optional target node to find shortest dist to
+        stats -- Optional dict, filled with the number of passes and of
+                 chunks read and skipped
+    Return:
+        shortest distance to target if target is given, else (dist,
+        prev) NumPy arrays with infinity and -1 for unreachable nodes,
+        prev of src is src
+    Raises:
+        ValueError -- if src or target are not valid nodes
+        NoPathError -- if there is no path to target node
+        NegativeCycleError -- if there is a negative cycle reachable from
+                              src
+    '''
+    if not isinstance(edges, EdgeFile):
+        with EdgeFile(edges) as edge_file:
+            return external_bellman_ford(edge_file, src, target, stats)
+
+    n = edges.num_nodes
+    if isinstance(src, bool) or not isinstance(src, (int, np.integer)) or \
+            not 0 <= src < n:
+        raise ValueError('Src argument not a valid node')
+    if target is not None and (isinstance(target, bool) or
+                               not isinstance(target, (int, np.integer)) or
+                               not 0 <= target < n):
+        raise ValueError('Target argument not a valid node')
+
+    dist = np.full(n, np.inf)
+    prev = np.full(n, -1, dtype=np.int64)
+    dist[src] = 0
+    prev[src] = src
+    ranges = [edges.source_range(i) for i in range(edges.num_chunks)]
+    active = np.zeros(n, dtype=bool)
+    active[src] = True
+    passes = chunks_read = 0
+
+    def next_active(i):
+        '''First chunk from i on with a source to relax'''
+        while i < num_chunks:
+            lo, hi = ranges[i]
+            if active[lo:hi + 1].any():
+                return i
+            i += 1
+        return i
+
+    num_chunks = edges.num_chunks
+    while True:
+        # Nodes without edges can stay active, they have no chunk
+        i = next_active(0)
+        if i == num_chunks:
+            break
+        if passes == n:
+            raise NegativeCycleError()
+        passes += 1
+        # Sources that change during this pass are relaxed in the next
+        changed = np.zeros(n, dtype=bool)
+        edges.prefetch(i)
+
+        while i < num_chunks:
+            following = next_active(i + 1)
+            if following < num_chunks:
+                edges.prefetch(following)
+            lo, hi = ranges[i]
+            # Sources shared with the chunks before and after have edges
+            # that aren't all relaxed here
+            first = lo + (i > 0 and ranges[i - 1][1] == lo)
+            last = hi - (i + 1 < num_chunks and ranges[i + 1][0] == hi)
+            _relax_chunk(edges.chunk(i), lo, hi, dist, prev, active,
+                         changed, first, last)
+            edges.release(i)
+            chunks_read += 1
+            # Can be before following if this chunk activated one
+            i = next_active(i + 1)
+        active = changed
+
+    chunks_skipped = passes * edges.num_chunks - chunks_read
+    if stats is not None:
+        stats.update(passes=passes, chunks_read=chunks_read,
+                     chunks_skipped=chunks_skipped)
+
+    if target is not None:
+        if prev[target] == -1:
+            raise NoPathError()
+        return float(dist[target])
+    return dist, prev
+
+
+def _relax_chunk(chunk, lo, hi, dist, prev, active, changed, first, last):
+    '''Relaxes the edges of the active sources of a chunk, again and
+    again while they improve sources of the same chunk, at most once per
+    source so a negative cycle inside the chunk can't loop forever. The
+    sources first..last, whose edges are all in the chunk, are only left
+    in changed if they improved in the last round
+    '''
+    s_all, d_all, w_all = chunk
+    sel = np.flatnonzero(active[s_all])
+    offsets = None
+    for _ in range(hi - lo + 1):
+        s, d, w = s_all[sel], d_all[sel], w_all[sel]
+        cand = dist[s] + w
+        better = cand < dist[d]
+        if not better.any():
+            break
+        s, d, cand = s[better], d[better], cand[better]
+        np.minimum.at(dist, d, cand)
+        won = cand == dist[d]
+        prev[d[won]] = s[won]
+        changed[d] = True
+        # Sources improved by this chunk are relaxed by the chunks still
+        # to come in this pass too
+        active[d] = True
+
+        inside = np.unique(d[(d >= lo) & (d <= hi)]) - lo
+        if not inside.size:
+            break
+        # Edges are sorted by source, gather the edge ranges of the
+        # improved sources instead of scanning the chunk
+        if offsets is None:
+            offsets = np.searchsorted(s_all, np.arange(lo, hi + 2))
+        starts = offsets[inside]
+        counts = offsets[inside + 1] - starts
+        ends = np.cumsum(counts)
+        sel = np.arange(ends[-1]) + np.repeat(starts - ends + counts, counts)
+    else:
+        return
+
+    if first <= last:
+        changed[first:last + 1] = False
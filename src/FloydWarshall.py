@@ -0,0 +1,124 @@
+# Implementation of the Floyd Warshall all pairs shortest paths algorithm
+# for dense small to medium graphs
+#
+# Main functions:
+#     1) floyd_warshall() --> Returns the all pairs distance matrix and
+#                             optionally the next hop matrix
+#     2) fw_path() --> Returns the shortest path using the next hops
+#
+# The k loop is done with NumPy broadcast minimum operations on whole row
+# strips and tiled into blocks of block_size:
+#     1) the rows of the k block are relaxed with each k in the block,
+#        which finishes the diagonal block and its row blocks
+#     2) every other strip of block_size rows is relaxed with each k in
+#        the block, the strip and the k rows it reads stay in cache
+#
+# Graph representation is the same as the other engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+# Matrix rows and columns are the positions of the nodes in the dict,
+# which are the nodes themselves when they are 0..V-1
+import collections
+import numpy as np
+import src.Dijkstra as Dijkstra
+from src.BellmanFord import NegativeCycleError, NoPathError
+
+
+def floyd_warshall(graph, next_hops=False, block_size=64):
+    '''Calculates the shortest distance between every pair of nodes
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        next_hops -- if True also return the next hop matrix
+        block_size -- number of k's (and rows) in each block
+    Return:
+        float64 NumPy matrix of distances with inf where there is no
+        path, or (dist, nxt) if next_hops is True where nxt[i, j] is the
+        position of the node after i on the shortest path to j (-1 if
+        there is no path)
+    Raises:
+        TypeError -- if graph is not a dict
+        NegativeCycleError -- if there is a negative cycle in the graph
+    '''
+    if not isinstance(graph, dict):
+        raise TypeError('Graph input must be a dictionary')
+
+    index, nodes = Dijkstra.node_index(graph)
+    n = len(nodes)
+
+    dist = np.full((n, n), np.inf)
+    nxt = np.full((n, n), -1, dtype=np.int64) if next_hops else None
+    for v in graph:
+        vi = index[v]
+        for u, w in graph[v]:
+            ui = index[u]
+            if w < dist[vi, ui]:
+                dist[vi, ui] = w
+                if next_hops:
+                    nxt[vi, ui] = ui
+    for i in range(n):
+        if dist[i, i] > 0:
+            dist[i, i] = 0
+            if next_hops:
+                nxt[i, i] = i
+
+    for start in range(0, n, block_size):
+        ks = range(start, min(start + block_size, n))
+
+        # Phase 1: the k block's own rows, finishes them for this block
+        _relax_rows(dist, nxt, slice(ks.start, ks.stop), ks)
+
+        # Phase 2: every other strip of rows against the finished k rows
+        for row in range(0, n, block_size):
+            if row != start:
+                _relax_rows(dist, nxt, slice(row, min(row + block_size, n)), ks)
+
+    if n and np.diagonal(dist).min() < 0:
+        raise NegativeCycleError()
+
+    if next_hops:
+        return dist, nxt
+    return dist
+
+
+def _relax_rows(dist, nxt, rows, ks):
+    '''Relaxes the strip of rows through each k in order'''
+    strip = dist[rows]
+    hops = nxt[rows] if nxt is not None else None
+
+    for k in ks:
+        candidate = strip[:, k, None] + dist[k]
+        if hops is None:
+            np.minimum(strip, candidate, out=strip)
+        else:
+            better = candidate < strip
+            strip[better] = candidate[better]
+            hops[better] = np.broadcast_to(hops[:, k, None], strip.shape)[better]
+
+
+def fw_path(graph, nxt, s, t):
+    '''Construct the shortest path from s to t with the next hop matrix
+
+    Arguments:
+        graph -- dict the next hop matrix was built from
+        nxt -- next hop matrix from floyd_warshall(next_hops=True)
+        s -- source node
+        t -- target node
+    Return:
+        list containing the path from source to target node
+    Raises:
+        NoPathError -- if there is no path to target node
+    '''
+    index, nodes = Dijkstra.node_index(graph)
+    si = index[s]
+    ti = index[t]
+
+    if nxt[si, ti] == -1:
+        raise NoPathError()
+
+    path = collections.deque([s])
+    while si != ti:
+        si = nxt[si, ti]
+        path.append(nodes[si])
+    return list(path)
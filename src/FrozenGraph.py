@@ -0,0 +1,360 @@
+# Immutable, validated graph that many threads can query at once
+#
+# Main functions:
+#     1) FrozenGraph.dij() --> Returns shortest distances (Dijkstra)
+#     2) FrozenGraph.dij_paths() --> Returns shortest paths (Dijkstra)
+#     3) FrozenGraph.bellman_ford() --> Returns shortest distances
+#     4) FrozenGraph.bf_paths() --> Returns shortest paths (Bellman Ford)
+#
+# The graph is copied once into tuples of (position, weight) tuples and a
+# read only node --> position mapping, so nothing a query reads can
+# change under it and no locks are needed. All
+# per query state lives in a workspace (distance and previous arrays plus
+# the list of positions a query touched) kept per thread, so a query
+# never allocates O(V) state and only resets the entries it touched. The
+# same holds on free threaded (no GIL) builds, threads only ever share
+# the read only tuples.
+#
+# FrozenGraph(graph, threads=False) allocates one workspace up front and
+# uses it for every query instead, saving the thread local lookup of each
+# query. Such a graph must only be queried from one thread at a time.
+#
+# Results are in the same format as the Dijkstra and BellmanFord
+# functions of the same names, but any hashable nodes work for both.
+#
+# Graph representation of the input is the same as the engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import sys
+import types
+import heapq
+import array
+import threading
+import collections
+from src.Dijkstra import NoPathError
+from src.BellmanFord import NegativeCycleError
+
+
+class FrozenGraph(object):
+    '''Read only copy of a graph with thread local query workspaces
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        threads -- if False one workspace is shared by every query, the
+                   graph must then only be queried from one thread at a
+                   time
+    Raises:
+        TypeError -- if graph is not a dict or a weight is not a number
+        ValueError -- if an edge goes to a node that is not a key
+    '''
+    __slots__ = ('nodes', 'index', 'adj', 'num_edges', 'has_negative',
+                 'threads', '_local', '_ws')
+
+    def __init__(self, graph, threads=True):
+        if not isinstance(graph, dict):
+            raise TypeError('Graph input must be a dictionary')
+
+        # Interned names make the index lookups of string nodes identity
+        # checks
+        nodes = tuple(sys.intern(v) if type(v) is str else v for v in graph)
+        index = {node: i for i, node in enumerate(nodes)}
+        adj = []
+        has_negative = False
+        for v in nodes:
+            edges = []
+            for u, w in graph[v]:
+                if u not in index:
+                    raise ValueError('edge %r --> %r goes to a node that is '
+                                     'not in the graph' % (v, u))
+                if isinstance(w, bool) or not isinstance(w, (int, float)):
+                    raise TypeError('weight of %r --> %r is not a number'
+                                    % (v, u))
+                if w < 0:
+                    has_negative = True
+                edges.append((index[u], w))
+            adj.append(tuple(edges))
+
+        set_ = object.__setattr__
+        set_(self, 'nodes', nodes)
+        # Read only view, an assignment to the index would corrupt every
+        # later query
+        set_(self, 'index', types.MappingProxyType(index))
+        set_(self, 'adj', tuple(adj))
+        set_(self, 'num_edges', sum(len(edges) for edges in adj))
+        set_(self, 'has_negative', has_negative)
+        set_(self, 'threads', bool(threads))
+        set_(self, '_local', threading.local() if threads else None)
+        set_(self, '_ws', None if threads else self._new_workspace())
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenGraph is immutable')
+
+    def __delattr__(self, name):
+        raise AttributeError('FrozenGraph is immutable')
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __getitem__(self, node):
+        '''Returns the edges of node as a tuple of (edge, weight) pairs'''
+        nodes = self.nodes
+        return tuple((nodes[ui], w) for ui, w in self.adj[self.index[node]])
+
+    def to_dict(self):
+        '''Returns a new mutable dict copy of the graph'''
+        return {node: list(self[node]) for node in self.nodes}
+
+    def _workspace(self):
+        '''Returns the calling thread's workspace, made on first use, or
+        the shared one without threads
+        '''
+        ws = self._ws
+        if ws is not None:
+            return ws
+        ws = getattr(self._local, 'ws', None)
+        if ws is None:
+            ws = self._local.ws = self._new_workspace()
+        return ws
+
+    def _new_workspace(self):
+        n = len(self.nodes)
+        return _Workspace(array.array('d', [float('inf')]) * n,
+                          array.array('q', [-1]) * n, [])
+
+    def _position(self, node, name):
+        try:
+            return self.index[node]
+        except (KeyError, TypeError):
+            raise ValueError('%s argument not a valid node' % name)
+
+    def dij(self, s, t=None):
+        '''Calculates shortest distances for each node from a source,
+        the search stops as soon as t is settled if it is given
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest dist to
+        Returns:
+            dict with shortest distances for all nodes (infinity if
+            unreachable) or shortest distance to target if t is given
+        Raises:
+            ValueError -- if s or t are not valid nodes or the graph has
+                          negative weights
+            NoPathError -- if there is no path to target node
+        '''
+        ws = self._search(s, t)
+        try:
+            if t is not None:
+                ti = self.index[t]
+                if ws.prev[ti] == -1:
+                    raise NoPathError()
+                return ws.dist[ti]
+            return dict(zip(self.nodes, ws.dist))
+        finally:
+            ws.reset()
+
+    def dij_paths(self, s, t=None):
+        '''Constructs shortest paths for every node from a source unless
+        a target node is given
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest path to
+        Return:
+            dict with the shortest paths for each node ([] if
+            unreachable) if t is None, else list with the shortest path
+        Raises:
+            ValueError -- if s or t are not valid nodes or the graph has
+                          negative weights
+            NoPathError -- if there is no path to target node
+        '''
+        ws = self._search(s, t)
+        try:
+            return self._paths(ws, s, t)
+        finally:
+            ws.reset()
+
+    def bellman_ford(self, s, t=None):
+        '''Calculates shortest distances for each node from a source,
+        negative weights are allowed
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest dist to
+        Return:
+            dict with shortest distances for the reachable nodes or
+            shortest distance to target if t is given
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+            NegativeCycleError -- if a negative cycle is reachable from s
+        '''
+        ws = self._relax(s, t)
+        try:
+            if t is not None:
+                ti = self.index[t]
+                if ws.prev[ti] == -1:
+                    raise NoPathError()
+                return ws.dist[ti]
+            nodes = self.nodes
+            dist = ws.dist
+            return {nodes[i]: dist[i] for i in sorted(ws.touched)}
+        finally:
+            ws.reset()
+
+    def bf_paths(self, s, t=None):
+        '''Constructs shortest paths for every node from a source unless
+        a target node is given, negative weights are allowed
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest path to
+        Return:
+            dict with the shortest paths for each node ([] if
+            unreachable) if t is None, else list with the shortest path
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+            NegativeCycleError -- if a negative cycle is reachable from s
+        '''
+        ws = self._relax(s, t)
+        try:
+            return self._paths(ws, s, t)
+        finally:
+            ws.reset()
+
+    def _search(self, s, t):
+        '''Runs Dijkstra from s in the thread's workspace'''
+        if self.has_negative:
+            raise ValueError('Dijkstra requires non-negative weights')
+        si = self._position(s, 's')
+        ti = self._position(t, 't') if t is not None else -1
+
+        ws = self._workspace()
+        adj = self.adj
+        dist = ws.dist
+        prev = ws.prev
+        touched = ws.touched
+
+        dist[si] = 0
+        prev[si] = si
+        touched.append(si)
+        PQ = [(0, si)]
+
+        try:
+            while PQ:
+                d, vi = heapq.heappop(PQ)
+                if d > dist[vi]:
+                    continue
+                if vi == ti:
+                    break
+                for ui, w in adj[vi]:
+                    nd = d + w
+                    if nd < dist[ui]:
+                        if prev[ui] == -1:
+                            touched.append(ui)
+                        dist[ui] = nd
+                        prev[ui] = vi
+                        heapq.heappush(PQ, (nd, ui))
+        except BaseException:
+            # Leave the workspace clean for the thread's next query
+            ws.reset()
+            raise
+
+        return ws
+
+    def _relax(self, s, t):
+        '''Runs Bellman Ford from s in the thread's workspace, each pass
+        only relaxes the edges of nodes that changed in the pass before
+        '''
+        si = self._position(s, 's')
+        if t is not None:
+            self._position(t, 't')
+
+        ws = self._workspace()
+        adj = self.adj
+        dist = ws.dist
+        prev = ws.prev
+        touched = ws.touched
+
+        dist[si] = 0
+        prev[si] = si
+        touched.append(si)
+        frontier = [si]
+
+        try:
+            for k in range(len(self.nodes)):
+                if not frontier:
+                    return ws
+                changed = []
+                for vi in frontier:
+                    dv = dist[vi]
+                    for ui, w in adj[vi]:
+                        if dv + w < dist[ui]:
+                            if prev[ui] == -1:
+                                touched.append(ui)
+                            dist[ui] = dv + w
+                            prev[ui] = vi
+                            changed.append(ui)
+                frontier = list(dict.fromkeys(changed))
+        except BaseException:
+            ws.reset()
+            raise
+
+        # Still changing after V passes
+        if frontier:
+            ws.reset()
+            raise NegativeCycleError()
+        return ws
+
+    def _paths(self, ws, s, t):
+        '''Builds the path result from the workspace's previous array'''
+        nodes = self.nodes
+        prev = ws.prev
+        si = self.index[s]
+
+        if t is not None:
+            return _walk(nodes, prev, si, self.index[t])
+
+        shortest_paths = {node: [] for node in nodes}
+        for i in ws.touched:
+            shortest_paths[nodes[i]] = _walk(nodes, prev, si, i)
+        return shortest_paths
+
+
+class _Workspace(object):
+    '''Per thread query state, every entry not in touched is reset'''
+    __slots__ = ('dist', 'prev', 'touched')
+
+    def __init__(self, dist, prev, touched):
+        self.dist = dist
+        self.prev = prev
+        self.touched = touched
+
+    def reset(self):
+        infinity = float('inf')
+        dist = self.dist
+        prev = self.prev
+        for i in self.touched:
+            dist[i] = infinity
+            prev[i] = -1
+        del self.touched[:]
+
+
+def _walk(nodes, prev, si, ti):
+    '''Walks the previous positions back from ti to si'''
+    if prev[ti] == -1:
+        raise NoPathError()
+
+    path = collections.deque([nodes[ti]])
+    while ti != si:
+        ti = prev[ti]
+        path.appendleft(nodes[ti])
+    return list(path)
@@ -0,0 +1,269 @@
+# Shortest paths on 2D cost rasters (4 or 8 connected grids) without
+# expanding them into graph dicts
+#
+# Main functions:
+#     1) grid_search() --> Returns the (dist, prev) arrays of a search from
+#                          one or more source cells
+#     2) grid_dij() --> Returns shortest distances (Dijkstra)
+#     3) grid_dij_paths() --> Returns shortest paths (Dijkstra)
+#     4) grid_path() --> Returns the shortest path using the prev array
+#     5) grid_to_dict() --> Returns the same graph in the usual dict format
+#
+# Grid representation:
+#     nodes == (row, col) cells of the cost array
+#     moving from a cell into a neighbor costs the neighbor's cost, times
+#     diagonal for the diagonal moves of an 8 connected grid. Cells with
+#     an inf or nan cost can't be entered, the cost of the source cells is
+#     never paid.
+#     Example:
+#         cost = [[1, 2],
+#                 [5, 1]]
+#         4 connected == {(0, 0): [((0, 1), 2), ((1, 0), 5)],
+#                         (0, 1): [((0, 0), 1), ((1, 1), 1)], ...}
+#
+# The costs are copied once into a flat array with a border of inf cells,
+# so the neighbors of a cell are its index plus a fixed offset and never
+# need bounds checks. The search is delta stepping with NumPy: cells are
+# settled in buckets of distance width delta, and within a bucket the whole
+# frontier is relaxed at once per neighbor offset until nothing in the
+# bucket improves. Distances and previous cells are stored in arrays the
+# size of the grid, about 3 times the memory of the raster itself.
+import math
+import numpy as np
+from src.Dijkstra import NoPathError
+
+OFFSETS_4 = ((-1, 0), (1, 0), (0, -1), (0, 1))
+OFFSETS_8 = OFFSETS_4 + ((-1, -1), (-1, 1), (1, -1), (1, 1))
+
+
+def grid_search(cost, s, t=None, max_distance=None, connectivity=4,
+                diagonal=math.sqrt(2), delta=None):
+    '''Runs Dijkstra on a cost raster from one or more source cells
+
+    Arguments:
+        cost -- 2D array of non negative cell costs, inf or nan for cells
+                that can't be entered
+        s -- (row, col) source cell or a list of source cells, each cell's
+             distance is to its nearest source
+        t -- Optional (row, col) target cell or list of target cells, the
+             search stops once they are settled
+        max_distance -- Optional radius, cells further than it from the
+                        sources are never reached
+        connectivity -- 4 or 8 neighbors per cell
+        diagonal -- multiplier of the cost of diagonal moves
+        delta -- width of the distance buckets, by default 4 times the
+                 mean cost of the cells that can be entered
+    Return:
+        (dist, prev) arrays with the shape of cost, dist is float64 with
+        inf for the cells that weren't reached and prev is int64 with the
+        flat index (row * width + col) of the previous cell, -1 for cells
+        that weren't reached and the cell itself for sources. With t given
+        only the distances of settled cells are final
+    Raises:
+        ValueError -- if cost is not 2D or has negative costs, a cell is
+                      not in the grid or connectivity is not 4 or 8
+    '''
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim != 2:
+        raise ValueError('cost must be a 2D array')
+    if connectivity not in (4, 8):
+        raise ValueError('connectivity must be 4 or 8')
+    if (cost < 0).any():
+        raise ValueError('Dijkstra requires non-negative costs')
+
+    rows, cols = cost.shape
+    width = cols + 2
+    padded = np.full((rows + 2, width), np.inf)
+    padded[1:-1, 1:-1] = cost
+    padded[np.isnan(padded)] = np.inf
+    padded = padded.ravel()
+
+    sources = _cells(s, cost.shape, 's')
+    sources = (sources // cols + 1) * width + sources % cols + 1
+    targets = None
+    if t is not None:
+        targets = _cells(t, cost.shape, 't')
+        targets = (targets // cols + 1) * width + targets % cols + 1
+
+    if delta is None:
+        passable = np.isfinite(cost)
+        delta = 4 * float(cost[passable].mean()) if passable.any() else 1.0
+    if delta <= 0:
+        delta = 1.0
+    limit = np.inf if max_distance is None else max_distance
+
+    offsets = OFFSETS_4 if connectivity == 4 else OFFSETS_8
+    moves = [(dr * width + dc, 1.0 if dr == 0 or dc == 0 else diagonal)
+             for dr, dc in offsets]
+
+    dist = np.full(padded.size, np.inf)
+    prev = np.full(padded.size, -1, dtype=np.int64)
+    dist[sources] = 0
+    prev[sources] = sources
+
+    pending = np.unique(sources)
+    upper = 0.0
+    while pending.size:
+        # Next bucket starts at the closest cell that isn't settled
+        upper = (math.floor(dist[pending].min() / delta) + 1) * delta
+        in_bucket = dist[pending] < upper
+        frontier = pending[in_bucket]
+        later = [pending[~in_bucket]]
+
+        while frontier.size:
+            df = dist[frontier]
+            improved = []
+            for offset, factor in moves:
+                nb = frontier + offset
+                cand = df + padded[nb] * factor
+                better = (cand < dist[nb]) & (cand <= limit)
+                nb = nb[better]
+                dist[nb] = cand[better]
+                prev[nb] = frontier[better]
+                improved.append(nb)
+
+            improved = np.unique(np.concatenate(improved))
+            in_bucket = dist[improved] < upper
+            frontier = improved[in_bucket]
+            later.append(improved[~in_bucket])
+
+        # Everything closer than upper is settled now
+        if targets is not None and (dist[targets] < upper).all():
+            break
+        pending = np.unique(np.concatenate(later))
+        pending = pending[dist[pending] >= upper]
+
+    dist = dist.reshape(rows + 2, width)[1:-1, 1:-1].copy()
+    prev = prev.reshape(rows + 2, width)[1:-1, 1:-1]
+    reached = prev != -1
+    prev = np.where(reached, (prev // width - 1) * cols + prev % width - 1, -1)
+    return dist, prev
+
+
+def _cells(cells, shape, name):
+    '''Returns the flat indices of one (row, col) cell or a list of cells
+
+    Raises:
+        ValueError -- if a cell is not in the grid
+    '''
+    rows, cols = shape
+    if isinstance(cells, tuple) and len(cells) == 2 and \
+            not isinstance(cells[0], tuple):
+        cells = [cells]
+    try:
+        cells = np.array([(int(r), int(c)) for r, c in cells],
+                         dtype=np.int64).reshape(-1, 2)
+    except (TypeError, ValueError):
+        raise ValueError('%s argument not a valid cell' % name)
+    r, c = cells[:, 0], cells[:, 1]
+    if not cells.size or ((r < 0) | (r >= rows) | (c < 0) | (c >= cols)).any():
+        raise ValueError('%s argument not a valid cell' % name)
+    return r * cols + c
+
+
+def grid_path(prev, t):
+    '''Construct the shortest path to target cell with the prev array
+    from grid_search()
+
+    Arguments:
+        prev -- prev array from grid_search()
+        t -- (row, col) target cell
+    Return:
+        list of (row, col) cells from the nearest source to t
+    Raises:
+        NoPathError -- if there is no path to target cell
+    '''
+    cols = prev.shape[1]
+    flat = prev.ravel()
+    ti = t[0] * cols + t[1]
+    if flat[ti] == -1:
+        raise NoPathError()
+
+    path = [ti]
+    while flat[ti] != ti:
+        ti = int(flat[ti])
+        path.append(ti)
+    return [divmod(i, cols) for i in reversed(path)]
+
+
+def grid_dij(cost, s, t=None, max_distance=None, connectivity=4,
+             diagonal=math.sqrt(2)):
+    '''Calculates shortest distances for each cell from the sources
+
+    Arguments:
+        cost, s, max_distance, connectivity, diagonal -- as grid_search()
+        t -- Optional (row, col) target cell to find shortest dist to
+    Return:
+        float64 array of distances with the shape of cost (inf if
+        unreachable) or shortest distance to target if t is given
+    Raises:
+        ValueError -- as grid_search()
+        NoPathError -- if there is no path to target cell
+    '''
+    dist, prev = grid_search(cost, s, t, max_distance, connectivity,
+                             diagonal)
+    if t is not None:
+        if prev[t] == -1:
+            raise NoPathError()
+        return float(dist[t])
+    return dist
+
+
+def grid_dij_paths(cost, s, t=None, max_distance=None, connectivity=4,
+                   diagonal=math.sqrt(2)):
+    '''Constructs shortest paths for every cell from the sources unless a
+    target cell is given, in the same format as Dijkstra.dij_paths()
+
+    Arguments:
+        cost, s, max_distance, connectivity, diagonal -- as grid_search()
+        t -- Optional (row, col) target cell to find shortest path to
+    Return:
+        dict with the shortest paths for each cell ([] if unreachable) if
+        t is None, else list with the shortest path. For large grids use
+        grid_search() and grid_path() on the cells that are needed
+    Raises:
+        ValueError -- as grid_search()
+        NoPathError -- if there is no path to target cell
+    '''
+    dist, prev = grid_search(cost, s, t, max_distance, connectivity,
+                             diagonal)
+    if t is not None:
+        return grid_path(prev, t)
+
+    rows, cols = prev.shape
+    shortest_paths = {}
+    for r in range(rows):
+        for c in range(cols):
+            if prev[r, c] == -1:
+                shortest_paths[(r, c)] = []
+            else:
+                shortest_paths[(r, c)] = grid_path(prev, (r, c))
+    return shortest_paths
+
+
+def grid_to_dict(cost, connectivity=4, diagonal=math.sqrt(2)):
+    '''Expands a cost raster into the graph dict the other engines take
+
+    Arguments:
+        cost, connectivity, diagonal -- as grid_search()
+    Return:
+        dict containing ((row, col): [((row, col), weight)]) pairs
+    '''
+    cost = np.asarray(cost, dtype=np.float64)
+    rows, cols = cost.shape
+    offsets = OFFSETS_4 if connectivity == 4 else OFFSETS_8
+
+    graph = {}
+    for r in range(rows):
+        for c in range(cols):
+            edges = []
+            for dr, dc in offsets:
+                r2, c2 = r + dr, c + dc
+                if 0 <= r2 < rows and 0 <= c2 < cols:
+                    w = float(cost[r2, c2])
+                    if math.isfinite(w):
+                        if dr and dc:
+                            w *= diagonal
+                        edges.append(((r2, c2), w))
+            graph[(r, c)] = edges
+    return graph
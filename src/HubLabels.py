@@ -0,0 +1,269 @@
+# Exact distance oracle from pruned landmark labeling (hub labels)
+#
+# Main functions:
+#     1) HubLabels() --> Builds the labels of every node of a graph
+#     2) HubLabels.distance() --> Returns the shortest distance from s to t
+#     3) HubLabels.save() --> Writes the labels to a snapshot file
+#     4) HubLabels.load() --> Memory maps labels saved for a graph
+#     5) importance_order() --> Orders the nodes by how many shortest
+#                               paths go through them
+#
+# Every node v gets an out label of (hub, distance from v to hub) pairs
+# and an in label of (hub, distance from hub to v) pairs, such that some
+# node on a shortest path from s to t is a hub of both the out label of s
+# and the in label of t. A query is then a merge of two short sorted
+# label arrays, no search at all.
+#
+# The labels are built by a pruned Dijkstra (Dijkstra.construct_sparse()
+# with prune) forward and backward from every node in order of
+# importance. A search stops at a node when the labels built so far
+# already give a distance as short as the one it found, so the searches
+# of the less important nodes only touch a small area and the labels stay
+# short. The default order puts first the nodes with the most descendants
+# in the shortest path trees of a few random sources, the nodes most
+# shortest paths go through. Degree alone ties on grid like road networks
+# and gives labels about 3 times longer.
+#
+# The labels are stored compactly by node position (Dijkstra.node_index())
+# as offsets into flat arrays of hub ranks (int32) and distances
+# (float64). save() writes them through Snapshot, load() maps the file
+# so only the labels a query reads are ever paged in.
+#
+# Graph representation is the same as the engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import math
+import random
+import numpy as np
+import src.Dijkstra as Dijkstra
+from src.Dijkstra import NoPathError
+from src.Snapshot import save_snapshot, load_snapshot, SnapshotError
+
+_ARRAYS = ('rank', 'out_offsets', 'out_hubs', 'out_dist', 'in_offsets',
+           'in_hubs', 'in_dist')
+
+
+class HubLabels(object):
+    '''Pruned landmark labels of a graph
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        order -- Optional list of every node from most to least
+                 important, by default importance_order(graph)
+    Attributes:
+        rank -- array position --> rank in the order, the hubs in the
+                labels are ranks
+        out_offsets, out_hubs, out_dist -- out labels, those of the node
+                at position i are out_hubs[out_offsets[i]:out_offsets[i
+                + 1]] (sorted) and the distances to them
+        in_offsets, in_hubs, in_dist -- in labels, same layout
+    Raises:
+        TypeError -- if graph is not a dict
+        ValueError -- if a weight is negative, an edge goes to a node
+                      that is not a key or order is not the nodes
+    '''
+
+    def __init__(self, graph, order=None):
+        if not isinstance(graph, dict):
+            raise TypeError('Graph input must be a dictionary')
+        self.index, self.nodes = Dijkstra.node_index(graph)
+        self._from_arrays(_build(graph, self.index, self.nodes, order))
+
+    @classmethod
+    def load(cls, path, graph, fingerprint=None):
+        '''Memory maps the labels that save() wrote for graph, fingerprint
+        is passed on to Snapshot.load_snapshot()
+
+        Raises:
+            SnapshotError -- if the file is not a snapshot or has no labels
+            StaleSnapshotError -- if the labels are for a different graph
+        '''
+        snapshot = load_snapshot(path, graph, fingerprint)
+        if any(name not in snapshot.arrays for name in _ARRAYS):
+            raise SnapshotError('%s has no hub labels' % path)
+        labels = cls.__new__(cls)
+        labels.index, labels.nodes = Dijkstra.node_index(graph)
+        labels._from_arrays(snapshot.arrays)
+        return labels
+
+    def _from_arrays(self, arrays):
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        # Offsets are read on every query, lists are faster to index
+        self._out = self.out_offsets.tolist()
+        self._in = self.in_offsets.tolist()
+
+    def save(self, path, graph, fingerprint=None):
+        '''Writes the labels to a snapshot file of graph'''
+        save_snapshot(path, graph,
+                      arrays={name: getattr(self, name) for name in _ARRAYS},
+                      fingerprint=fingerprint)
+
+    @property
+    def size(self):
+        '''Number of (hub, distance) entries of all labels'''
+        return len(self.out_hubs) + len(self.in_hubs)
+
+    @property
+    def nbytes(self):
+        '''Bytes of the label arrays'''
+        return sum(getattr(self, name).nbytes for name in _ARRAYS)
+
+    def _position(self, node, name):
+        try:
+            return self.index[node]
+        except (KeyError, TypeError):
+            raise ValueError('%s argument not a valid node' % name)
+
+    def distance(self, s, t):
+        '''Returns the shortest distance from s to t
+
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+        '''
+        si = self._position(s, 's')
+        ti = self._position(t, 't')
+        a, b = self._out[si], self._out[si + 1]
+        c, d = self._in[ti], self._in[ti + 1]
+        best = _merge(self.out_hubs[a:b].tolist(), self.out_dist[a:b].tolist(),
+                      self.in_hubs[c:d].tolist(), self.in_dist[c:d].tolist())
+        if best == math.inf:
+            raise NoPathError()
+        return best
+
+
+def importance_order(graph, samples=32, seed=0):
+    '''Orders the nodes by the number of their descendants summed over
+    the shortest path trees of random sources
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        samples -- number of random sources
+        seed -- seed of the random sources and of the ties
+    Return:
+        list of every node, most important first
+    '''
+    index, nodes = Dijkstra.node_index(graph)
+    n = len(nodes)
+    rng = random.Random(seed)
+    score = [0] * n
+    for _ in range(min(samples, n)):
+        s = nodes[rng.randrange(n)]
+        _, _, dist, prev = Dijkstra.construct_arrays(graph, s)
+        # Children are further from s than their parents
+        size = [1] * n
+        for i in sorted(range(n), key=dist.__getitem__, reverse=True):
+            p = prev[i]
+            if p != -1 and p != i:
+                size[p] += size[i]
+        for i in range(n):
+            if prev[i] != -1:
+                score[i] += size[i]
+
+    ties = [rng.random() for _ in range(n)]
+    return [nodes[i] for i in sorted(range(n),
+                                     key=lambda i: (-score[i], ties[i]))]
+
+
+def _merge(hubs_s, dist_s, hubs_t, dist_t):
+    '''Smallest dist_s + dist_t over the hubs of both sorted labels'''
+    best = math.inf
+    i = j = 0
+    len_s = len(hubs_s)
+    len_t = len(hubs_t)
+    while i < len_s and j < len_t:
+        hs = hubs_s[i]
+        ht = hubs_t[j]
+        if hs == ht:
+            d = dist_s[i] + dist_t[j]
+            if d < best:
+                best = d
+            i += 1
+            j += 1
+        elif hs < ht:
+            i += 1
+        else:
+            j += 1
+    return best
+
+
+def _build(graph, index, nodes, order):
+    '''Runs the pruned searches from every node in order and returns the
+    label arrays
+    '''
+    n = len(nodes)
+    edges = []
+    for v in nodes:
+        for u, w in graph[v]:
+            if w < 0:
+                raise ValueError('hub labels require non-negative weights')
+            try:
+                edges.append((index[v], index[u], w))
+            except (KeyError, TypeError):
+                raise ValueError('edge %r --> %r goes to a node that is not '
+                                 'in the graph' % (v, u))
+
+    if order is None:
+        order = importance_order(graph)
+    if len(order) != n or set(order) != set(nodes):
+        raise ValueError('order must list every node once')
+
+    # Searches run on ranks, so each label is built already sorted
+    rank = [0] * n
+    for r, v in enumerate(order):
+        rank[index[v]] = r
+    forward = [[] for _ in range(n)]
+    backward = [[] for _ in range(n)]
+    for vi, ui, w in edges:
+        forward[rank[vi]].append((rank[ui], w))
+        backward[rank[ui]].append((rank[vi], w))
+    del edges
+
+    out_hubs = [[] for _ in range(n)]
+    out_dist = [[] for _ in range(n)]
+    in_hubs = [[] for _ in range(n)]
+    in_dist = [[] for _ in range(n)]
+    infinity = math.inf
+
+    for k in range(n):
+        # Forward search, d is the distance from k to u. Distances from k
+        # to the hubs of its own out label are looked up in a dict
+        known = dict(zip(out_hubs[k], out_dist[k]))
+
+        def prune_in(u, d):
+            get = known.get
+            for h, dh in zip(in_hubs[u], in_dist[u]):
+                if get(h, infinity) + dh <= d:
+                    return True
+            in_hubs[u].append(k)
+            in_dist[u].append(d)
+            return False
+        Dijkstra.construct_sparse(forward.__getitem__, k, prune=prune_in)
+
+        # Backward search, d is the distance from u to k
+        known = dict(zip(in_hubs[k], in_dist[k]))
+
+        def prune_out(u, d):
+            get = known.get
+            for h, dh in zip(out_hubs[u], out_dist[u]):
+                if dh + get(h, infinity) <= d:
+                    return True
+            out_hubs[u].append(k)
+            out_dist[u].append(d)
+            return False
+        Dijkstra.construct_sparse(backward.__getitem__, k, prune=prune_out)
+
+    arrays = {'rank': np.array(rank, dtype=np.int64)}
+    for name, hubs, dist in (('out', out_hubs, out_dist),
+                             ('in', in_hubs, in_dist)):
+        # Labels are by rank, the arrays by position
+        arrays[name + '_offsets'] = np.cumsum(
+            [0] + [len(hubs[r]) for r in rank], dtype=np.int64)
+        arrays[name + '_hubs'] = np.array(
+            [h for r in rank for h in hubs[r]], dtype=np.int32)
+        arrays[name + '_dist'] = np.array(
+            [x for r in rank for x in dist[r]], dtype=np.float64)
+    return arrays
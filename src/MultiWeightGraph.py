@@ -0,0 +1,166 @@
+# Graph with one shared topology and several weight columns
+#
+# Main functions:
+#     1) MultiWeightGraph() --> Builds the graph from edges with one
+#                               weight per column
+#     2) MultiWeightGraph.metric() --> Returns a read only view of one
+#                                      column in the usual graph format
+#     3) select_metric() --> Returns the view for the weight= argument of
+#                            the engines
+#
+# The edges are stored once, in compressed sparse row order:
+#     offsets -- array('q'), the edges of the i-th node are the slice
+#                offsets[i]:offsets[i + 1] of heads and every column
+#     heads   -- list of the node each edge goes to
+#     columns -- dict name --> array('d') of the weight of each edge
+# A view only holds a reference to the topology and one column, so
+# switching metrics doesn't build or copy anything. Views can be passed
+# anywhere a graph dict is read (dij, dij_paths, bellman_ford, bf_paths,
+# ...), or the engines can be given the MultiWeightGraph and a weight=
+# column name.
+#
+# Input representation:
+#     nodes == keys
+#     [(Edge to, Weight 1, Weight 2, ...)] == Value
+#     Example:
+#         1 --> 2 (time of 5, toll of 2)
+#         represented as (1: [(2, 5, 2)]) with columns ('time', 'toll')
+import array
+import collections.abc
+
+
+class MultiWeightGraph(object):
+    '''Shared topology with one weight column per metric
+
+    Arguments:
+        graph -- dict containing (node: [(edge, weight, ...)]) pairs with
+                 one weight per column, represents the directed graph
+        columns -- names of the weight columns, in order
+    Raises:
+        TypeError -- if graph is not a dict
+        ValueError -- if an edge doesn't have one weight per column, an
+                      edge goes to a node that is not a key or a column
+                      name is repeated
+    '''
+
+    def __init__(self, graph, columns):
+        if not isinstance(graph, dict):
+            raise TypeError('Graph input must be a dictionary')
+        columns = tuple(columns)
+        if len(set(columns)) != len(columns):
+            raise ValueError('column names must be unique')
+
+        self.nodes = list(graph)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+        self.offsets = array.array('q', [0])
+        self.heads = []
+        self.columns = {name: array.array('d') for name in columns}
+        weights = [self.columns[name] for name in columns]
+
+        width = len(columns) + 1
+        index = self.index
+        for v in self.nodes:
+            edges = graph[v]
+            for edge in edges:
+                if len(edge) != width:
+                    raise ValueError('edge %r --> %r needs %i weights'
+                                     % (v, edge[0], len(columns)))
+                if edge[0] not in index:
+                    raise ValueError('edge %r --> %r goes to a node that is '
+                                     'not in the graph' % (v, edge[0]))
+            # Column at a time, each column is one extend per node
+            self.heads.extend([edge[0] for edge in edges])
+            for i, column in enumerate(weights, 1):
+                column.extend([edge[i] for edge in edges])
+            self.offsets.append(len(self.heads))
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __contains__(self, node):
+        return node in self.index
+
+    def edges(self):
+        '''Yields each (from, to) edge in column order'''
+        nodes = self.nodes
+        heads = self.heads
+        offsets = self.offsets
+        for i, v in enumerate(nodes):
+            for e in range(offsets[i], offsets[i + 1]):
+                yield v, heads[e]
+
+    def add_column(self, name, weights):
+        '''Adds a weight column without touching the topology
+
+        Arguments:
+            name -- name of the new column
+            weights -- one weight per edge in the order of edges()
+        Raises:
+            ValueError -- if the column exists or has the wrong length
+        '''
+        if name in self.columns:
+            raise ValueError('column %r already exists' % (name,))
+        column = array.array('d', weights)
+        if len(column) != len(self.heads):
+            raise ValueError('column %r needs %i weights'
+                             % (name, len(self.heads)))
+        self.columns[name] = column
+
+    def metric(self, name):
+        '''Returns a MetricView of the graph weighted by column name
+
+        Raises:
+            ValueError -- if there is no column with that name
+        '''
+        try:
+            return MetricView(self, self.columns[name])
+        except (KeyError, TypeError):
+            raise ValueError('no weight column %r' % (name,))
+
+
+class MetricView(collections.abc.Mapping):
+    '''Read only {node: [(edge, weight)]} view of one weight column'''
+
+    def __init__(self, graph, column):
+        self._graph = graph
+        self._column = column
+
+    def __getitem__(self, node):
+        g = self._graph
+        i = g.index[node]
+        a = g.offsets[i]
+        b = g.offsets[i + 1]
+        return list(zip(g.heads[a:b], self._column[a:b]))
+
+    def __iter__(self):
+        return iter(self._graph.nodes)
+
+    def __len__(self):
+        return len(self._graph.nodes)
+
+    def __contains__(self, node):
+        return node in self._graph.index
+
+
+def select_metric(graph, weight):
+    '''Returns the graph an engine should read for its weight= argument
+
+    Arguments:
+        graph -- graph dict, MetricView or MultiWeightGraph
+        weight -- name of the weight column or None
+    Return:
+        graph itself if weight is None, else the MetricView of the column
+    Raises:
+        TypeError -- if weight is given but graph is not a
+                     MultiWeightGraph
+        ValueError -- if there is no column with that name or graph is
+                      a MultiWeightGraph and weight is None
+    '''
+    if weight is None:
+        if isinstance(graph, MultiWeightGraph):
+            raise ValueError('weight= is needed to pick one of the '
+                             'columns %s' % (tuple(graph.columns),))
+        return graph
+    if not isinstance(graph, MultiWeightGraph):
+        raise TypeError('weight= needs a MultiWeightGraph')
+    return graph.metric(weight)
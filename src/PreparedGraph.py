@@ -0,0 +1,14 @@
+# Graph prepared once for many fast queries from a single thread
+#
+# Main functions:
+#     1) PreparedGraph() --> Returns FrozenGraph(graph, threads=False)
+#
+# Kept for the code written against the old PreparedGraph class. It no
+# longer is a class of its own: the shared workspace is the
+# threads=False option of FrozenGraph, so the objects it returns are
+# plain FrozenGraphs whose threads attribute is False. They must only be
+# queried from one thread at a time.
+import functools
+from src.FrozenGraph import FrozenGraph
+
+PreparedGraph = functools.partial(FrozenGraph, threads=False)
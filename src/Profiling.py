@@ -0,0 +1,297 @@
+# Profiling of algorithm runs with time attributed to search phases
+#
+# Main functions:
+#     1) profile_call() --> Runs a function under cProfile and/or the
+#                           sampling profiler and returns a ProfileReport
+#     2) ProfileReport.format() --> Returns the phase and per function
+#                                   breakdown as text
+#     3) ProfileReport.write_collapsed() --> Writes the sampled stacks in
+#                                           the collapsed format of
+#                                           flamegraph.pl, speedscope, ...
+#     4) ProfileReport.dump_stats() --> Writes the cProfile stats for
+#                                       pstats, snakeviz, ...
+#
+# Modes:
+#     'cprofile' -- deterministic, every call is timed, adds overhead to
+#                   each function call so the search loops look cheaper
+#                   than they are next to small helpers
+#     'sample'   -- a thread records the stack of the profiled thread
+#                   every interval seconds, low overhead and gives full
+#                   stacks for flamegraphs
+#     'both'     -- runs the call once under each
+#
+# Phases:
+#     initialization      -- graph conversion and node indexing helpers
+#     heap operations     -- heapq pushes and pops
+#     relaxation          -- the search loops (construct_* and the engines
+#                            with their loop inline)
+#     path reconstruction -- walking the previous nodes back into paths
+#     other               -- everything else (result dicts, the caller)
+# cProfile attributes the time of C functions (heapq, deque, ...) and of
+# comprehensions to the phase of the function that called them, heapq
+# always counts as heap operations. Samples go to the phase of the
+# innermost engine frame.
+# The sampler can't see C calls (and a thread only gives up the GIL at the
+# loop jumps, so lines are biased), heap operations are in relaxation in
+# the sampled breakdown.
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+import collections
+
+MODES = ('cprofile', 'sample', 'both')
+PHASES = ('initialization', 'heap operations', 'relaxation',
+          'path reconstruction', 'other')
+
+_PHASE_OF = {}
+for _name in ('node_index', 'select_metric', 'as_graph', 'from_csr',
+              'from_edges', '_fail_fast', '_search_targets',
+              '_implicit_search', 'check_engine', 'graph_properties',
+              '_compute_properties', 'reachability_index', '_workspace',
+              '_new_workspace', '_position', 'reset'):
+    _PHASE_OF[_name] = 'initialization'
+for _name in ('construct_arrays', 'construct_paths', 'construct_sparse',
+              'construct_sparse_paths', 'construct_hop_paths',
+              'bellman_ford', 'shortest_path_tree', 'grid_search',
+              'floyd_warshall', '_relax_rows', '_search', '_relax',
+              '_run_bfs', '_run_zero_one_bfs', '_run_dag', 'bfs',
+              'zero_one_bfs'):
+    _PHASE_OF[_name] = 'relaxation'
+# Names too generic to classify alone are looked up with their module
+# first: the edges of a CSR or multi weight graph are built while relaxing,
+# RangeIndex only looks up the source and targets
+_PHASE_OF[('SparseGraph', '__getitem__')] = 'relaxation'
+_PHASE_OF[('MultiWeightGraph', '__getitem__')] = 'relaxation'
+_PHASE_OF[('Dijkstra', '__getitem__')] = 'initialization'
+for _name in ('shortest_path', 'array_path', 'hop_path', 'sparse_path',
+              'grid_path', 'fw_path', '_walk', '_path', '_build_path'):
+    _PHASE_OF[_name] = 'path reconstruction'
+_HEAP = ('heappush', 'heappop', 'heapify', 'heappushpop', 'heapreplace')
+_SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _phase(filename, funcname):
+    '''Returns the phase of a Python function, functions outside of src
+    are always other
+    '''
+    if os.path.dirname(os.path.abspath(filename)) != _SRC_DIR:
+        return 'other'
+    module = os.path.splitext(os.path.basename(filename))[0]
+    return _PHASE_OF.get((module, funcname),
+                         _PHASE_OF.get(funcname, 'other'))
+
+
+def profile_call(func, *args, mode='cprofile', interval=0.001, repeat=1,
+                 **kwargs):
+    '''Runs func(*args, **kwargs) repeat times under the profiler
+
+    Arguments:
+        func -- function to profile
+        mode -- one of MODES
+        interval -- seconds between samples of the sampling profiler
+        repeat -- number of calls, for functions too quick to sample
+    Return:
+        (result of the last call, ProfileReport)
+    Raises:
+        ValueError -- if the mode is unknown
+    '''
+    if mode not in MODES:
+        raise ValueError('unknown mode %r, expected one of %s'
+                         % (mode, ', '.join(MODES)))
+
+    report = ProfileReport()
+    result = None
+    if mode in ('cprofile', 'both'):
+        profile = cProfile.Profile()
+        t0 = time.perf_counter()
+        profile.enable()
+        try:
+            for _ in range(repeat):
+                result = func(*args, **kwargs)
+        finally:
+            profile.disable()
+        report.wall = time.perf_counter() - t0
+        report.stats = pstats.Stats(profile)
+        report.phases = _cprofile_phases(report.stats)
+
+    if mode in ('sample', 'both'):
+        sampler = _Sampler(threading.get_ident(), interval)
+        t0 = time.perf_counter()
+        sampler.start()
+        try:
+            for _ in range(repeat):
+                result = func(*args, **kwargs)
+        finally:
+            sampler.stop()
+        if report.wall is None:
+            report.wall = time.perf_counter() - t0
+        report.samples = sampler.stacks
+        report.sample_phases = sampler.phases
+
+    return result, report
+
+
+def _cprofile_phases(stats):
+    '''Sums the own time of each function by phase, C functions are
+    split between the phases of their callers
+    '''
+    phases = dict.fromkeys(PHASES, 0.0)
+    for (filename, line, funcname), entry in stats.stats.items():
+        cc, nc, tt, ct, callers = entry
+        if filename != '~' and not funcname.startswith('<'):
+            phases[_phase(filename, funcname)] += tt
+        elif any(name in funcname for name in _HEAP):
+            phases['heap operations'] += tt
+        elif callers:
+            for (c_file, c_line, c_func), c_entry in callers.items():
+                phases[_phase(c_file, c_func)] += c_entry[2]
+        else:
+            phases['other'] += tt
+    return phases
+
+
+class _Sampler(object):
+    '''Thread recording the stack of another thread every interval'''
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = collections.Counter()
+        self.phases = collections.Counter()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._switch = None
+
+    def start(self):
+        # The profiled thread only gives up the GIL every switch interval,
+        # shorten it so samples can be taken at the requested rate
+        self._switch = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch, self.interval / 2))
+        self._thread.start()
+
+    def stop(self):
+        self._done.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch)
+
+    def _run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self._record(frame)
+
+    def _record(self, frame):
+        names = []
+        phase = None
+        while frame is not None:
+            code = frame.f_code
+            # Collapsed stacks are split at the last space
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            names.append(('%s:%s' % (module, code.co_name)).replace(' ', '_'))
+            if phase is None or phase == 'other':
+                phase = _phase(code.co_filename, code.co_name)
+            frame = frame.f_back
+        self.stacks[';'.join(reversed(names))] += 1
+        self.phases[phase or 'other'] += 1
+
+
+class ProfileReport(object):
+    '''Results of profile_call()
+
+    Attributes:
+        wall -- seconds the profiled calls took (the cProfile run if both
+                modes were used)
+        stats -- pstats.Stats of the cProfile run or None
+        phases -- dict phase --> seconds from cProfile or None
+        samples -- Counter collapsed stack --> number of samples or None
+        sample_phases -- Counter phase --> number of samples or None
+    '''
+
+    def __init__(self):
+        self.wall = None
+        self.stats = None
+        self.phases = None
+        self.samples = None
+        self.sample_phases = None
+
+    def phase_fractions(self):
+        '''Returns dict phase --> fraction of the time, from the samples
+        if there are any else from cProfile
+        '''
+        counts = self.sample_phases if self.sample_phases else self.phases
+        total = sum(counts.values()) if counts else 0
+        if not total:
+            return dict.fromkeys(PHASES, 0.0)
+        return {phase: counts.get(phase, 0) / total for phase in PHASES}
+
+    def top_functions(self, limit=10):
+        '''Returns the [(function, calls, own seconds, cumulative seconds)]
+        with the most own time in the cProfile run
+        '''
+        if self.stats is None:
+            return []
+        rows = []
+        for (filename, line, funcname), entry in self.stats.stats.items():
+            cc, nc, tt, ct, callers = entry
+            if filename == '~':
+                name = funcname
+            else:
+                name = '%s:%i(%s)' % (os.path.basename(filename), line,
+                                      funcname)
+            rows.append((name, nc, tt, ct))
+        rows.sort(key=lambda row: -row[2])
+        return rows[:limit]
+
+    def format(self, limit=10):
+        '''Returns the phase breakdown and top functions as text'''
+        lines = ['Total: %.6f s' % self.wall]
+        if self.phases is not None:
+            total = sum(self.phases.values()) or 1.0
+            lines.append('')
+            lines.append('%-22s %12s %7s' % ('phase (cProfile)', 'seconds', '%'))
+            for phase in PHASES:
+                lines.append('%-22s %12.6f %6.1f%%' % (
+                    phase, self.phases[phase],
+                    100 * self.phases[phase] / total))
+        if self.sample_phases:
+            total = sum(self.sample_phases.values())
+            lines.append('')
+            lines.append('%-22s %12s %7s' % ('phase (sampled)', 'samples', '%'))
+            for phase in PHASES:
+                count = self.sample_phases.get(phase, 0)
+                lines.append('%-22s %12i %6.1f%%'
+                             % (phase, count, 100 * count / total))
+        if self.stats is not None:
+            lines.append('')
+            lines.append('%-50s %9s %10s %10s'
+                         % ('function', 'calls', 'own s', 'cum s'))
+            for name, calls, own, cum in self.top_functions(limit):
+                lines.append('%-50s %9i %10.6f %10.6f'
+                             % (name[-50:], calls, own, cum))
+        return '\n'.join(lines)
+
+    def write_collapsed(self, path):
+        '''Writes the sampled stacks, one "frame;frame;... count" line per
+        distinct stack, the input of flamegraph.pl and speedscope
+
+        Raises:
+            ValueError -- if there are no samples (mode was 'cprofile')
+        '''
+        if self.samples is None:
+            raise ValueError('collapsed stacks need the sample mode')
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.samples.items()):
+                f.write('%s %i\n' % (stack, count))
+
+    def dump_stats(self, path):
+        '''Writes the cProfile stats in the pstats format
+
+        Raises:
+            ValueError -- if there is no cProfile run (mode was 'sample')
+        '''
+        if self.stats is None:
+            raise ValueError('stats need the cprofile mode')
+        self.stats.dump_stats(path)
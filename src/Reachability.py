@@ -0,0 +1,266 @@
+# Reachability index built on the strongly connected component (SCC)
+# condensation of a graph
+#
+# Main functions:
+#     1) strongly_connected() --> Returns the SCC of each node (Tarjan)
+#     2) ReachabilityIndex.can_reach() --> Returns if s can reach t
+#     3) ReachabilityIndex.reachable_nodes() --> Returns the nodes s can
+#                                               reach in topological order
+#
+# Tarjan's algorithm numbers the components in reverse topological order,
+# every edge of the condensation goes from a higher to a lower id so a
+# higher id can never be reached from a lower one. On top of that each
+# component gets either:
+#     - a bitset (python int) of every component it can reach, when the
+#       condensation is small enough for them to fit in memory
+#     - interval labels from random DFS traversals, if t's interval isn't
+#       inside s' interval s can't reach t, else a DFS pruned by the
+#       labels answers it
+#
+# Graph representation is the same as the engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import random
+
+
+def strongly_connected(graph):
+    '''Finds the strongly connected components with an iterative Tarjan
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+    Return:
+        (comp, num_components) where comp maps each node to its
+        component id, ids are in reverse topological order
+    '''
+    index = {}
+    low = {}
+    comp = {}
+    stack = []
+    on_stack = set()
+    counter = 0
+    num_components = 0
+
+    for root in graph:
+        if root in index:
+            continue
+
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph[root]))]
+
+        while work:
+            v, edges = work[-1]
+            for u, w in edges:
+                if u not in index:
+                    # Descend into u, v's iterator resumes where it left
+                    index[u] = low[u] = counter
+                    counter += 1
+                    stack.append(u)
+                    on_stack.add(u)
+                    work.append((u, iter(graph[u])))
+                    break
+                elif u in on_stack and index[u] < low[v]:
+                    low[v] = index[u]
+            else:
+                # Every edge of v is done
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[v] < low[parent]:
+                        low[parent] = low[v]
+
+                if low[v] == index[v]:
+                    while True:
+                        x = stack.pop()
+                        on_stack.discard(x)
+                        comp[x] = num_components
+                        if x == v:
+                            break
+                    num_components += 1
+
+    return comp, num_components
+
+
+class ReachabilityIndex(object):
+    '''Answers "can s reach t?" without searching the graph
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        bitset_limit -- max number of components to build bitsets for
+        num_intervals -- number of interval labels per component when
+                         bitsets aren't used
+    '''
+
+    def __init__(self, graph, bitset_limit=8192, num_intervals=2):
+        self.comp, self.num_components = strongly_connected(graph)
+        n = self.num_components
+
+        self.members = [[] for _ in range(n)]
+        for node in graph:
+            self.members[self.comp[node]].append(node)
+
+        dag = [set() for _ in range(n)]
+        for v in graph:
+            cv = self.comp[v]
+            for u, w in graph[v]:
+                cu = self.comp[u]
+                if cu != cv:
+                    dag[cv].add(cu)
+        self.dag = [tuple(succ) for succ in dag]
+
+        self.bits = None
+        self.intervals = None
+        if n <= bitset_limit:
+            self.bits = self._bitsets()
+        else:
+            rand = random.Random(n)
+            self.intervals = [self._interval_labels(rand)
+                              for _ in range(num_intervals)]
+
+    @classmethod
+    def from_parts(cls, comp, num_components, dag, bits=None,
+                   intervals=None):
+        '''Rebuilds an index from its parts without touching the graph,
+        e.g. when it is loaded from a Snapshot
+
+        Arguments:
+            comp -- dict mapping each node to its component id
+            num_components -- number of components
+            dag -- list of the successor components of each component
+            bits -- list of the reach bitset of each component or None
+            intervals -- list of (low, post) labels if bits is None
+        '''
+        index = cls.__new__(cls)
+        index.comp = comp
+        index.num_components = num_components
+        index.members = [[] for _ in range(num_components)]
+        for node, c in comp.items():
+            index.members[c].append(node)
+        index.dag = [tuple(succ) for succ in dag]
+        index.bits = bits
+        index.intervals = intervals
+        return index
+
+    def can_reach(self, s, t):
+        '''Returns True if there is a path from s to t
+
+        Raises:
+            KeyError -- if s or t are not nodes in the graph
+        '''
+        cs = self.comp[s]
+        ct = self.comp[t]
+
+        if cs == ct:
+            return True
+        if ct > cs:
+            return False
+        if self.bits is not None:
+            return bool(self.bits[cs] >> ct & 1)
+        if not self._contains(cs, ct):
+            return False
+
+        # DFS over the condensation only into components whose labels
+        # can still contain t
+        seen = {cs}
+        stack = [cs]
+        while stack:
+            c = stack.pop()
+            for d in self.dag[c]:
+                if d == ct:
+                    return True
+                if d not in seen and d > ct and self._contains(d, ct):
+                    seen.add(d)
+                    stack.append(d)
+        return False
+
+    def reachable_nodes(self, s):
+        '''Returns a list of every node s can reach with the components
+        in topological order, s' component first
+        '''
+        cs = self.comp[s]
+
+        if self.bits is not None:
+            reach = self.bits[cs]
+            comps = [c for c in range(cs, -1, -1) if reach >> c & 1]
+        else:
+            seen = {cs}
+            stack = [cs]
+            while stack:
+                for d in self.dag[stack.pop()]:
+                    if d not in seen:
+                        seen.add(d)
+                        stack.append(d)
+            comps = sorted(seen, reverse=True)
+
+        nodes = []
+        for c in comps:
+            nodes.extend(self.members[c])
+        return nodes
+
+    def _bitsets(self):
+        '''Every successor has a lower id so one pass in id order sees
+        them all finished first
+        '''
+        bits = []
+        for c in range(self.num_components):
+            reach = 1 << c
+            for d in self.dag[c]:
+                reach |= bits[d]
+            bits.append(reach)
+        return bits
+
+    def _interval_labels(self, rand):
+        '''Labels each component with [low, post] from a DFS with random
+        child order, low is the smallest post order of any component it
+        reaches so reaching d means d's interval is inside c's
+        '''
+        n = self.num_components
+        post = [0] * n
+        low = [0] * n
+        visited = [False] * n
+        counter = 0
+
+        roots = list(range(n - 1, -1, -1))
+        rand.shuffle(roots)
+        for root in roots:
+            if visited[root]:
+                continue
+            visited[root] = True
+            work = [(root, self._shuffled(self.dag[root], rand))]
+
+            while work:
+                c, children = work[-1]
+                if children:
+                    d = children.pop()
+                    if not visited[d]:
+                        visited[d] = True
+                        work.append((d, self._shuffled(self.dag[d], rand)))
+                    continue
+
+                work.pop()
+                post[c] = counter
+                lowest = counter
+                for d in self.dag[c]:
+                    if low[d] < lowest:
+                        lowest = low[d]
+                low[c] = lowest
+                counter += 1
+
+        return low, post
+
+    @staticmethod
+    def _shuffled(children, rand):
+        children = list(children)
+        rand.shuffle(children)
+        return children
+
+    def _contains(self, c, d):
+        '''Returns False if some label proves c can't reach d'''
+        for low, post in self.intervals:
+            if low[d] < low[c] or post[d] > post[c]:
+                return False
+        return True
@@ -0,0 +1,278 @@
+# Renumbering of graph nodes for memory locality
+#
+# Main functions:
+#     1) permutation() --> Returns the nodes in a locality friendly order
+#     2) ReorderedGraph() --> Renumbers a graph once and answers queries
+#                             in the original node names
+#
+# When node ids are random, the neighbors of a node are spread over the
+# whole graph dict and distance array, so nearly every relaxation touches
+# memory that isn't cached. Renumbering the nodes 0..V-1 so nodes that are
+# close in the graph get close ids puts their dict entries, edge lists and
+# distance slots next to each other. The orders are computed on the graph
+# with the edge directions ignored:
+#     'bfs'    -- breadth first from each node not visited yet
+#     'dfs'    -- depth first preorder from each node not visited yet
+#     'rcm'    -- reverse Cuthill McKee, breadth first from a lowest
+#                 degree node visiting lower degree neighbors first, then
+#                 reversed, keeps every edge's endpoints close
+#     'degree' -- highest degree first, so the hubs most searches touch
+#                 share cache lines
+#
+# Graph representation of the input is the same as the engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import collections
+import src.Dijkstra as Dijkstra
+import src.BellmanFord as BF
+
+METHODS = ('bfs', 'dfs', 'rcm', 'degree')
+
+
+def permutation(graph, method='bfs'):
+    '''Orders the nodes of a graph for locality
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        method -- one of METHODS
+    Return:
+        list with the nodes in their new order, the node at position i
+        gets id i
+    Raises:
+        ValueError -- if the method is unknown or an edge goes to a node
+                      that is not a key
+    '''
+    if method not in METHODS:
+        raise ValueError('unknown method %r, expected one of %s'
+                         % (method, ', '.join(METHODS)))
+
+    nodes = list(graph)
+    index = {node: i for i, node in enumerate(nodes)}
+    n = len(nodes)
+
+    # Undirected adjacency by position, every search order ignores the
+    # edge directions so all nodes of a weak component are kept together
+    adj = [[] for _ in range(n)]
+    for i, v in enumerate(nodes):
+        for u, w in graph[v]:
+            try:
+                j = index[u]
+            except KeyError:
+                raise ValueError('edge %r --> %r goes to a node that is not '
+                                 'in the graph' % (v, u))
+            adj[i].append(j)
+            adj[j].append(i)
+
+    if method == 'degree':
+        order = sorted(range(n), key=lambda i: -len(adj[i]))
+    elif method == 'dfs':
+        order = _dfs_order(adj, range(n))
+    elif method == 'bfs':
+        order = _bfs_order(adj, range(n))
+    else:
+        degree = [len(edges) for edges in adj]
+        for edges in adj:
+            edges.sort(key=degree.__getitem__)
+        starts = sorted(range(n), key=degree.__getitem__)
+        order = _bfs_order(adj, starts)
+        order.reverse()
+
+    return [nodes[i] for i in order]
+
+
+def _bfs_order(adj, starts):
+    '''Breadth first order of every node, a new search is started from
+    the next node of starts that isn't visited yet
+    '''
+    visited = [False] * len(adj)
+    order = []
+    for start in starts:
+        if visited[start]:
+            continue
+        visited[start] = True
+        queue = collections.deque([start])
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for u in adj[v]:
+                if not visited[u]:
+                    visited[u] = True
+                    queue.append(u)
+    return order
+
+
+def _dfs_order(adj, starts):
+    '''Depth first preorder of every node'''
+    visited = [False] * len(adj)
+    order = []
+    for start in starts:
+        if visited[start]:
+            continue
+        stack = [start]
+        while stack:
+            v = stack.pop()
+            if visited[v]:
+                continue
+            visited[v] = True
+            order.append(v)
+            # Reversed so the first neighbor is visited first
+            for u in reversed(adj[v]):
+                if not visited[u]:
+                    stack.append(u)
+    return order
+
+
+class ReorderedGraph(object):
+    '''Copy of a graph with nodes renumbered 0..V-1 by permutation(),
+    queries take and return the original nodes
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        method -- one of METHODS
+    Attributes:
+        graph -- the renumbered graph dict, keys in order 0..V-1
+        order -- list mapping new id --> original node
+        position -- dict mapping original node --> new id
+    Raises:
+        TypeError -- if graph is not a dict
+        ValueError -- if the method is unknown or an edge goes to a node
+                      that is not a key
+    '''
+
+    def __init__(self, graph, method='bfs'):
+        if not isinstance(graph, dict):
+            raise TypeError('Graph input must be a dictionary')
+
+        self.method = method
+        self.order = permutation(graph, method)
+        self.position = {node: i for i, node in enumerate(self.order)}
+        position = self.position
+        self.graph = {i: [(position[u], w) for u, w in graph[v]]
+                      for i, v in enumerate(self.order)}
+
+        # Results are returned in the key order of the original graph
+        self._original = list(graph)
+        self._where = [position[v] for v in self._original]
+
+    def __len__(self):
+        return len(self.order)
+
+    def __contains__(self, node):
+        return node in self.position
+
+    def _id(self, node, name):
+        try:
+            return self.position[node]
+        except (KeyError, TypeError):
+            raise ValueError('%s argument not a valid node' % name)
+
+    def _path(self, path):
+        order = self.order
+        return [order[i] for i in path]
+
+    def dij(self, s, t=None, max_distance=None):
+        '''Calculates shortest distances with Dijkstra.dij()
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest dist to
+            max_distance -- Optional radius, nodes further than it from
+                            s are not returned
+        Return:
+            same as Dijkstra.dij() in the original nodes
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+        '''
+        si = self._id(s, 's')
+        ti = self._id(t, 't') if t is not None else None
+        if ti is not None:
+            return Dijkstra.dij(self.graph, si, ti, max_distance)
+
+        if max_distance is not None:
+            order = self.order
+            distances = Dijkstra.dij(self.graph, si,
+                                     max_distance=max_distance)
+            return {order[i]: d for i, d in distances.items()}
+
+        dist, prev = Dijkstra.dij(self.graph, si, arrays=True)
+        return {v: dist[i] for v, i in zip(self._original, self._where)}
+
+    def dij_paths(self, s, t=None, max_distance=None):
+        '''Constructs shortest paths with Dijkstra.dij_paths()
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest path to
+            max_distance -- Optional radius, nodes further than it from
+                            s are not returned
+        Return:
+            same as Dijkstra.dij_paths() in the original nodes
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+        '''
+        si = self._id(s, 's')
+        ti = self._id(t, 't') if t is not None else None
+        paths = Dijkstra.dij_paths(self.graph, si, ti, max_distance)
+        if ti is not None:
+            return self._path(paths)
+
+        if max_distance is not None:
+            order = self.order
+            return {order[i]: self._path(path) for i, path in paths.items()}
+        return {v: self._path(paths[i])
+                for v, i in zip(self._original, self._where)}
+
+    def bellman_ford(self, s, t=None, max_hops=None):
+        '''Calculates shortest distances with BellmanFord.bellman_ford()
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest dist to
+            max_hops -- Optional max number of edges a path can use
+        Return:
+            same as BellmanFord.bellman_ford() in the original nodes
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+            NegativeCycleError -- if there is a negative cycle in the graph
+        '''
+        si = self._id(s, 's')
+        ti = self._id(t, 't') if t is not None else None
+        if ti is not None:
+            return BF.bellman_ford(self.graph, si, ti, max_hops)
+
+        if max_hops is not None:
+            order = self.order
+            distances = BF.bellman_ford(self.graph, si, max_hops=max_hops)
+            return {order[i]: d for i, d in distances.items()}
+
+        infinity = float('inf')
+        dist = BF.bellman_ford(self.graph, si, arrays=True)
+        return {v: dist[i] for v, i in zip(self._original, self._where)
+                if dist[i] != infinity}
+
+    def bf_paths(self, s, t=None, max_hops=None):
+        '''Constructs shortest paths with BellmanFord.bf_paths()
+
+        Arguments:
+            s -- source node to start with
+            t -- Optional target node to find shortest path to
+            max_hops -- Optional max number of edges a path can use
+        Return:
+            same as BellmanFord.bf_paths() in the original nodes
+        Raises:
+            ValueError -- if s or t are not valid nodes
+            NoPathError -- if there is no path to target node
+            NegativeCycleError -- if there is a negative cycle in the graph
+        '''
+        si = self._id(s, 's')
+        ti = self._id(t, 't') if t is not None else None
+        paths = BF.bf_paths(self.graph, si, ti, max_hops)
+        if ti is not None:
+            return self._path(paths)
+        return {v: self._path(paths[i])
+                for v, i in zip(self._original, self._where)}
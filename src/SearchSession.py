@@ -0,0 +1,153 @@
+# Resumable Dijkstra search from one source for queries to many targets
+#
+# Main functions:
+#     1) DijkstraSession() --> Starts a search from a source
+#     2) DijkstraSession.distance() --> Returns the shortest distance to a
+#                                       target, searching only as far as
+#                                       needed
+#     3) DijkstraSession.path() --> Returns the shortest path to a target
+#     4) DijkstraSession.distances() --> Finishes the search and returns
+#                                        every shortest distance
+#
+# dij(g, s, t) stops as soon as t is settled, but every call allocates
+# the O(V) distance and previous arrays again and searches from s again,
+# so k targets cost k searches that each settle every node closer than
+# their target. A session keeps the heap, distances and previous nodes
+# when it stops, so a query for a target that is already settled is a
+# dict lookup and any other query resumes the search where the last one
+# stopped. Every node is settled and every edge relaxed at most once over
+# the life of the session, k queries never cost more than one full
+# search.
+#
+# Graphs are the same as for dij(): a dict, a MultiWeightGraph with a
+# weight column, a scipy.sparse matrix, (src, dst, weight) arrays or a
+# neighbors(node) function. Only the nodes the search reaches are stored.
+# The graph must not change while a session is in use and a session must
+# only be queried from one thread at a time.
+import heapq
+from src.Dijkstra import NoPathError, shortest_path
+from src.MultiWeightGraph import select_metric
+from src.SparseGraph import as_graph, search_view
+
+
+class DijkstraSession(object):
+    '''Dijkstra search from s that can be stopped and resumed
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph, or anything dij() takes
+        s -- source node to start with
+        weight -- name of the weight column when graph is a
+                  MultiWeightGraph
+    Attributes:
+        source -- the source node
+        settled -- dict node --> shortest distance of the settled nodes,
+                   in the order they were settled
+    Raises:
+        ValueError -- if s is not a node in the graph or weight is not a
+                      column
+    '''
+
+    def __init__(self, graph, s, weight=None):
+        graph = as_graph(select_metric(graph, weight))
+        if callable(graph):
+            self._graph = None
+            self._neighbors = graph
+        else:
+            self._graph = graph
+            self._neighbors = search_view(graph).__getitem__
+            self._check(s, 's')
+
+        self.source = s
+        self.settled = {}
+        self._dist = {s: 0}
+        self._prev = {s: s}
+        self._count = 0 #tie breaker so nodes never have to be compared
+        self._PQ = [(0, 0, s)]
+
+    def _check(self, node, name):
+        if self._graph is None:
+            return
+        try:
+            if node in self._graph:
+                return
+        except TypeError:
+            pass
+        raise ValueError('%s argument not a valid node' % name)
+
+    @property
+    def done(self):
+        '''True once every node reachable from the source is settled'''
+        return not self._PQ
+
+    def _settle(self, t=None):
+        '''Resumes the search until t is settled (or to the end without
+        t), returns if t is settled
+        '''
+        infinity = float('inf')
+        settled = self.settled
+        dist = self._dist
+        prev = self._prev
+        neighbors = self._neighbors
+        PQ = self._PQ
+        count = self._count
+
+        while PQ:
+            vDist, _, vNode = heapq.heappop(PQ)
+            if vNode in settled: #stale entry, vNode was settled closer
+                continue
+            settled[vNode] = vDist
+            # Relax before stopping, the state is then the same as if the
+            # search had never stopped
+            for uNode, uvDist in neighbors(vNode):
+                uDist = vDist + uvDist
+                if uDist < dist.get(uNode, infinity) and \
+                        uNode not in settled:
+                    dist[uNode] = uDist
+                    prev[uNode] = vNode
+                    count += 1
+                    heapq.heappush(PQ, (uDist, count, uNode))
+            if vNode == t:
+                self._count = count
+                return True
+        self._count = count
+        return t in settled
+
+    def distance(self, t):
+        '''Returns the shortest distance from the source to t, the search
+        is only resumed if t isn't settled yet
+
+        Raises:
+            ValueError -- if t is not a node in the graph
+            NoPathError -- if there is no path to t
+        '''
+        settled = self.settled
+        if t in settled:
+            return settled[t]
+        self._check(t, 't')
+        if not self._settle(t):
+            raise NoPathError()
+        return settled[t]
+
+    def path(self, t):
+        '''Returns the shortest path from the source to t as a list of
+        nodes, the search is only resumed if t isn't settled yet
+
+        Raises:
+            ValueError -- if t is not a node in the graph
+            NoPathError -- if there is no path to t
+        '''
+        self.distance(t)
+        return shortest_path(self.source, t, self._prev)
+
+    def distances(self):
+        '''Finishes the search and returns dict with the shortest
+        distance of every node (infinity if unreachable) like dij(), only
+        the nodes reached for a neighbors function
+        '''
+        self._settle()
+        if self._graph is None:
+            return dict(self.settled)
+        infinity = float('inf')
+        settled = self.settled
+        return {node: settled.get(node, infinity) for node in self._graph}
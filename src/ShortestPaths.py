@@ -0,0 +1,430 @@
+# Single front door for the shortest paths algorithms
+#
+# Main functions:
+#     1) shortest_paths() --> Returns shortest distances (or paths) using
+#                             the fastest correct engine for the graph
+#     2) graph_properties() --> Returns the cached properties of a graph
+#     3) select_engine() --> Returns the name of the engine for a graph
+#     4) reachability_index() --> Returns the cached reachability index
+#     5) shortest_path_tree() --> Returns the distances and previous nodes
+#                                 of every reachable node from one engine
+#     6) invalidate() --> Drops the cached properties of a graph changed
+#                         in place
+#
+# Graph properties are computed once per graph and cached, every query
+# after the first one only pays for counting the nodes and edges (to
+# notice added or removed ones) and the engine it is routed to. Weights
+# changed in place aren't noticed, call invalidate(graph) after changing
+# them. Queries with a target t that the reachability index shows can't
+# be reached fail fast without running any engine, the other ones stop
+# as soon as t is settled (except Bellman Ford):
+#     - 'bfs'          --> every weight the same, O(V + E)
+#     - 'zero_one_bfs' --> every weight 0 or 1, O(V + E)
+#     - 'dag'          --> acyclic graphs (any weights), O(V + E)
+#     - 'dijkstra'     --> non-negative weights
+#     - 'bellman_ford' --> negative weights with cycles
+#
+# Graph representation is the same as the engines:
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import math
+import threading
+import collections
+import src.BellmanFord as BF
+import src.BFS as BFS
+import src.Dijkstra as Dijkstra
+from src.Reachability import ReachabilityIndex
+
+NegativeCycleError = BF.NegativeCycleError
+
+
+class NoPathError(Dijkstra.NoPathError, BF.NoPathError):
+    '''Exception for when there is no path from source to node
+
+    Subclasses the engines' errors so it can be caught as either one
+    '''
+    pass
+
+
+GraphProperties = collections.namedtuple('GraphProperties', [
+    'num_nodes',     # number of nodes in the graph
+    'num_edges',     # number of edges in the graph
+    'has_negative',  # True if any weight is negative
+    'is_acyclic',    # True if the graph has no cycles
+    'is_unit',       # True if every weight is the same positive value
+    'is_binary',     # True if every weight is 0 or 1
+    'is_integer',    # True if every weight is an integer (BatchQuery
+                     # prints the distances as ints)
+    'min_weight',    # smallest weight (None if there are no edges)
+    'max_weight',    # largest weight (None if there are no edges)
+    'dense_ids',     # True if nodes are exactly the ints 0..V-1
+    'topo_order',    # list of nodes in topological order or None
+])
+
+# id(graph) --> [graph, signature, GraphProperties, ReachabilityIndex or
+# None], least recently used first. The graph itself is kept so its id
+# can't be reused by another object, so only the CACHE_SIZE graphs used
+# last are kept alive
+CACHE_SIZE = 16
+_cache = collections.OrderedDict()
+_lock = threading.Lock()
+
+
+def _signature(graph):
+    '''Number of nodes and edges of a graph, counted in C without
+    looking at the edges themselves
+    '''
+    return len(graph), sum(map(len, graph.values()))
+
+
+def _entry(graph):
+    '''Returns the cache entry of graph, computing its properties again
+    if the graph is new or changed since it was cached
+    '''
+    if not isinstance(graph, dict):
+        raise TypeError('Graph input must be a dictionary')
+
+    key = id(graph)
+    signature = _signature(graph)
+    with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] is graph \
+                and entry[1] == signature:
+            _cache.move_to_end(key)
+            return entry
+
+    entry = [graph, signature, _compute_properties(graph), None]
+    with _lock:
+        _cache.pop(key, None)
+        _cache[key] = entry
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return entry
+
+
+def graph_properties(graph):
+    '''Returns the properties of a graph, computing them only the first
+    time the graph is seen
+
+    The cache holds the last CACHE_SIZE graphs and is checked against
+    the number of nodes and edges on every call, so a graph that gained
+    or lost nodes or edges is scanned again. Call invalidate(graph)
+    after changing weights in place
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+    Return:
+        GraphProperties namedtuple
+    Raises:
+        TypeError -- if graph is not a dict
+    '''
+    return _entry(graph)[2]
+
+
+def reachability_index(graph):
+    '''Returns the Reachability.ReachabilityIndex of a graph, building
+    it only the first time it is needed (same caching as
+    graph_properties())
+    '''
+    return _reach(_entry(graph))
+
+
+def _reach(entry):
+    '''Returns the ReachabilityIndex of a cache entry, building it once'''
+    if entry[3] is None:
+        entry[3] = ReachabilityIndex(entry[0])
+    return entry[3]
+
+
+def clear_cache(graph=None):
+    '''Drops the cached properties of graph or of every graph if None'''
+    with _lock:
+        if graph is None:
+            _cache.clear()
+        else:
+            _cache.pop(id(graph), None)
+
+
+def invalidate(graph):
+    '''Marks graph as changed so the next query scans it again, needed
+    after changing weights in place (added or removed nodes and edges
+    are noticed without it)
+    '''
+    clear_cache(graph)
+
+
+def _compute_properties(graph):
+    '''Scans the graph once for its weights and runs Kahn's algorithm
+    to check if it is acyclic
+    '''
+    num_edges = 0
+    min_w = max_w = None
+    is_integer = True
+    is_binary = True
+    in_degree = {node: 0 for node in graph}
+
+    for v in graph:
+        for u, w in graph[v]:
+            num_edges += 1
+            in_degree[u] += 1
+            if min_w is None or w < min_w:
+                min_w = w
+            if max_w is None or w > max_w:
+                max_w = w
+            if is_integer and not (math.isfinite(w) and w == int(w)):
+                is_integer = False
+            if is_binary and w != 0 and w != 1:
+                is_binary = False
+
+    # Kahn's algorithm, the graph is acyclic if every node gets ordered
+    order = [node for node in graph if in_degree[node] == 0]
+    for v in order:
+        for u, w in graph[v]:
+            in_degree[u] -= 1
+            if in_degree[u] == 0:
+                order.append(u)
+    is_acyclic = len(order) == len(graph)
+
+    n = len(graph)
+    dense_ids = all(isinstance(node, int) and 0 <= node < n
+                    for node in graph)
+
+    return GraphProperties(
+        num_nodes=n,
+        num_edges=num_edges,
+        has_negative=min_w is not None and min_w < 0,
+        is_acyclic=is_acyclic,
+        is_unit=min_w is not None and min_w == max_w and min_w > 0,
+        is_binary=is_binary,
+        is_integer=is_integer,
+        min_weight=min_w,
+        max_weight=max_w,
+        dense_ids=dense_ids,
+        topo_order=order if is_acyclic else None,
+    )
+
+
+def select_engine(graph):
+    '''Returns the name of the engine shortest_paths() uses for graph'''
+    return _select(graph_properties(graph))
+
+
+def _select(props):
+    if props.is_unit:
+        return 'bfs'
+    if props.is_binary:
+        return 'zero_one_bfs'
+    if props.is_acyclic:
+        return 'dag'
+    if props.has_negative:
+        return 'bellman_ford'
+    return 'dijkstra'
+
+
+def check_engine(graph, engine):
+    '''Raises ValueError if engine is unknown or can't give correct
+    results on graph
+    '''
+    if engine not in _engines:
+        raise ValueError('Unknown engine: %s' % engine)
+
+    props = graph_properties(graph)
+    if engine == 'bfs' and props.num_edges and not props.is_unit:
+        raise ValueError('bfs requires every weight to be the same')
+    if engine == 'zero_one_bfs' and not props.is_binary:
+        raise ValueError('zero_one_bfs requires weights of 0 or 1')
+    if engine == 'dag' and not props.is_acyclic:
+        raise ValueError('dag requires an acyclic graph')
+    if engine == 'dijkstra' and props.has_negative:
+        raise ValueError('dijkstra requires non-negative weights')
+
+
+def shortest_path_tree(graph, s, engine=None):
+    '''Runs one engine from s and returns its whole shortest path tree
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        s -- source node to start with
+        engine -- name of the engine to run, selected for the graph if
+                  None
+    Return:
+        (distances, prev) dicts holding only the reachable nodes, prev
+        of s is s
+    Raises:
+        ValueError -- if s is not a node in the graph or the engine is
+                      unknown or can't be used on the graph
+        NegativeCycleError -- if there is a negative cycle in the graph
+    '''
+    if engine is None:
+        engine = select_engine(graph)
+    else:
+        check_engine(graph, engine)
+    if s not in graph:
+        raise ValueError('s argument not a valid node')
+
+    return _engines[engine](graph, s, None, _entry(graph))
+
+
+def shortest_paths(graph, s, t=None, paths=False, return_engine=False):
+    '''Calculates shortest distances (or paths) from a source using the
+    fastest correct engine for the graph
+
+    Arguments:
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        s -- source node to start with
+        t -- Optional target node to find shortest distance/path to
+        paths -- if True return shortest paths instead of distances
+        return_engine -- if True also return the name of the engine
+    Return:
+        None if graph is None,
+        Else dict with shortest distances (or paths) for every reachable
+        node or the shortest distance (or path) to t if t is given.
+        If return_engine is True a (result, engine name) tuple
+    Raises:
+        ValueError -- if s or t are not nodes in the graph
+        TypeError -- if graph is not a dict
+        NoPathError -- if there is no path to target node
+        NegativeCycleError -- if there is a negative cycle in the graph
+    '''
+    if graph is None:
+        return None
+
+    # One cache lookup for the whole query
+    entry = _entry(graph)
+    props = entry[2]
+    engine = _select(props)
+    if s not in graph:
+        raise ValueError('s argument not a valid node')
+    if t is not None and t not in graph:
+        raise ValueError('t argument not a valid node')
+    if t is not None and not _reach(entry).can_reach(s, t):
+        raise NoPathError()
+
+    distances, prev = _engines[engine](graph, s, t, entry)
+
+    if t is not None:
+        if distances.get(t, float('inf')) == float('inf'):
+            raise NoPathError()
+        result = _build_path(s, t, prev) if paths else distances[t]
+    elif paths:
+        result = {node: _build_path(s, node, prev) for node in distances}
+    else:
+        result = distances
+
+    if return_engine:
+        return result, engine
+    return result
+
+
+def _build_path(s, t, prev):
+    '''Walks the previous nodes back from t to s'''
+    path = collections.deque([t])
+    while t != s:
+        t = prev[t]
+        path.appendleft(t)
+    return list(path)
+
+
+# Engines take (graph, s, t, cache entry) and return (distances, prev)
+# dicts. With a target t they stop once t is settled and only distances[t]
+# and the prev nodes on its path are meaningful
+
+def _run_dag(graph, s, t, entry):
+    '''Relaxes each edge once in topological order starting at s,
+    stopping at t since nothing after it in the order can reach it
+
+    Return:
+        (distances, prev) dicts holding only the reached nodes
+    '''
+    order = entry[2].topo_order
+    distances = {s: 0}
+    prev = {s: s}
+
+    for v in order[order.index(s):]:
+        if v == t:
+            break
+        if v not in distances:
+            continue
+        dist_v = distances[v]
+        for u, w in graph[v]:
+            if u not in distances or dist_v + w < distances[u]:
+                distances[u] = dist_v + w
+                prev[u] = v
+
+    return distances, prev
+
+
+def _run_dijkstra(graph, s, t, entry):
+    '''Runs Dijkstra.construct_paths and drops unreachable nodes, or
+    Dijkstra.construct_arrays stopping at t
+    '''
+    if t is None:
+        return _reachable(*Dijkstra.construct_paths(graph, s))
+
+    ti = Dijkstra.node_index(graph)[0][t]
+    index, nodes, dist, prev = Dijkstra.construct_arrays(graph, s,
+                                                         targets=[ti])
+    path = Dijkstra.array_path(nodes, prev, index[s], ti)
+    return {t: dist[ti]}, dict(zip(path[1:], path))
+
+
+def _run_bfs(graph, s, t, entry):
+    '''Runs BFS.construct_paths and drops unreachable nodes'''
+    if t is not None:
+        return BFS.construct_paths(graph, s, [t])
+    return _reachable(*BFS.construct_paths(graph, s))
+
+
+def _run_zero_one_bfs(graph, s, t, entry):
+    '''Runs BFS.construct_paths_01 and drops unreachable nodes'''
+    if t is not None:
+        return BFS.construct_paths_01(graph, s, [t])
+    return _reachable(*BFS.construct_paths_01(graph, s))
+
+
+def _reachable(dist, prev):
+    '''Drops the unreachable nodes from Dijkstra style results'''
+    distances = {node: d for node, d in dist.items() if d != float('inf')}
+    return distances, {node: prev[node] for node in distances}
+
+
+def _run_bellman_ford(graph, s, t, entry):
+    '''Runs BellmanFord.construct_paths, relabeling the nodes to
+    0..V-1 first if they aren't already. It has no early exit, every
+    pass can still shorten the distance to t
+    '''
+    if entry[2].dense_ids:
+        labels = None
+        dense, src = graph, s
+        reach = _reach(entry)
+    else:
+        labels = list(graph)
+        index = {node: i for i, node in enumerate(labels)}
+        dense = {index[v]: [(index[u], w) for u, w in graph[v]]
+                 for v in labels}
+        src = index[s]
+        reach = None
+
+    d, prev_i = BF.construct_paths(dense, src, reach)
+
+    distances = {}
+    prev = {}
+    for i, p in enumerate(prev_i):
+        if p == -1:
+            continue
+        node = labels[i] if labels else i
+        distances[node] = d[i]
+        prev[node] = labels[p] if labels else p
+    return distances, prev
+
+
+_engines = {
+    'dag': _run_dag,
+    'bfs': _run_bfs,
+    'zero_one_bfs': _run_zero_one_bfs,
+    'dijkstra': _run_dijkstra,
+    'bellman_ford': _run_bellman_ford,
+}
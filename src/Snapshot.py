@@ -0,0 +1,338 @@
+# Persisted snapshots of precomputed structures for warm restarts
+#
+# Main functions:
+#     1) graph_fingerprint() --> Returns a hash of the nodes and edges
+#     2) save_snapshot() --> Writes the structures of a graph to a file
+#     3) load_snapshot() --> Memory maps a snapshot, rejecting it if it
+#                            was written for a different graph
+#     4) Snapshot.close() --> Releases the memory map
+#
+# Snapshots can hold:
+#     - a Reachability.ReachabilityIndex
+#     - shortest path trees of hot sources, the (dist, prev) arrays from
+#       Dijkstra.construct_arrays()
+#     - any other named NumPy arrays (e.g. landmark tables)
+#
+# File layout, every integer little endian and every array 8 byte aligned:
+#     8 bytes    magic b'SPSNAP\0\0'
+#     uint32     format version
+#     uint32     length of the JSON header
+#     header     fingerprint, number of nodes and for each array its
+#                dtype, shape and offset from the start of the file
+#     arrays     raw array data
+# Arrays are loaded as read only views on a memory map of the file so
+# loading only reads the header, the pages of an array are read the
+# first time they are used. The map stays open until close() (or the end
+# of a with block) or as long as the Snapshot or any array from it is
+# alive.
+#
+# The fingerprint hashes every adjacency list, O(V + E) Python work that
+# is most of a load of a large graph. Callers that reload often compute
+# it once with graph_fingerprint() and pass it as fingerprint=, loading
+# then only checks the number of nodes.
+import json
+import mmap
+import struct
+import hashlib
+import numpy as np
+import src.Dijkstra as Dijkstra
+from src.Reachability import ReachabilityIndex
+
+MAGIC = b'SPSNAP\0\0'
+VERSION = 1
+_PREFIX = struct.Struct('<8sII')
+
+
+class SnapshotError(Exception):
+    '''Exception for when a file is not a snapshot this version can read'''
+    pass
+
+
+class StaleSnapshotError(SnapshotError):
+    '''Exception for when a snapshot was written for a different graph'''
+    pass
+
+
+def graph_fingerprint(graph):
+    '''Returns a SHA-256 hex digest of the nodes and edges of a graph in
+    dict order, any change to a node, edge or weight changes it
+    '''
+    h = hashlib.sha256()
+    for v in graph:
+        h.update(repr((v, graph[v])).encode())
+        h.update(b'\n')
+    return h.hexdigest()
+
+
+def save_snapshot(path, graph, reach=None, trees=None, arrays=None,
+                  fingerprint=None):
+    '''Writes precomputed structures of graph to a snapshot file
+
+    Arguments:
+        path -- file to write
+        graph -- dict containing (node: (edge, weight)) pairs
+                 represents the directed graph
+        reach -- Optional Reachability.ReachabilityIndex of the graph
+        trees -- Optional dict source --> (dist, prev) arrays from
+                 Dijkstra.construct_arrays() on the graph
+        arrays -- Optional dict name --> NumPy array of other tables
+        fingerprint -- Optional graph_fingerprint(graph) if it is
+                       already known
+    Raises:
+        ValueError -- if a tree source is not a node in the graph
+    '''
+    index, nodes = Dijkstra.node_index(graph)
+    n = len(nodes)
+    sections = {}
+
+    if reach is not None:
+        sections.update(_reach_arrays(reach, nodes))
+
+    if trees:
+        try:
+            sources = [index[s] for s in trees]
+        except (KeyError, TypeError):
+            raise ValueError('tree sources must be nodes in the graph')
+        sections['tree_sources'] = np.array(sources, dtype=np.int64)
+        sections['tree_dist'] = np.array(
+            [np.asarray(trees[s][0], dtype=np.float64) for s in trees])
+        sections['tree_prev'] = np.array(
+            [np.asarray(trees[s][1], dtype=np.int64) for s in trees])
+
+    for name, value in (arrays or {}).items():
+        sections['user_' + name] = np.asarray(value)
+
+    if fingerprint is None:
+        fingerprint = graph_fingerprint(graph)
+    header = {'fingerprint': fingerprint, 'num_nodes': n,
+              'arrays': {}}
+    # Offsets depend on the header length, lay the arrays out again
+    # until the header fits in front of the first one
+    length = 0
+    while True:
+        offset = _align(_PREFIX.size + length)
+        for name, value in sections.items():
+            header['arrays'][name] = {'dtype': value.dtype.str,
+                                      'shape': list(value.shape),
+                                      'offset': offset}
+            offset = _align(offset + value.nbytes)
+        encoded = json.dumps(header).encode()
+        if len(encoded) <= length:
+            break
+        length = len(encoded)
+
+    with open(path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, VERSION, len(encoded)))
+        f.write(encoded)
+        for name, value in sections.items():
+            f.write(b'\0' * (header['arrays'][name]['offset'] - f.tell()))
+            f.write(np.ascontiguousarray(value).tobytes())
+
+
+def _align(offset):
+    return -(-offset // 8) * 8
+
+
+def _reach_arrays(reach, nodes):
+    '''Flattens a ReachabilityIndex into arrays'''
+    sections = {
+        'reach_comp': np.array([reach.comp[node] for node in nodes],
+                               dtype=np.int64),
+        'reach_dag_offsets': np.cumsum(
+            [0] + [len(succ) for succ in reach.dag], dtype=np.int64),
+        'reach_dag': np.array([d for succ in reach.dag for d in succ],
+                              dtype=np.int64),
+    }
+
+    if reach.bits is not None:
+        data = [bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+                for bits in reach.bits]
+        sections['reach_bits_offsets'] = np.cumsum(
+            [0] + [len(b) for b in data], dtype=np.int64)
+        sections['reach_bits'] = np.frombuffer(b''.join(data),
+                                               dtype=np.uint8)
+    else:
+        sections['reach_low'] = np.array(
+            [low for low, post in reach.intervals], dtype=np.int64)
+        sections['reach_post'] = np.array(
+            [post for low, post in reach.intervals], dtype=np.int64)
+    return sections
+
+
+def load_snapshot(path, graph, fingerprint=None):
+    '''Memory maps a snapshot written for graph
+
+    Arguments:
+        path -- file written by save_snapshot()
+        graph -- dict the snapshot must have been written for
+        fingerprint -- Optional graph_fingerprint(graph) computed
+                       before, saves hashing the whole graph on every
+                       load
+    Return:
+        Snapshot
+    Raises:
+        SnapshotError -- if the file is not a snapshot, is corrupt or
+                         truncated or has a different format version
+        StaleSnapshotError -- if the snapshot is for a different graph
+    '''
+    with open(path, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            raise SnapshotError('%s is empty' % path)
+
+    # Corrupt or truncated files fail anywhere in the parsing, the map is
+    # closed before any error gets out
+    try:
+        return _map_snapshot(path, mm, graph, fingerprint)
+    except SnapshotError:
+        _release(mm)
+        raise
+    except (ValueError, KeyError, TypeError, IndexError, struct.error) as e:
+        _release(mm)
+        raise SnapshotError('%s is corrupt: %s' % (path, e))
+
+
+def _map_snapshot(path, mm, graph, fingerprint):
+    '''Checks the header of a mapped snapshot and builds the Snapshot'''
+    if len(mm) < _PREFIX.size:
+        raise SnapshotError('%s is not a snapshot' % path)
+    magic, version, header_len = _PREFIX.unpack_from(mm)
+    if magic != MAGIC:
+        raise SnapshotError('%s is not a snapshot' % path)
+    if version != VERSION:
+        raise SnapshotError('snapshot version %i, expected %i'
+                            % (version, VERSION))
+
+    header = json.loads(mm[_PREFIX.size:_PREFIX.size + header_len])
+    if fingerprint is None:
+        fingerprint = graph_fingerprint(graph)
+    if header['fingerprint'] != fingerprint or \
+            header['num_nodes'] != len(graph):
+        raise StaleSnapshotError('%s was written for a different graph'
+                                 % path)
+
+    arrays = {}
+    for name, info in header['arrays'].items():
+        dtype = np.dtype(info['dtype'])
+        count = int(np.prod(info['shape']))
+        arrays[name] = np.frombuffer(mm, dtype=dtype, count=count,
+                                     offset=info['offset']
+                                     ).reshape(info['shape'])
+
+    return Snapshot(graph, mm, arrays)
+
+
+def _release(mm):
+    '''Closes a memory map, or leaves it to be released once the arrays
+    made from it before an error are gone
+    '''
+    try:
+        mm.close()
+    except BufferError:
+        pass
+
+
+class Snapshot(object):
+    '''Structures loaded by load_snapshot(), arrays are read only views
+    on the memory mapped file. Usable as a context manager that closes it
+
+    Attributes:
+        arrays -- dict name --> NumPy array of the tables that were
+                  passed to save_snapshot() in arrays
+    '''
+
+    def __init__(self, graph, mm, arrays):
+        self._mm = mm
+        self._arrays = arrays
+        self._index, self._nodes = Dijkstra.node_index(graph)
+        self._reach = None
+        self.arrays = {name[5:]: value for name, value in arrays.items()
+                       if name.startswith('user_')}
+
+        self._tree_rows = {}
+        if 'tree_sources' in arrays:
+            for row, si in enumerate(arrays['tree_sources'].tolist()):
+                self._tree_rows[self._nodes[si]] = row
+
+    def close(self):
+        '''Releases the memory map, the snapshot can't be used after
+
+        Raises:
+            BufferError -- if arrays from the snapshot are still
+                           referenced, the map is then released once they
+                           are gone
+        '''
+        if self._mm is None:
+            return
+        self._arrays = {}
+        self.arrays = {}
+        self._tree_rows = {}
+        mm, self._mm = self._mm, None
+        mm.close()
+
+    @property
+    def closed(self):
+        '''True once close() released the memory map'''
+        return self._mm is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def sources(self):
+        '''List of the sources that have a stored tree'''
+        return list(self._tree_rows)
+
+    def tree(self, s):
+        '''Returns the stored (dist, prev) arrays of source s in the same
+        format as Dijkstra.construct_arrays()
+
+        Raises:
+            KeyError -- if there is no tree for s
+        '''
+        row = self._tree_rows[s]
+        return self._arrays['tree_dist'][row], self._arrays['tree_prev'][row]
+
+    def path(self, s, t):
+        '''Returns the shortest path from s to t from the stored tree
+
+        Raises:
+            KeyError -- if there is no tree for s
+            NoPathError -- if there is no path to target node
+        '''
+        dist, prev = self.tree(s)
+        return Dijkstra.array_path(self._nodes, prev, self._index[s],
+                                   self._index[t])
+
+    @property
+    def reach(self):
+        '''The stored ReachabilityIndex (None if there isn't one), it is
+        rebuilt from the arrays the first time it is used
+        '''
+        if self._reach is None and 'reach_comp' in self._arrays:
+            self._reach = self._load_reach()
+        return self._reach
+
+    def _load_reach(self):
+        a = self._arrays
+        comp = dict(zip(self._nodes, a['reach_comp'].tolist()))
+        offsets = a['reach_dag_offsets'].tolist()
+        targets = a['reach_dag'].tolist()
+        n = len(offsets) - 1
+        dag = [targets[offsets[c]:offsets[c + 1]] for c in range(n)]
+
+        bits = intervals = None
+        if 'reach_bits' in a:
+            data = a['reach_bits'].tobytes()
+            offsets = a['reach_bits_offsets'].tolist()
+            bits = [int.from_bytes(data[offsets[c]:offsets[c + 1]], 'little')
+                    for c in range(n)]
+        else:
+            intervals = list(zip(a['reach_low'].tolist(),
+                                 a['reach_post'].tolist()))
+
+        return ReachabilityIndex.from_parts(comp, n, dag, bits, intervals)
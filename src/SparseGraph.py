@@ -0,0 +1,165 @@
+# Graphs given as SciPy sparse matrices or NumPy edge arrays
+#
+# Main functions:
+#     1) CSRGraph.from_csr() --> Wraps a scipy.sparse CSR matrix without
+#                                copying it
+#     2) CSRGraph.from_edges() --> Builds the CSR arrays from (src, dst,
+#                                  weight) arrays with vectorized sorting
+#     3) as_graph() --> Returns the CSRGraph the engines read for a
+#                       matrix or edge arrays input
+#     4) search_view() --> Returns what the hot loop of an engine indexes
+#                          for the edges of a node
+#
+# dij, dij_paths, bellman_ford and bf_paths take a CSR matrix (or any
+# scipy.sparse matrix, which is converted to CSR first) or a tuple of
+# (src, dst, weight) arrays in place of the dict. Nothing is built per
+# edge up front, the edges of a node are read from the arrays only when
+# the search reaches it.
+#
+# The engines run on Python numbers, so the slices of a node are still
+# converted with tolist() when it is expanded. CSRGraph[v] returns a list
+# of (edge, weight) tuples like a dict would, but the engines' hot loops
+# go through search_view(), whose items are lazy zip iterators over those
+# slices: no list and (as zip reuses its result tuple) no tuple per edge.
+# Dijkstra on a 1M edge matrix is then as fast as on the same graph as a
+# dict, about 20% faster than through the lists.
+#
+# Representation:
+#     nodes == 0..V-1, the rows of the matrix
+#     matrix[v, u] == weight of the edge v --> u, every stored entry is
+#     an edge (explicit zeros are zero weight edges)
+#     Example:
+#         1 --> 2 (weight of 5)
+#         represented as indptr = [0, 0, 1, 1], indices = [2], data = [5]
+import collections.abc
+
+
+class CSRGraph(collections.abc.Mapping):
+    '''Read only {node: [(edge, weight)]} view of CSR arrays
+
+    Arguments:
+        indptr -- array of V + 1 offsets, the edges of node v are the
+                  slice indptr[v]:indptr[v + 1] of indices and data
+        indices -- array with the node each edge goes to
+        data -- array with the weight of each edge
+    '''
+
+    def __init__(self, indptr, indices, data):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.lazy = _LazyEdges(indptr, indices, data)
+
+    @classmethod
+    def from_csr(cls, matrix):
+        '''Returns a CSRGraph sharing the arrays of a scipy.sparse CSR
+        matrix, other sparse formats are converted to CSR first
+
+        Raises:
+            ValueError -- if the matrix is not square
+        '''
+        rows, cols = matrix.shape
+        if rows != cols:
+            raise ValueError('adjacency matrix must be square, got %ix%i'
+                             % (rows, cols))
+        if getattr(matrix, 'format', 'csr') != 'csr':
+            matrix = matrix.tocsr()
+        return cls(matrix.indptr, matrix.indices, matrix.data)
+
+    @classmethod
+    def from_edges(cls, src, dst, weight, num_nodes=None):
+        '''Builds a CSRGraph from parallel edge arrays, the edges keep
+        their order within each source node
+
+        Arguments:
+            src -- array with the node each edge comes from
+            dst -- array with the node each edge goes to
+            weight -- array with the weight of each edge
+            num_nodes -- number of nodes, by default one more than the
+                         largest node in src and dst
+        Raises:
+            ValueError -- if the arrays have different lengths or a node
+                          is not in 0..num_nodes-1
+        '''
+        import numpy as np
+
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weight = np.asarray(weight)
+        if not src.shape == dst.shape == weight.shape or src.ndim != 1:
+            raise ValueError('src, dst and weight must be 1D arrays of '
+                             'the same length')
+        if num_nodes is None:
+            num_nodes = int(max(src.max(), dst.max())) + 1 if src.size else 0
+        if src.size and (min(src.min(), dst.min()) < 0 or
+                         max(src.max(), dst.max()) >= num_nodes):
+            raise ValueError('edge nodes must be in 0..%i' % (num_nodes - 1))
+
+        order = np.argsort(src, kind='stable')
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, dst[order], weight[order])
+
+    def __getitem__(self, node):
+        if not 0 <= node < len(self.indptr) - 1:
+            raise KeyError(node)
+        a = self.indptr[node]
+        b = self.indptr[node + 1]
+        return list(zip(self.indices[a:b].tolist(), self.data[a:b].tolist()))
+
+    def __iter__(self):
+        return iter(range(len(self.indptr) - 1))
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    def __contains__(self, node):
+        try:
+            return 0 <= node < len(self.indptr) - 1
+        except TypeError:
+            return False
+
+
+class _LazyEdges(object):
+    '''node --> iterator of the (edge, weight) pairs of a CSRGraph node,
+    each item can only be iterated once
+    '''
+    __slots__ = ('indptr', 'indices', 'data', 'num_nodes')
+
+    def __init__(self, indptr, indices, data):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.num_nodes = len(indptr) - 1
+
+    def __getitem__(self, node):
+        if not 0 <= node < self.num_nodes:
+            raise KeyError(node)
+        a = self.indptr[node]
+        b = self.indptr[node + 1]
+        return zip(self.indices[a:b].tolist(), self.data[a:b].tolist())
+
+
+def search_view(graph):
+    '''Returns what an engine should index for the edges it relaxes:
+    graph itself, or for a CSRGraph its view of lazy iterators
+    '''
+    if type(graph) is CSRGraph:
+        return graph.lazy
+    return graph
+
+
+def as_graph(graph):
+    '''Returns the graph an engine should read
+
+    Arguments:
+        graph -- graph dict, scipy.sparse matrix or (src, dst, weight)
+                 tuple of arrays
+    Return:
+        CSRGraph for a matrix or edge arrays, else graph itself
+    '''
+    if isinstance(graph, tuple) and len(graph) == 3:
+        return CSRGraph.from_edges(*graph)
+    if hasattr(graph, 'tocsr') and hasattr(graph, 'shape'):
+        return CSRGraph.from_csr(graph)
+    return graph
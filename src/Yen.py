@@ -0,0 +1,175 @@
+# Implementation of Yen's k shortest loopless paths algorithm on top of
+# the Dijkstra engine
+#
+# Main functions:
+#     1) k_shortest_paths() --> Returns the k shortest loopless paths
+#
+# Spur searches mask the removed nodes and edges with sets instead of
+# copying the graph, and the distances along the root path are reused
+# from the path it came from instead of being searched again.
+#
+# With use_reverse=True one backward Dijkstra from the target gives the
+# exact distance from every node to the target. It's used as the A*
+# potential of each spur search and, when the shortest path from the
+# spur node in that tree doesn't touch a masked node or edge, as the
+# spur path itself without any search (Hershberger style speedup).
+#
+# Graph representation is the same as Dijkstra (non-negative weights):
+#     nodes == keys
+#     [(Edge to, Weight)] == Value
+import heapq
+import collections
+import src.Dijkstra as Dijkstra
+from src.Dijkstra import NoPathError
+
+
+def k_shortest_paths(adjacentList, s, t, k, use_reverse=True):
+    '''Finds the k shortest loopless paths from source to target
+
+    Arguments:
+        adjacentList -- dict containing (node: (edge, weight)) pairs
+                        represents the directed graph
+        s -- source node to start with
+        t -- target node to find the paths to
+        k -- max number of paths to return
+        use_reverse -- if True use the backward shortest path tree from
+                       t to guide and short circuit the spur searches
+    Return:
+        list of up to k (distance, path) tuples, shortest first
+    Raises:
+        ValueError -- if s or t are not valid nodes
+        NoPathError -- if there is no path to target node
+    '''
+    if s not in adjacentList:
+        raise ValueError('s argument not a valid node')
+    if t not in adjacentList:
+        raise ValueError('t argument not a valid node')
+    if k < 1:
+        return []
+
+    if use_reverse:
+        to_t, succ = _reverse_tree(adjacentList, t)
+    else:
+        to_t = succ = None
+
+    first = _spur_path(adjacentList, s, t, set(), set(), to_t, succ)
+    if first is None:
+        raise NoPathError()
+
+    # Each path is kept with the distance from s to each of its nodes
+    paths = [first]
+    candidates = []
+    seen = {tuple(first[0])}
+
+    while len(paths) < k:
+        last_path, last_dists = paths[-1]
+
+        for i in range(len(last_path) - 1):
+            spur = last_path[i]
+            root = last_path[:i + 1]
+
+            # Mask the root path (minus the spur node) so paths stay
+            # loopless and mask the next edge of every found path
+            # sharing this root so the spur path is a new one
+            removed_nodes = set(root[:-1])
+            removed_edges = set()
+            for path, dists in paths:
+                if len(path) > i + 1 and path[:i + 1] == root:
+                    removed_edges.add((path[i], path[i + 1]))
+
+            spur_result = _spur_path(adjacentList, spur, t, removed_nodes,
+                                     removed_edges, to_t, succ)
+            if spur_result is None:
+                continue
+
+            spur_path, spur_dists = spur_result
+            path = root[:-1] + spur_path
+            key = tuple(path)
+            if key in seen:
+                continue
+            seen.add(key)
+
+            root_dist = last_dists[i]
+            dists = last_dists[:i] + [root_dist + d for d in spur_dists]
+            heapq.heappush(candidates, (dists[-1], path, dists))
+
+        if not candidates:
+            break
+        dist, path, dists = heapq.heappop(candidates)
+        paths.append((path, dists))
+
+    return [(dists[-1], path) for path, dists in paths]
+
+
+def _reverse_tree(adjacentList, t):
+    '''Runs Dijkstra from t on the reversed graph
+
+    Return:
+        (to_t, succ) dicts with the distance from each node to t and the
+        next node on its shortest path to t, only reachable nodes
+    '''
+    reverse = {node: [] for node in adjacentList}
+    for v in adjacentList:
+        for u, w in adjacentList[v]:
+            reverse[u].append((v, w))
+
+    distances, prev = Dijkstra.construct_paths(reverse, t)
+    infinity = float('inf')
+    to_t = {node: d for node, d in distances.items() if d != infinity}
+    return to_t, {node: prev[node] for node in to_t}
+
+
+def _spur_path(adjacentList, spur, t, removed_nodes, removed_edges,
+               to_t, succ):
+    '''Finds the shortest path from spur to t avoiding the masked nodes
+    and edges
+
+    Return:
+        None if there is no path, else (path, dists) with the distance
+        from spur to each node on the path
+    '''
+    if to_t is not None:
+        if spur not in to_t:
+            return None
+        # Try the shortest path in the reverse tree first, it's optimal
+        # if it doesn't use anything that is masked
+        path = [spur]
+        node = spur
+        while node != t:
+            nxt = succ[node]
+            if nxt in removed_nodes or (node, nxt) in removed_edges:
+                break
+            path.append(nxt)
+            node = nxt
+        else:
+            return path, [to_t[spur] - to_t[node] for node in path]
+
+    # A* from the spur node, to_t is a consistent potential because
+    # masking only makes the distances to t longer
+    dist = {spur: 0}
+    prev = {spur: spur}
+    PQ = [(to_t[spur] if to_t is not None else 0, 0, spur)]
+
+    while PQ:
+        f, d, v = heapq.heappop(PQ)
+        if d > dist[v]:
+            continue
+        if v == t:
+            path = collections.deque([t])
+            while path[0] != spur:
+                path.appendleft(prev[path[0]])
+            return list(path), [dist[node] for node in path]
+
+        for u, w in adjacentList[v]:
+            if u in removed_nodes or (v, u) in removed_edges:
+                continue
+            if to_t is not None and u not in to_t:
+                continue
+            nd = d + w
+            if u not in dist or nd < dist[u]:
+                dist[u] = nd
+                prev[u] = v
+                heapq.heappush(PQ, (nd + (to_t[u] if to_t is not None else 0),
+                                    nd, u))
+
+    return None
@@ -0,0 +1,5 @@
+# Entry point for `python -m src`, see BatchQuery
+import sys
+from src.BatchQuery import main
+
+sys.exit(main())
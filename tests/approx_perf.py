@@ -0,0 +1,100 @@
+# Benchmarks the (1 + epsilon) approximate searches versus exact Dijkstra,
+# speed against the error actually measured
+#
+# Graphs:
+#     - SIDE x SIDE grid with weights in [10, 20], a road network stand in
+#       where the manhattan distance times 10 is a consistent heuristic
+#     - Random graph with N nodes and 4N edges, weights in [1, 20]
+#
+# Outputs:
+#     - Average milliseconds per source to target query of dij, of exact
+#       Dijkstra on a FrozenGraph (no per query setup, like the
+#       approximate graphs) and of the rounded bucket search and weighted
+#       A* for each epsilon
+#     - Average and largest relative error of each against dij
+#     - Time of full single source searches on the random graph
+import time
+import random
+import src.Dijkstra as Dijkstra
+from src.FrozenGraph import FrozenGraph
+from src.Approximate import ApproximateGraph
+
+SIDE = 300
+N = 100000
+QUERIES = 50
+EPSILONS = [0.01, 0.1, 0.5, 1]
+
+
+def gen_grid(side):
+    g = {(x, y): [] for x in range(side) for y in range(side)}
+    for x, y in g:
+        for u in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if u in g:
+                g[(x, y)].append((u, random.randint(10, 20)))
+    return g
+
+def gen_rand_graph(n, m):
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[random.randrange(n)].append((random.randrange(n),
+                                       random.randint(1, 20)))
+    return g
+
+def run(queries, exact, func):
+    '''Returns (ms per query, average error, largest error)'''
+    errors = []
+    t0 = time.perf_counter()
+    answers = [func(s, t) for s, t in queries]
+    ms = 1000 * (time.perf_counter() - t0) / len(queries)
+    for (distance, lower), d in zip(answers, exact):
+        errors.append(distance / d - 1 if d else 0)
+    return ms, sum(errors) / len(errors), max(errors)
+
+def report(label, ms, avg, top):
+    print('%-26s --> %9.3f ms  error avg %6.3f%% max %6.3f%%'
+          % (label, ms, 100 * avg, 100 * top))
+
+
+random.seed(0)
+print('----- %ix%i grid, %i queries -----\n' % (SIDE, SIDE, QUERIES))
+g = gen_grid(SIDE)
+queries = [(random.choice(list(g)), random.choice(list(g)))
+           for _ in range(QUERIES)]
+t0 = time.perf_counter()
+exact = [Dijkstra.dij(g, s, t) for s, t in queries]
+print('%-26s --> %9.3f ms' % ('dij',
+                              1000 * (time.perf_counter() - t0) / QUERIES))
+prepared = FrozenGraph(g, threads=False)
+t0 = time.perf_counter()
+for s, t in queries:
+    prepared.dij(s, t)
+print('%-26s --> %9.3f ms' % ('FrozenGraph.dij',
+                              1000 * (time.perf_counter() - t0) / QUERIES))
+
+for epsilon in EPSILONS:
+    t0 = time.perf_counter()
+    graph = ApproximateGraph(g, epsilon)
+    print('\nepsilon %g (rounding %f s)' % (epsilon, time.perf_counter() - t0))
+    report('  rounded buckets', *run(queries, exact, graph.dij))
+
+    def astar(s, t):
+        tx, ty = t
+        return graph.dij(s, t, lambda v: 10 * (abs(v[0] - tx) +
+                                                abs(v[1] - ty)))
+    report('  weighted A*', *run(queries, exact, astar))
+
+
+print('\n----- Random graph n=%i m=%i, full searches -----\n' % (N, 4 * N))
+g = gen_rand_graph(N, 4 * N)
+t0 = time.perf_counter()
+exact = Dijkstra.dij(g, 0)
+print('%-26s --> %9.3f s' % ('dij', time.perf_counter() - t0))
+for epsilon in EPSILONS:
+    graph = ApproximateGraph(g, epsilon)
+    t0 = time.perf_counter()
+    approx = graph.dij(0)
+    t = time.perf_counter() - t0
+    errors = [approx[v] / exact[v] - 1 for v in g if 0 < exact[v] < 1e308]
+    print('%-26s --> %9.3f s  error avg %6.3f%% max %6.3f%%'
+          % ('rounded epsilon %g' % epsilon, t,
+             100 * sum(errors) / len(errors), 100 * max(errors)))
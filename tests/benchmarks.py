@@ -3,21 +3,35 @@
 #
 # Benchmark prompts user for number of times to run tests
 #
+# With --profile (python3 -m tests.benchmarks --profile) our engines are
+# also run under src.Profiling on the CSR graphs, the phase breakdown and
+# top functions are printed and profile_<name>.prof (pstats) and
+# profile_<name>.folded (collapsed stacks for flamegraphs) are written
+#
 # Compares:
 #     - Our Bellman Ford vs. Our Dijkstra
 #     - Our Bellman Ford vs. NetworkX's Bellman Ford
 #     - Our Dijkstra vs. NetworkX's Dijkstra
+#     - Our engines on a SciPy CSR matrix vs. scipy.sparse.csgraph, and
+#       vs. converting the matrix into a graph dict first
 #
 # Outputs:
 #     - Average times for each
 #     - Minimum time for each
 #     - Maximum time for each
 #     - Percent difference for each comparison
+import sys
 import time
 import random
+import numpy as np
 import networkx as nx
+import scipy.sparse as sp
+from scipy.sparse import csgraph
 import src.BellmanFord as BF
 import src.Dijkstra as Dijkstra
+from src.Profiling import profile_call
+
+PROFILE = '--profile' in sys.argv[1:]
 
 
 def construct_nx_graph(g):
@@ -108,6 +122,47 @@ def rand_graphs_3():
 
     return (g, construct_nx_graph(g))
 
+def rand_csr(n, m):
+    '''Constructs a random n x n CSR matrix with about m edges, weights
+    in [1, 20]
+    '''
+    src = np.random.randint(0, n, m)
+    dst = np.random.randint(0, n, m)
+    weight = np.random.randint(1, 21, m).astype(np.float64)
+    matrix = sp.csr_matrix((weight, (src, dst)), shape=(n, n))
+    matrix.sum_duplicates()
+    return matrix
+
+def csr_to_dict(matrix):
+    '''Converts a CSR matrix into the graph dict the engines take'''
+    g = {}
+    indptr = matrix.indptr.tolist()
+    indices = matrix.indices.tolist()
+    data = matrix.data.tolist()
+    for v in range(matrix.shape[0]):
+        a, b = indptr[v], indptr[v + 1]
+        g[v] = list(zip(indices[a:b], data[a:b]))
+    return g
+
+def time_call(func, *args, **kwargs):
+    '''Returns (time, result) of one call'''
+    t0 = time.time()
+    result = func(*args, **kwargs)
+    t1 = time.time()
+
+    return t1 - t0, result
+
+def profile(name, func, *args, **kwargs):
+    '''Profiles num_times calls, prints the report and writes the
+    profile_<name> files
+    '''
+    _, report = profile_call(func, *args, mode='both', repeat=num_times,
+                             **kwargs)
+    print('\n%s\n' % name)
+    print(report.format())
+    report.dump_stats('profile_%s.prof' % name)
+    report.write_collapsed('profile_%s.folded' % name)
+
 def rand_weight(start=1, end=20):
     '''Returns random weight for graph'''
     return random.randint(start, end)
@@ -301,3 +356,57 @@ print('\nOur Dij vs. NetworkX Dij Percent Difference: %.2f%%' % dij_nx_diff)
 print('Winner: %s' % ('Our Dij' if dij_avg <= nx_dij_avg else 'NetworkX Dij'))
 
 
+
+
+print('\n----- SciPy CSR Matrix (n=100000 m=400000) -----')
+matrix = rand_csr(100000, 400000)
+
+dij_times = []
+dict_times = []
+sp_dij_times = []
+for _ in range(num_times):
+    t, ours = time_call(Dijkstra.dij, matrix, 0)
+    dij_times.append(t)
+    t, g = time_call(csr_to_dict, matrix)
+    dict_times.append(t + time_call(Dijkstra.dij, g, 0)[0])
+    t, theirs = time_call(csgraph.shortest_path, matrix, method='D',
+                          indices=0)
+    sp_dij_times.append(t)
+
+    # Same distances from every engine
+    assert np.allclose(list(ours.values()), theirs)
+
+print('Our Dij on CSR        --> Average: %f Min: %f Max: %f'
+      % (sum(dij_times) / num_times, min(dij_times), max(dij_times)))
+print('Convert + Our Dij     --> Average: %f Min: %f Max: %f'
+      % (sum(dict_times) / num_times, min(dict_times), max(dict_times)))
+print('SciPy Dij             --> Average: %f Min: %f Max: %f'
+      % (sum(sp_dij_times) / num_times, min(sp_dij_times),
+         max(sp_dij_times)))
+
+print('\n----- SciPy CSR Matrix (n=2000 m=8000) -----')
+matrix = rand_csr(2000, 8000)
+
+bf_times = []
+sp_bf_times = []
+for _ in range(num_times):
+    t, ours = time_call(BF.bellman_ford, matrix, 0)
+    bf_times.append(t)
+    t, theirs = time_call(csgraph.bellman_ford, matrix, indices=0)
+    sp_bf_times.append(t)
+
+    assert all(np.isclose(ours.get(v, np.inf), d)
+               for v, d in enumerate(theirs))
+
+print('Our BF on CSR         --> Average: %f Min: %f Max: %f'
+      % (sum(bf_times) / num_times, min(bf_times), max(bf_times)))
+print('SciPy BF              --> Average: %f Min: %f Max: %f'
+      % (sum(sp_bf_times) / num_times, min(sp_bf_times), max(sp_bf_times)))
+
+
+if PROFILE:
+    print('\n----- Profiles (CSR n=100000 m=400000 and n=2000 m=8000) -----')
+    profile('dij', Dijkstra.dij, rand_csr(100000, 400000), 0)
+    profile('dij_paths', Dijkstra.dij_paths, rand_csr(100000, 400000), 0)
+    profile('bellman_ford', BF.bellman_ford, matrix, 0)
+    profile('bf_paths', BF.bf_paths, matrix, 0)
@@ -0,0 +1,53 @@
+# Benchmarks throughput of the BFS engines versus our Dijkstra on graphs
+# with unit weights and with {0, 1} weights
+#
+# Compares:
+#     - BFS vs. Dijkstra on unit weight graphs
+#     - 0-1 BFS vs. Dijkstra on {0, 1} weight graphs
+#
+# Outputs:
+#     - Queries per second for each engine and graph size
+#     - Speedup over Dijkstra
+import time
+import random
+import networkx as nx
+import src.BFS as BFS
+import src.Dijkstra as Dijkstra
+
+SIZES = [100, 1000, 10000, 100000]
+QUERIES = 20
+
+
+def gen_rand_graph(n, m, weights):
+    '''Generates random directed graph with weights picked from weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=n)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, random.choice(weights)))
+    return g
+
+def throughput(func, g, sources):
+    '''Returns queries per second of func over every source'''
+    t0 = time.perf_counter()
+    for s in sources:
+        func(g, s)
+    t1 = time.perf_counter()
+
+    return len(sources) / (t1 - t0)
+
+
+random.seed(0)
+for name, weights, engine in (('Unit weights', [1], BFS.bfs),
+                              ('{0, 1} weights', [0, 1], BFS.zero_one_bfs)):
+    print('----- %s -----' % name)
+    for n in SIZES:
+        g = gen_rand_graph(n, 4 * n, weights)
+        sources = [random.randrange(n) for _ in range(QUERIES)]
+
+        dij_qps = throughput(Dijkstra.dij, g, sources)
+        bfs_qps = throughput(engine, g, sources)
+
+        print('n=%-7i Dij: %10.1f q/s  %s: %10.1f q/s  Speedup: %.2fx'
+              % (n, dij_qps, engine.__name__, bfs_qps, bfs_qps / dij_qps))
+    print()
@@ -4,6 +4,7 @@ import random
 import networkx as nx
 import src.BellmanFord as BF
 import src.Dijkstra as Dijkstra
+from src.Reachability import ReachabilityIndex
 
 def gen_rand_graph(n, m=None):
     if m is not None:
@@ -84,14 +85,12 @@ for n in range(2, 51):
 
     for _ in range(1000):
         g, nx_g = gen_rand_graph(n)
-        
-        while True:
-            try:
-                bf_times.append(test_bf(g, n-1))
-            except BF.NoPathError:
-                g, nx_g = gen_rand_graph(n)
-            else:
-                break
+
+        # Regenerate until n-1 can be reached without running the algorithms
+        while not ReachabilityIndex(g).can_reach(0, n-1):
+            g, nx_g = gen_rand_graph(n)
+
+        bf_times.append(test_bf(g, n-1))
         
         dij_times.append(test_dij(g, n-1))
         nx_bf_times.append(test_nx_bf(nx_g, n-1))
@@ -0,0 +1,84 @@
+# Benchmarks out of core Bellman Ford on an edge file versus bellman_ford
+# on the graph dict
+#
+# Graphs have N nodes and 4N random edges with negative weights but no
+# negative cycle (weights are w + p[v] - p[u] for random potentials p and
+# w in [1, 20]). The dict is only built up to DICT_MAX nodes.
+#
+# Outputs:
+#     - Time to write the edge file and its size
+#     - Time of external_bellman_ford() with its passes and the chunks it
+#       read and skipped, for two chunk sizes
+#     - Peak RSS of the process after the external run
+#       (resource.getrusage), the edge file is never all in memory
+#     - Time of BF.bellman_ford() on the dict
+import os
+import time
+import resource
+import tempfile
+import numpy as np
+import src.BellmanFord as BF
+from src.ExternalBellmanFord import (EdgeFileWriter, external_bellman_ford,
+                                     EdgeFile)
+
+SIZES = [100000, 1000000, 4000000]
+DEGREE = 4
+DICT_MAX = 100000
+BATCH = 1 << 20
+
+
+def write_graph(path, n, chunk_edges, seed=0):
+    '''Writes the random graph batch by batch, never holding all of it'''
+    rng = np.random.default_rng(seed)
+    potential = rng.integers(0, 50, n).astype(np.float64)
+    with EdgeFileWriter(path, n, chunk_edges) as writer:
+        for a in range(0, n, BATCH // DEGREE):
+            b = min(a + BATCH // DEGREE, n)
+            src = np.repeat(np.arange(a, b), DEGREE)
+            dst = rng.integers(0, n, len(src))
+            w = rng.integers(1, 21, len(src)) + potential[dst] - potential[src]
+            writer.add(src, dst, w)
+
+def to_dict(path):
+    edges = EdgeFile(path)
+    g = {v: [] for v in range(edges.num_nodes)}
+    records = edges.records
+    for u, v, w in zip(records['src'].tolist(), records['dst'].tolist(),
+                       records['weight'].tolist()):
+        g[u].append((v, w))
+    return g
+
+def peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+tmp = tempfile.mkdtemp()
+path = os.path.join(tmp, 'edges.bin')
+for n in SIZES:
+    print('----- n=%i m=%i -----\n' % (n, DEGREE * n))
+    for chunk_edges in (1 << 16, 1 << 20):
+        t0 = time.perf_counter()
+        write_graph(path, n, chunk_edges)
+        print('chunks of %-8i write    --> %f s (%.1f MB)'
+              % (chunk_edges, time.perf_counter() - t0,
+                 os.path.getsize(path) / 2 ** 20))
+
+        stats = {}
+        t0 = time.perf_counter()
+        dist, prev = external_bellman_ford(path, 0, stats=stats)
+        print('chunks of %-8i external --> %f s, %i passes, %i chunks '
+              'read, %i skipped, peak RSS %.1f MB'
+              % (chunk_edges, time.perf_counter() - t0, stats['passes'],
+                 stats['chunks_read'], stats['chunks_skipped'],
+                 peak_rss_mb()))
+
+    if n <= DICT_MAX:
+        g = to_dict(path)
+        t0 = time.perf_counter()
+        expected = BF.bellman_ford(g, 0)
+        print('bellman_ford dict              --> %f s'
+              % (time.perf_counter() - t0))
+        assert all(expected.get(v, np.inf) == d
+                   for v, d in enumerate(dist.tolist()))
+    print()
+os.remove(path)
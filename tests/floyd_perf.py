@@ -0,0 +1,46 @@
+# Benchmarks the blocked Floyd Warshall against running dij from every
+# node on dense graphs
+#
+# Outputs:
+#     - Time for each size, block size and V x dij
+import time
+import random
+import networkx as nx
+import src.Dijkstra as Dijkstra
+from src.FloydWarshall import floyd_warshall
+
+SIZES = [100, 250, 500, 1000]
+DENSITY = 0.3
+BLOCK_SIZES = [32, 64, 128, 512]
+
+
+def gen_rand_graph(n, p):
+    '''Generates random dense directed graph with random weights'''
+    nx_g = nx.gnp_random_graph(n, p, directed=True, seed=0)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, random.randint(1, 100)))
+    return g
+
+def timed(func):
+    '''Returns time to run func'''
+    t0 = time.perf_counter()
+    func()
+    t1 = time.perf_counter()
+
+    return t1 - t0
+
+
+random.seed(0)
+for n in SIZES:
+    g = gen_rand_graph(n, DENSITY)
+    print('----- All Pairs (n=%i m=%i) -----\n'
+          % (n, sum(len(edges) for edges in g.values())))
+    print('V x dij                 --> %f' % timed(
+        lambda: [Dijkstra.dij(g, s) for s in g]))
+    for block_size in BLOCK_SIZES:
+        print('floyd_warshall (b=%-4i) --> %f' % (block_size, timed(
+            lambda: floyd_warshall(g, block_size=block_size))))
+    print('floyd_warshall paths    --> %f\n' % timed(
+        lambda: floyd_warshall(g, next_hops=True)))
@@ -0,0 +1,61 @@
+# Benchmarks the grid engine on cost rasters versus expanding the raster
+# into a graph dict and calling dij
+#
+# Outputs:
+#     - Time to expand the raster and run dij on the dict
+#     - Time of grid_search() on the raster
+#     - Peak memory of both (tracemalloc), the dict is only built up to
+#       DICT_MAX cells a side since it needs GBs past that
+import time
+import tracemalloc
+import numpy as np
+import src.Dijkstra as Dijkstra
+from src.GridGraph import grid_search, grid_to_dict
+
+SIZES = [256, 512, 1024, 4096]
+DICT_MAX = 1024
+
+
+def timed(func, *args):
+    '''Returns (seconds, result) of one call'''
+    t0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - t0, result
+
+def peak(func, *args):
+    '''Returns the peak traced memory of one call in MB'''
+    tracemalloc.start()
+    func(*args)
+    _, top = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return top / 2 ** 20
+
+def dict_search(cost, connectivity):
+    g = grid_to_dict(cost, connectivity)
+    return Dijkstra.construct_paths(g, (0, 0))
+
+
+rng = np.random.default_rng(0)
+for n in SIZES:
+    cost = rng.integers(1, 10, (n, n)).astype(np.float64)
+    print('----- %ix%i raster (%.0f MB) -----\n' % (n, n, cost.nbytes / 2 ** 20))
+
+    for connectivity in (4, 8):
+        t, _ = timed(grid_search, cost, (0, 0), None, None, connectivity)
+        print('grid_search %i-connected         --> %f' % (connectivity, t))
+        if n <= DICT_MAX:
+            t, _ = timed(dict_search, cost, connectivity)
+            print('dict + dij %i-connected          --> %f' % (connectivity, t))
+
+    t, _ = timed(grid_search, cost, (n // 2, n // 2), None, n)
+    print('grid_search radius n            --> %f' % t)
+    sources = [(0, 0), (0, n - 1), (n - 1, 0), (n - 1, n - 1)]
+    t, _ = timed(grid_search, cost, sources)
+    print('grid_search 4 sources           --> %f' % t)
+
+    if n <= DICT_MAX // 2:
+        print('grid_search peak MB             --> %f'
+              % peak(grid_search, cost, (0, 0)))
+        print('dict + dij peak MB              --> %f'
+              % peak(dict_search, cost, 4))
+    print()
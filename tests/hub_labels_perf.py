@@ -0,0 +1,89 @@
+# Benchmarks the hub label distance oracle versus searching with dij
+#
+# Graphs:
+#     - SIDE x SIDE grids with weights in [1, 20], road network stand ins
+#     - Random graph with N nodes and 3N edges, weights in [1, 20]
+#
+# Outputs:
+#     - Time to build the labels, average label length and size of the
+#       label arrays and of the snapshot file
+#     - Time to load the memory mapped labels
+#     - Average microseconds per source to target query of dij(g, s, t),
+#       FrozenGraph.dij and of the in memory and memory mapped labels
+import os
+import time
+import random
+import tempfile
+import src.Dijkstra as Dijkstra
+from src.FrozenGraph import FrozenGraph
+from src.HubLabels import HubLabels
+
+SIDES = [40, 70, 100]
+N = 3000
+QUERIES = 2000
+DIJ_QUERIES = 50
+
+
+def gen_grid(side):
+    g = {(x, y): [] for x in range(side) for y in range(side)}
+    for x, y in g:
+        for u in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if u in g:
+                g[(x, y)].append((u, random.randint(1, 20)))
+    return g
+
+def gen_rand_graph(n, m):
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[random.randrange(n)].append((random.randrange(n),
+                                       random.randint(1, 20)))
+    # Cycle through every node so all pairs have a path
+    for node in range(n):
+        g[node].append(((node + 1) % n, 20))
+    return g
+
+def us_per_query(func, queries):
+    t0 = time.perf_counter()
+    for s, t in queries:
+        func(s, t)
+    return 1e6 * (time.perf_counter() - t0) / len(queries)
+
+def run(label, g):
+    print('----- %s (n=%i m=%i) -----\n'
+          % (label, len(g), sum(len(edges) for edges in g.values())))
+    t0 = time.perf_counter()
+    labels = HubLabels(g)
+    print('build                    --> %f s' % (time.perf_counter() - t0))
+    print('average label entries    --> %.1f' % (labels.size / 2 / len(g)))
+    print('label arrays             --> %.2f MB' % (labels.nbytes / 2 ** 20))
+
+    path = os.path.join(tempfile.mkdtemp(), 'labels.snap')
+    labels.save(path, g)
+    t0 = time.perf_counter()
+    mapped = HubLabels.load(path, g)
+    print('load (memory mapped)     --> %f s' % (time.perf_counter() - t0))
+    print('snapshot file            --> %.2f MB' % (os.path.getsize(path)
+                                                    / 2 ** 20))
+
+    nodes = list(g)
+    queries = [(random.choice(nodes), random.choice(nodes))
+               for _ in range(QUERIES)]
+    for s, t in queries[:DIJ_QUERIES]:
+        assert mapped.distance(s, t) == Dijkstra.dij(g, s, t)
+
+    prepared = FrozenGraph(g, threads=False)
+    print('dij(g, s, t)             --> %10.1f us'
+          % us_per_query(lambda s, t: Dijkstra.dij(g, s, t),
+                         queries[:DIJ_QUERIES]))
+    print('FrozenGraph.dij          --> %10.1f us'
+          % us_per_query(prepared.dij, queries[:DIJ_QUERIES]))
+    print('labels in memory         --> %10.1f us'
+          % us_per_query(labels.distance, queries))
+    print('labels memory mapped     --> %10.1f us\n'
+          % us_per_query(mapped.distance, queries))
+
+
+random.seed(0)
+for side in SIDES:
+    run('%ix%i grid' % (side, side), gen_grid(side))
+run('Random graph', gen_rand_graph(N, 2 * N))
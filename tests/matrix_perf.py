@@ -0,0 +1,56 @@
+# Benchmarks the many-to-many distance matrix methods versus calling
+# dij once per source and picking out the target entries
+#
+# Outputs:
+#     - Time for each method and number of workers
+import os
+import time
+import random
+import networkx as nx
+import src.Dijkstra as Dijkstra
+from src.DistanceMatrix import distance_matrix
+
+N = 20000
+M = 80000
+SOURCES = 200
+TARGETS = 200
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with random weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=0)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, random.randint(1, 20)))
+    return g
+
+def timed(func):
+    '''Returns time to run func'''
+    t0 = time.perf_counter()
+    func()
+    t1 = time.perf_counter()
+
+    return t1 - t0
+
+
+random.seed(0)
+g = gen_rand_graph(N, M)
+sources = random.sample(range(N), SOURCES)
+targets = random.sample(range(N), TARGETS)
+cores = os.cpu_count() or 1
+
+print('----- %i x %i Distance Matrix (n=%i m=%i) -----\n'
+      % (SOURCES, TARGETS, N, M))
+print('dij per source          --> %f' % timed(
+    lambda: [[dists[t] for t in targets]
+             for dists in (Dijkstra.dij(g, s) for s in sources)]))
+print('dijkstra                --> %f' % timed(
+    lambda: distance_matrix(g, sources, targets)))
+print('buckets                 --> %f' % timed(
+    lambda: distance_matrix(g, sources, targets, method='buckets')))
+print('dijkstra (%2i workers)   --> %f' % (cores, timed(
+    lambda: distance_matrix(g, sources, targets, workers=cores))))
+print('buckets  (%2i workers)   --> %f' % (cores, timed(
+    lambda: distance_matrix(g, sources, targets, method='buckets',
+                            workers=cores))))
@@ -0,0 +1,118 @@
+# Benchmarks the memory used by our Dijkstra and Bellman Ford across
+# graph sizes and densities
+#
+# Each algorithm is run twice per graph:
+#     - with a thread sampling the process RSS for the peak growth of
+#       the resident set during the call (no tracemalloc overhead)
+#     - under tracemalloc for the peak Python heap used during the call
+#       and the heap still retained by its result afterwards
+#
+# Outputs:
+#     - Table of the peak, retained and RSS growth in KB
+#     - mem_output.csv next to the timing data in perf_output.csv with
+#       one row per algorithm, size and density
+import os
+import csv
+import gc
+import time
+import random
+import threading
+import tracemalloc
+import networkx as nx
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+
+SIZES = [1000, 5000, 20000]
+DEGREES = [2, 8]  # average out degree, m = n * degree
+SAMPLE_INTERVAL = 0.001
+
+ALGORITHMS = [
+    ('dij', lambda g: Dijkstra.dij(g, 0)),
+    ('dij_paths', lambda g: Dijkstra.dij_paths(g, 0)),
+    ('bellman_ford', lambda g: BF.bellman_ford(g, 0)),
+    ('bf_paths', lambda g: BF.bf_paths(g, 0)),
+]
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with random weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=n + m)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, random.randint(1, 20)))
+    return g
+
+def rss():
+    '''Returns the resident set size of the process in bytes'''
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        # No /proc, fall back to the peak RSS so far (KB on Linux,
+        # bytes on macOS)
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def traced(func, g):
+    '''Returns (peak, retained) heap bytes allocated by func(g)'''
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = func(g)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    return peak - base, current - base
+
+def sampled(func, g):
+    '''Returns the peak RSS growth in bytes while func(g) runs'''
+    gc.collect()
+    base = rss()
+    peak = [base]
+    done = threading.Event()
+
+    def sample():
+        while not done.is_set():
+            peak[0] = max(peak[0], rss())
+            time.sleep(SAMPLE_INTERVAL)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        result = func(g)
+        peak[0] = max(peak[0], rss())
+    finally:
+        done.set()
+        sampler.join()
+    del result
+
+    return peak[0] - base
+
+
+random.seed(0)
+rows = []
+print('%-14s%8s%8s%14s%14s%14s'
+      % ('algorithm', 'n', 'm', 'peak KB', 'retained KB', 'rss KB'))
+for n in SIZES:
+    for degree in DEGREES:
+        m = n * degree
+        g = gen_rand_graph(n, m)
+        for name, func in ALGORITHMS:
+            # RSS first, before the traced run warms up the allocator
+            rss_peak = sampled(func, g)
+            peak, retained = traced(func, g)
+            rows.append([name, n, m, peak, retained, rss_peak])
+            print('%-14s%8i%8i%14.1f%14.1f%14.1f'
+                  % (name, n, m, peak / 1024, retained / 1024,
+                     rss_peak / 1024))
+
+print('Outputting to file!')
+
+with open('mem_output.csv', 'w', newline='') as f:
+    writer = csv.writer(f)
+
+    writer.writerow(['algorithm', 'n', 'm', 'peak_bytes', 'retained_bytes',
+                     'rss_peak_bytes'])
+    writer.writerows(rows)
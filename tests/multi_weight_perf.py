@@ -0,0 +1,64 @@
+# Benchmarks one MultiWeightGraph with 3 weight columns versus building
+# a separate graph dict per metric
+#
+# Outputs:
+#     - Build time and traced memory of each representation
+#     - Time of one dij per metric on each
+import time
+import random
+import tracemalloc
+import networkx as nx
+import src.Dijkstra as Dijkstra
+from src.MultiWeightGraph import MultiWeightGraph
+
+N = 50000
+M = 200000
+COLUMNS = ('time', 'distance', 'toll')
+
+
+def gen_edges(n, m):
+    '''Generates random directed edges with one weight per column'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=0)
+    multi = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        multi[u].append((v,) + tuple(random.randint(1, 20) for _ in COLUMNS))
+    return multi
+
+def build_dicts(multi):
+    return {name: {v: [(edge[0], edge[i + 1]) for edge in multi[v]]
+                   for v in multi}
+            for i, name in enumerate(COLUMNS)}
+
+def traced_size(func):
+    '''Returns (traced bytes retained by the result of func(), result)'''
+    tracemalloc.start()
+    result = func()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return size, result
+
+def timed(func):
+    '''Returns time to run func'''
+    t0 = time.perf_counter()
+    func()
+    t1 = time.perf_counter()
+
+    return t1 - t0
+
+
+random.seed(0)
+multi = gen_edges(N, M)
+
+print('----- %i Metrics (n=%i m=%i) -----\n' % (len(COLUMNS), N, M))
+size, dicts = traced_size(lambda: build_dicts(multi))
+print('dict per metric build   --> %f (%.1f MB)'
+      % (timed(lambda: build_dicts(multi)), size / 2**20))
+size, g = traced_size(lambda: MultiWeightGraph(multi, COLUMNS))
+print('MultiWeightGraph build  --> %f (%.1f MB)'
+      % (timed(lambda: MultiWeightGraph(multi, COLUMNS)), size / 2**20))
+print('dij dict per metric     --> %f' % timed(
+    lambda: [Dijkstra.dij(dicts[name], 0) for name in COLUMNS]))
+print('dij weight= per metric  --> %f' % timed(
+    lambda: [Dijkstra.dij(g, 0, weight=name) for name in COLUMNS]))
@@ -0,0 +1,328 @@
+# Performance regression gate for the shortest path engines
+#
+#     python3 -m tests.perf_check [--update] [--baseline FILE]
+#                                 [--history FILE] [--tolerance T]
+#                                 [--exponent-tolerance E] [--repeats N]
+#
+# Runs a fixed, seeded benchmark matrix (every algorithm on random graphs
+# of each size in SIZES with DEGREE edges per node) and compares it with
+# the committed baseline in perf_baseline.json. The input of an algorithm
+# (a unit weight copy, a FrozenGraph, a CSR matrix) is built once per
+# size outside the timing. Each size is timed REPEATS times with the
+# garbage collector off and the best time is kept, other processes and
+# collections can only ever add time. The gate fails, and the command
+# exits with 1, when:
+#     - the geometric mean over the sizes of an algorithm's time ratios
+#       to the baseline is above 1 + its tolerance, so one noisy size
+#       doesn't fail the gate but a slowdown at every size does
+#     - the growth exponent k of an algorithm, fitted to time ~ n^k over
+#       the sizes, is above the baseline's by more than the exponent
+#       tolerance. An accidental extra factor of V (say O(V*E) becoming
+#       O(V^2*E)) adds 1 to k whatever the machine
+# Times are scaled by a calibration run of a fixed pure Python workload so
+# a baseline recorded on one machine can gate runs on another.
+#
+# The tolerance of an algorithm comes from the spread of its repeats:
+# NOISE_FACTOR times the larger of the baseline's and this run's spread
+# (geometric mean over the sizes of median / best - 1). --tolerance
+# (default 25%) is the least it can be. The repeats of one run only show
+# the noise within a process, a run on another day or machine also
+# drifts with the calibration (clock boost, cache sizes, Python build),
+# which the floor covers. The repeats are typically 2-4% apart, so most
+# algorithms get the floor and only noisy ones a wider tolerance.
+#
+# ALGORITHMS gates the dict based Dijkstra and Bellman Ford functions,
+# the shortest_paths() dispatcher, BFS, FrozenGraph queries and Dijkstra
+# on a SciPy CSR matrix. The other engines (Floyd Warshall, distance
+# matrices, hub labels, approximate, external and session searches) have
+# their own *_perf.py benchmarks but no baseline here.
+#
+# Outputs:
+#     - Table of baseline and current times, ratios and exponents
+#     - With --history FILE one labeled row per algorithm and size
+#       appended to FILE, so the history of every run is kept. Only the
+#       baseline is committed, the default perf_history.csv is ignored
+#     - With --update the baseline is rewritten from this run instead
+import gc
+import sys
+import csv
+import json
+import math
+import time
+import heapq
+import random
+import argparse
+import datetime
+import statistics
+import scipy.sparse as sp
+import src.BellmanFord as BF
+import src.BFS as BFS
+import src.Dijkstra as Dijkstra
+import src.ShortestPaths as SP
+from src.FrozenGraph import FrozenGraph
+
+SIZES = [1000, 2000, 4000, 8000]
+DEGREE = 4
+SEED = 2024
+REPEATS = 7
+NOISE_FACTOR = 3
+
+
+def unit_weights(g):
+    '''Copy of g with every weight 1, the input of BFS'''
+    return {v: [(u, 1) for u, w in g[v]] for v in g}
+
+def to_csr(g):
+    '''SciPy CSR matrix of g (parallel edges are summed)'''
+    src = [v for v in g for u, w in g[v]]
+    dst = [u for v in g for u, w in g[v]]
+    weight = [w for v in g for u, w in g[v]]
+    return sp.csr_matrix((weight, (src, dst)), shape=(len(g), len(g)))
+
+def same(g):
+    '''The dict itself, the input of the dict based functions'''
+    return g
+
+# (name, input built once per size, timed query on that input)
+ALGORITHMS = [
+    ('dij', same, lambda g: Dijkstra.dij(g, 0)),
+    ('dij_paths', same, lambda g: Dijkstra.dij_paths(g, 0)),
+    ('construct_paths', same, lambda g: Dijkstra.construct_paths(g, 0)),
+    ('bellman_ford', same, lambda g: BF.bellman_ford(g, 0)),
+    ('bf_paths', same, lambda g: BF.bf_paths(g, 0)),
+    ('bf_construct_paths', same, lambda g: BF.construct_paths(g, 0)),
+    ('shortest_paths', same, lambda g: SP.shortest_paths(g, 0)),
+    ('bfs', unit_weights, lambda g: BFS.bfs(g, 0)),
+    ('frozen_dij', FrozenGraph, lambda fg: fg.dij(0)),
+    ('csr_dij', to_csr, lambda m: Dijkstra.dij(m, 0)),
+]
+
+
+def gen_rand_graph(n, m, seed):
+    '''Generates the same random directed graph with weights in [1, 20]
+    for a given seed, node 0 has an edge to every 10th node so most of
+    the graph is reachable
+    '''
+    rng = random.Random(seed)
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n), rng.randint(1, 20)))
+    for node in range(1, n, 10):
+        g[0].append((node, rng.randint(1, 20)))
+    return g
+
+def calibrate(repeats=REPEATS):
+    '''Returns the best time of a fixed heap and dict workload, the
+    unit the benchmark times are measured in
+    '''
+    times = []
+    for _ in range(repeats):
+        rng = random.Random(SEED)
+        gc.collect()
+        t0 = time.perf_counter()
+        heap = []
+        seen = {}
+        for i in range(100000):
+            heapq.heappush(heap, (rng.random(), i))
+            seen[i % 1000] = i
+        while heap:
+            heapq.heappop(heap)
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+def fit_exponent(sizes, times):
+    '''Least squares slope of log(time) over log(size), the k in
+    time ~ size^k
+    '''
+    xs = [math.log(n) for n in sizes]
+    ys = [math.log(max(t, 1e-12)) for t in times]
+    x_mean = sum(xs) / len(xs)
+    y_mean = sum(ys) / len(ys)
+    num = sum((x - x_mean) * (y - y_mean) for x, y in zip(xs, ys))
+    den = sum((x - x_mean) ** 2 for x in xs)
+    return num / den
+
+def run_matrix(repeats=REPEATS):
+    '''Times every algorithm on every size
+
+    Return:
+        dict with the calibration time and for each algorithm the runs
+        (in calibration units) per size and the fitted exponent
+    '''
+    unit = calibrate()
+    results = {'calibration': unit, 'sizes': SIZES, 'degree': DEGREE,
+               'seed': SEED, 'algorithms': {}}
+
+    graphs = {n: gen_rand_graph(n, DEGREE * n, SEED + n) for n in SIZES}
+    for name, prepare, func in ALGORITHMS:
+        runs = {}
+        for n in SIZES:
+            g = prepare(graphs[n])
+            func(g)  # warm up
+            times = []
+            for _ in range(repeats):
+                # Collections at random points are the main source of noise
+                gc.collect()
+                gc.disable()
+                try:
+                    t0 = time.perf_counter()
+                    func(g)
+                    times.append((time.perf_counter() - t0) / unit)
+                finally:
+                    gc.enable()
+            runs[str(n)] = times
+        best = [min(runs[str(n)]) for n in SIZES]
+        results['algorithms'][name] = {
+            'runs': runs, 'exponent': fit_exponent(SIZES, best)}
+    return results
+
+def noise(runs):
+    '''Relative spread of the repeats of an algorithm, geometric mean
+    over the sizes of median / best - 1
+    '''
+    spreads = [math.log(statistics.median(times) / min(times))
+               for times in runs.values()]
+    return math.exp(sum(spreads) / len(spreads)) - 1 if spreads else 0
+
+def compare(baseline, current, tolerance=0.25, exponent_tolerance=0.3):
+    '''Checks the current results against the baseline
+
+    Arguments:
+        baseline -- results of run_matrix() stored with --update
+        current -- results of run_matrix() for this run
+        tolerance -- least allowed relative slowdown (geometric mean
+                     over the sizes), raised to NOISE_FACTOR times the
+                     spread of an algorithm's repeats if that is larger
+        exponent_tolerance -- allowed increase of a growth exponent
+    Return:
+        (rows, failures) where rows are (algorithm, size, baseline
+        time, current time, ratio, status) and failures a list of
+        messages, the gate passed if it is empty
+    '''
+    rows = []
+    failures = []
+    for name, cur in current['algorithms'].items():
+        base = baseline['algorithms'].get(name)
+        if base is None:
+            rows.append((name, '-', None, None, None, 'new'))
+            continue
+
+        allowed = max(tolerance, NOISE_FACTOR * max(noise(base['runs']),
+                                                    noise(cur['runs'])))
+        log_ratios = []
+        for n, runs in sorted(cur['runs'].items(), key=lambda x: int(x[0])):
+            base_runs = base['runs'].get(n)
+            if base_runs is None:
+                rows.append((name, n, None, min(runs), None, 'new'))
+                continue
+            ratio = min(runs) / min(base_runs)
+            log_ratios.append(math.log(ratio))
+            rows.append((name, n, min(base_runs), min(runs), ratio,
+                         'slower' if ratio > 1 + allowed else 'ok'))
+
+        if log_ratios:
+            slowdown = math.exp(sum(log_ratios) / len(log_ratios))
+            if slowdown > 1 + allowed:
+                failures.append('%s: %.1f%% slower than the baseline '
+                                '(tolerance %.1f%%)'
+                                % (name, 100 * (slowdown - 1), 100 * allowed))
+
+        if cur['exponent'] > base['exponent'] + exponent_tolerance:
+            failures.append('%s: grows as n^%.2f, baseline n^%.2f'
+                            % (name, cur['exponent'], base['exponent']))
+    return rows, failures
+
+def append_history(path, current, rows):
+    '''Appends one labeled row per algorithm and size'''
+    stamp = datetime.datetime.now().isoformat(timespec='seconds')
+    exponents = {name: cur['exponent']
+                 for name, cur in current['algorithms'].items()}
+    try:
+        with open(path) as f:
+            new_file = not f.read(1)
+    except OSError:
+        new_file = True
+
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(['time', 'algorithm', 'n', 'm', 'calibration_s',
+                             'best_units', 'baseline_units', 'ratio',
+                             'exponent', 'status'])
+        for name, n, base_time, cur_time, ratio, status in rows:
+            if n == '-':
+                continue
+            writer.writerow([stamp, name, n, DEGREE * int(n),
+                             '%f' % current['calibration'],
+                             '%f' % cur_time,
+                             '' if base_time is None else '%f' % base_time,
+                             '' if ratio is None else '%.3f' % ratio,
+                             '%.3f' % exponents[name], status])
+
+def main(argv=None):
+    '''Command line entry point, returns the exit status'''
+    parser = argparse.ArgumentParser(
+        prog='python3 -m tests.perf_check',
+        description='Fails when the engines are slower than the baseline')
+    parser.add_argument('--baseline', default='perf_baseline.json')
+    parser.add_argument('--history', default=None,
+                        help='CSV file to append the rows of this run to')
+    parser.add_argument('--update', action='store_true',
+                        help='write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='least allowed relative slowdown, raised for '
+                             'noisy algorithms (default 0.25)')
+    parser.add_argument('--exponent-tolerance', type=float, default=0.3,
+                        help='allowed growth exponent increase (default 0.3)')
+    parser.add_argument('--repeats', type=int, default=REPEATS)
+    args = parser.parse_args(argv)
+
+    current = run_matrix(args.repeats)
+
+    if args.update:
+        with open(args.baseline, 'w') as f:
+            json.dump(current, f, indent=1)
+        for name, cur in current['algorithms'].items():
+            print('%-20s --> n^%.2f' % (name, cur['exponent']))
+        print('\nBaseline written to %s' % args.baseline)
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except (OSError, ValueError) as e:
+        sys.stderr.write('error: no usable baseline (%s), run with --update\n'
+                         % e)
+        return 2
+
+    rows, failures = compare(baseline, current, args.tolerance,
+                             args.exponent_tolerance)
+    if args.history:
+        append_history(args.history, current, rows)
+
+    print('%-20s %6s %12s %12s %7s  %s'
+          % ('algorithm', 'n', 'baseline', 'current', 'ratio', 'status'))
+    for name, n, base_time, cur_time, ratio, status in rows:
+        print('%-20s %6s %12s %12s %7s  %s' % (
+            name, n,
+            '-' if base_time is None else '%.4f' % base_time,
+            '-' if cur_time is None else '%.4f' % cur_time,
+            '-' if ratio is None else '%.2f' % ratio, status))
+    print()
+    for name, cur in current['algorithms'].items():
+        base = baseline['algorithms'].get(name)
+        print('%-20s --> n^%.2f (baseline %s)' % (
+            name, cur['exponent'],
+            '-' if base is None else 'n^%.2f' % base['exponent']))
+
+    if failures:
+        print('\nPerformance gate FAILED:')
+        for failure in failures:
+            print('    ' + failure)
+        return 1
+    print('\nPerformance gate passed')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
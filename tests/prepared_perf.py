@@ -0,0 +1,58 @@
+# Benchmarks many small graph queries on a FrozenGraph (with and without
+# thread local workspaces) versus calling the engines on the graph dict
+# every time
+#
+# Outputs:
+#     - Queries per second of each engine and FrozenGraph method
+import time
+import random
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+from src.FrozenGraph import FrozenGraph
+
+SIZES = [12, 50, 200]
+QUERIES = 20000
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with random weights'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[random.randrange(n)].append((random.randrange(n),
+                                       random.randint(1, 20)))
+    return g
+
+def qps(func, queries):
+    '''Returns queries per second of func over queries'''
+    t0 = time.perf_counter()
+    for s, t in queries:
+        try:
+            func(s, t)
+        except (Dijkstra.NoPathError, BF.NoPathError):
+            pass
+    t1 = time.perf_counter()
+
+    return len(queries) / (t1 - t0)
+
+
+random.seed(0)
+for n in SIZES:
+    g = gen_rand_graph(n, 3 * n)
+    fg = FrozenGraph(g)
+    pg = FrozenGraph(g, threads=False)
+    queries = [(random.randrange(n), random.randrange(n))
+               for _ in range(QUERIES)]
+
+    print('----- %i Queries (n=%i m=%i) -----\n' % (QUERIES, n, 3 * n))
+    print('dij                     --> %.0f q/s'
+          % qps(lambda s, t: Dijkstra.dij(g, s, t), queries))
+    print('FrozenGraph.dij         --> %.0f q/s' % qps(fg.dij, queries))
+    print('threads=False .dij      --> %.0f q/s' % qps(pg.dij, queries))
+    print('bellman_ford            --> %.0f q/s'
+          % qps(lambda s, t: BF.bellman_ford(g, s, t), queries))
+    print('threads=False .bf       --> %.0f q/s'
+          % qps(pg.bellman_ford, queries))
+    print('bf_paths                --> %.0f q/s'
+          % qps(lambda s, t: BF.bf_paths(g, s, t), queries))
+    print('threads=False .bf_paths --> %.0f q/s\n'
+          % qps(pg.bf_paths, queries))
@@ -0,0 +1,85 @@
+# Benchmarks searches on graphs with random node ids before and after
+# renumbering the nodes with src.Reorder
+#
+# Graphs:
+#     - 1000x1000 grid (10^6 nodes) with shuffled ids, like road networks
+#       whose ids don't follow the geography
+#     - random graph with 10^6 nodes and 4 * 10^6 edges (Dijkstra) and
+#       10^5 nodes (Bellman Ford)
+#
+# Outputs:
+#     - Time to renumber with each method
+#     - Time of a full dij / bellman_ford from the same source on the
+#       shuffled graph and on each reordered graph
+import gc
+import time
+import random
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+from src.Reorder import ReorderedGraph, METHODS
+
+SIDE = 1000
+RANDOM_NODES = 10 ** 6
+BF_NODES = 10 ** 5
+
+
+def shuffled_grid(side):
+    '''Generates a 4 connected grid with random weights in [1, 9], the
+    node ids and the key order are shuffled
+    '''
+    n = side * side
+    label = list(range(n))
+    random.shuffle(label)
+    g = {}
+    for i in random.sample(range(n), n):
+        r, c = divmod(i, side)
+        edges = []
+        for r2, c2 in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if 0 <= r2 < side and 0 <= c2 < side:
+                edges.append((label[r2 * side + c2], random.randint(1, 9)))
+        g[label[i]] = edges
+    return g
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with weights in [1, 20]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[random.randrange(n)].append((random.randrange(n),
+                                       random.randint(1, 20)))
+    return g
+
+def timed(func, *args):
+    '''Returns the time of one call'''
+    t0 = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - t0
+
+def compare(name, g, search, engine):
+    '''Times search on the graph and on each reordering of it'''
+    print('----- %s (n=%i) -----\n' % (name, len(g)))
+    s = next(iter(g))
+    print('%-8s shuffled ids  --> %f' % (name.split()[0], timed(engine, g, s)))
+    for method in METHODS:
+        t0 = time.perf_counter()
+        rg = ReorderedGraph(g, method)
+        build = time.perf_counter() - t0
+        print('%-8s %-12s  --> %f (renumbering %f)'
+              % (name.split()[0], method, timed(search, rg, s), build))
+        del rg
+        gc.collect()
+    print()
+
+
+random.seed(0)
+g = shuffled_grid(SIDE)
+compare('dij grid', g, ReorderedGraph.dij, Dijkstra.dij)
+del g
+gc.collect()
+
+g = gen_rand_graph(RANDOM_NODES, 4 * RANDOM_NODES)
+compare('dij random', g, ReorderedGraph.dij, Dijkstra.dij)
+del g
+gc.collect()
+
+g = gen_rand_graph(BF_NODES, 4 * BF_NODES)
+compare('bf random', g, ReorderedGraph.bellman_ford, BF.bellman_ford)
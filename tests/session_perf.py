@@ -0,0 +1,50 @@
+# Benchmarks a DijkstraSession answering k targets from one source versus
+# calling dij(g, s, t) for each of them
+#
+# Outputs:
+#     - Time of one full dij(g, s), the bound for any number of queries
+#     - For each k, total time of k dij(g, s, t) calls and of k queries to
+#       one session, plus the nodes the session settled
+import time
+import random
+import src.Dijkstra as Dijkstra
+from src.SearchSession import DijkstraSession
+
+N = 100000
+DEGREE = 4
+KS = [1, 10, 100, 1000]
+DIJ_MAX_K = 100
+
+
+def gen_rand_graph(n, m):
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[random.randrange(n)].append((random.randrange(n),
+                                       random.randint(1, 20)))
+    # Cycle through every node so every target is reachable
+    for node in range(n):
+        g[node].append(((node + 1) % n, 20))
+    return g
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - t0
+
+
+random.seed(0)
+g = gen_rand_graph(N, DEGREE * N)
+print('----- Random graph n=%i m=%i -----\n' % (N, (DEGREE + 1) * N))
+print('full dij(g, s)              --> %f' % timed(Dijkstra.dij, g, 0))
+
+for k in KS:
+    targets = random.sample(list(g), k)
+    print('\nk = %i' % k)
+    if k <= DIJ_MAX_K:
+        t = timed(lambda: [Dijkstra.dij(g, 0, t) for t in targets])
+        print('dij(g, s, t) each           --> %f' % t)
+
+    session = DijkstraSession(g, 0)
+    t = timed(lambda: [session.distance(t) for t in targets])
+    print('DijkstraSession             --> %f (%i nodes settled)'
+          % (t, len(session.settled)))
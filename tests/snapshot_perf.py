@@ -0,0 +1,70 @@
+# Benchmarks a warm restart from a snapshot versus recomputing the
+# reachability index and the shortest path trees of hot sources
+#
+# Outputs:
+#     - Time to build, save and load (plus first use) the structures
+#     - Time to load with a fingerprint computed before instead of
+#       hashing the graph
+#     - Size of the snapshot file
+import os
+import time
+import random
+import tempfile
+import networkx as nx
+import src.Dijkstra as Dijkstra
+from src.Reachability import ReachabilityIndex
+from src.Snapshot import save_snapshot, load_snapshot, graph_fingerprint
+
+N = 100000
+M = 300000
+HOT_SOURCES = 20
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with random weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=0)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, random.randint(1, 20)))
+    return g
+
+def timed(func):
+    '''Returns (time to run func, result)'''
+    t0 = time.perf_counter()
+    result = func()
+    t1 = time.perf_counter()
+
+    return t1 - t0, result
+
+def build(g, sources):
+    reach = ReachabilityIndex(g)
+    trees = {}
+    for s in sources:
+        index, nodes, dist, prev = Dijkstra.construct_arrays(g, s)
+        trees[s] = (dist, prev)
+    return reach, trees
+
+
+random.seed(0)
+g = gen_rand_graph(N, M)
+sources = random.sample(range(N), HOT_SOURCES)
+path = os.path.join(tempfile.mkdtemp(), 'graph.snap')
+
+print('----- Snapshot (n=%i m=%i, %i trees) -----\n' % (N, M, HOT_SOURCES))
+elapsed, (reach, trees) = timed(lambda: build(g, sources))
+print('recompute               --> %f' % elapsed)
+elapsed, _ = timed(lambda: save_snapshot(path, g, reach, trees))
+print('save                    --> %f' % elapsed)
+elapsed, snap = timed(lambda: load_snapshot(path, g))
+print('load                    --> %f' % elapsed)
+elapsed, used = timed(lambda: (snap.reach, [snap.tree(s) for s in sources]))
+print('first use               --> %f' % elapsed)
+del used
+snap.close()
+elapsed, fingerprint = timed(lambda: graph_fingerprint(g))
+print('fingerprint             --> %f' % elapsed)
+elapsed, snap = timed(lambda: load_snapshot(path, g, fingerprint))
+print('load (fingerprint given)--> %f' % elapsed)
+snap.close()
+print('file size (MB)          --> %.1f' % (os.path.getsize(path) / 2**20))
@@ -0,0 +1,129 @@
+import math
+import unittest
+import random
+import src.Dijkstra as Dijkstra
+from src.Approximate import ApproximateGraph, approx_dij
+
+EPSILONS = [0.01, 0.1, 0.5, 2]
+SEED = 47
+
+
+def gen_rand_graph(rng, n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                    rng.uniform(start, end)))
+    return g
+
+def gen_grid(rng, side, start=1, end=20):
+    '''Generates a side x side grid with (x, y) nodes and random weights
+    in [start, end] on the edges in both directions
+    '''
+    g = {(x, y): [] for x in range(side) for y in range(side)}
+    for x, y in g:
+        for u in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if u in g:
+                g[(x, y)].append((u, rng.randint(start, end)))
+    return g
+
+def path_length(g, path):
+    '''Sums the smallest weights along a path'''
+    return sum(min(w for x, w in g[v] if x == u)
+               for v, u in zip(path, path[1:]))
+
+
+class TestApproximate(unittest.TestCase):
+    def setUp(self):
+        # Seeded so a failing graph or query can be reproduced
+        self.rng = random.Random(SEED)
+
+    def assertWithin(self, approx, exact, epsilon):
+        self.assertGreaterEqual(approx, exact - 1e-9)
+        self.assertLessEqual(approx, (1 + epsilon) * exact + 1e-9)
+
+    def test_rounded_all(self):
+        '''Tests every distance is within 1 + epsilon'''
+        for _ in range(10):
+            g = gen_rand_graph(self.rng, 200, 800)
+            exact = Dijkstra.dij(g, 0)
+            for epsilon in EPSILONS:
+                approx = ApproximateGraph(g, epsilon).dij(0)
+                self.assertEqual(list(approx), list(g))
+                for v in g:
+                    if exact[v] == math.inf:
+                        self.assertEqual(approx[v], math.inf)
+                    else:
+                        self.assertWithin(approx[v], exact[v], epsilon)
+
+    def test_rounded_target(self):
+        '''Tests target queries are bracketed by the lower bound'''
+        for _ in range(10):
+            g = gen_rand_graph(self.rng, 200, 800)
+            exact = Dijkstra.dij(g, 0)
+            reachable = [v for v in g if exact[v] < math.inf]
+            for epsilon in EPSILONS:
+                graph = ApproximateGraph(g, epsilon)
+                for t in self.rng.sample(reachable, min(10, len(reachable))):
+                    distance, lower = graph.dij(0, t)
+                    self.assertWithin(distance, exact[t], epsilon)
+                    self.assertLessEqual(lower, exact[t] + 1e-9)
+
+    def test_weighted_astar(self):
+        '''Tests weighted A* with a manhattan heuristic'''
+        g = gen_grid(self.rng, 30)
+        for epsilon in EPSILONS:
+            graph = ApproximateGraph(g, epsilon)
+            for _ in range(20):
+                s = self.rng.choice(list(g))
+                t = self.rng.choice(list(g))
+                h = lambda v: abs(v[0] - t[0]) + abs(v[1] - t[1])
+                exact = Dijkstra.dij(g, s, t)
+                distance, lower = graph.dij(s, t, heuristic=h)
+                self.assertWithin(distance, exact, epsilon)
+                self.assertLessEqual(lower, exact + 1e-9)
+
+                path = graph.dij_paths(s, t, heuristic=h)
+                self.assertEqual((path[0], path[-1]), (s, t))
+                self.assertAlmostEqual(path_length(g, path), distance)
+
+    def test_paths(self):
+        '''Tests the paths are real and as long as the distances'''
+        g = gen_rand_graph(self.rng, 200, 800)
+        graph = ApproximateGraph(g, 0.5)
+        distances = graph.dij(0)
+        paths = graph.dij_paths(0)
+        for v, path in paths.items():
+            if distances[v] == math.inf:
+                self.assertEqual(path, [])
+            else:
+                self.assertEqual((path[0], path[-1]), (0, v))
+                self.assertAlmostEqual(path_length(g, path), distances[v])
+
+    def test_zero_weights(self):
+        '''Tests zero weight edges and a graph with only zero weights'''
+        g = {'a': [('b', 0), ('c', 5)], 'b': [('c', 0)], 'c': [('d', 2)],
+             'd': []}
+        self.assertEqual(approx_dij(g, 'a'),
+                         {'a': 0, 'b': 0, 'c': 0, 'd': 2})
+        self.assertEqual(approx_dij({0: [(1, 0)], 1: []}, 0, 1), (0, 0))
+
+    def test_errors(self):
+        '''Tests invalid input and missing paths'''
+        g = {0: [(1, 1)], 1: [], 2: []}
+        self.assertRaises(TypeError, ApproximateGraph, [(1, 1)])
+        self.assertRaises(ValueError, ApproximateGraph, g, 0)
+        self.assertRaises(ValueError, ApproximateGraph, {0: [(1, -1)], 1: []})
+        self.assertRaises(ValueError, ApproximateGraph, {0: [(1, 1)]})
+        graph = ApproximateGraph(g)
+        self.assertRaises(ValueError, graph.dij, 5)
+        self.assertRaises(ValueError, graph.dij, 0, 5)
+        self.assertRaises(ValueError, graph.dij, 0, heuristic=lambda v: 0)
+        self.assertRaises(Dijkstra.NoPathError, graph.dij, 0, 2)
+        self.assertRaises(Dijkstra.NoPathError, graph.dij, 0, 2,
+                          heuristic=lambda v: 0)
+        self.assertRaises(Dijkstra.NoPathError, graph.dij_paths, 0, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
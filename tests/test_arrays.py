@@ -0,0 +1,83 @@
+import unittest
+import array
+import random
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+
+class TestArrays(unittest.TestCase):
+    def test_dij_arrays(self):
+        '''Tests the typed arrays hold the same distances as the dict'''
+        for _ in range(20):
+            g = gen_rand_graph(40, 120)
+            dist, prev = Dijkstra.dij(g, 0, arrays=True)
+
+            self.assertIsInstance(dist, array.array)
+            self.assertEqual(dist.typecode, 'd')
+            self.assertEqual(prev.typecode, 'q')
+            self.assertDictEqual(dict(enumerate(dist)), Dijkstra.dij(g, 0))
+            for node in g:
+                if prev[node] == -1:
+                    self.assertEqual(dist[node], float('inf'))
+                elif node != 0:
+                    w = min(w for u, w in g[prev[node]] if u == node)
+                    self.assertEqual(dist[prev[node]] + w, dist[node])
+
+    def test_non_int_nodes(self):
+        '''Tests the arrays are indexed by position for other nodes'''
+        g = {'a': [('b', 2)], 'b': [('c', 3)], 'c': [], 'd': []}
+        index, nodes, dist, prev = Dijkstra.construct_arrays(g, 'a')
+
+        self.assertListEqual(list(dist), [0, 2, 5, float('inf')])
+        self.assertListEqual(list(prev), [0, 0, 1, -1])
+        self.assertEqual(nodes[index['c']], 'c')
+        self.assertListEqual(Dijkstra.dij_paths(g, 'a', 'c'), ['a', 'b', 'c'])
+
+    def test_invalid_ids(self):
+        '''Tests negative and out of range ids fail on 0..V-1 graphs
+        instead of wrapping around like a range would
+        '''
+        g = {0: [(1, 1)], 1: [(2, 1)], 2: []}
+        index, nodes = Dijkstra.node_index(g)
+
+        for node in (-1, 3, 1.5, '0', None):
+            self.assertNotIn(node, index)
+            with self.assertRaises(KeyError):
+                index[node]
+        with self.assertRaises(KeyError):
+            Dijkstra.dij(g, -1)
+        with self.assertRaises(KeyError):
+            Dijkstra.dij(g, 0, t=-1)
+        with self.assertRaises(KeyError):
+            Dijkstra.dij_paths(g, 0, t=-1)
+        with self.assertRaises(KeyError):
+            Dijkstra.dij(g, 0, t=3)
+        with self.assertRaises(ValueError):
+            Dijkstra.dij(g, 0, targets=[2, -1])
+        self.assertEqual(Dijkstra.dij(g, 0, t=2), 2)
+
+    def test_bf_arrays(self):
+        '''Tests Bellman Ford arrays with negative weights'''
+        g = {0: [(1, 4), (2, 1)], 1: [(3, -2)], 2: [(1, -1)], 3: [], 4: []}
+        dist, prev = BF.construct_paths(g, 0)
+
+        self.assertListEqual(list(dist), [0, 0, 1, -2, float('Inf')])
+        self.assertListEqual(list(prev), [0, 2, 0, 1, -1])
+        self.assertEqual(BF.bellman_ford(g, 0, arrays=True), dist)
+        self.assertListEqual(BF.bf_paths(g, 0, 3), [0, 2, 1, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import io
+import os
+import json
+import unittest
+import random
+import tempfile
+import networkx as nx
+import src.BatchQuery as BQ
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, low=1, high=20):
+    '''Generates random directed graph and a NetworkX version'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(low, high)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+def path_length(g, path):
+    '''Sums the weights along a path'''
+    weights = {(v, u): w for v in g for u, w in g[v]}
+    return sum(weights[path[i], path[i + 1]] for i in range(len(path) - 1))
+
+
+class TestBatchQuery(unittest.TestCase):
+    def check(self, g, nx_g, queries, results):
+        self.assertEqual([(r['source'], r['target']) for r in results],
+                         queries)
+        for r in results:
+            s, t = r['source'], r['target']
+            if nx.has_path(nx_g, s, t):
+                expected = nx.dijkstra_path_length(nx_g, s, t)
+                self.assertEqual(r['distance'], expected)
+                if 'path' in r:
+                    self.assertEqual(path_length(g, r['path']), expected)
+            else:
+                self.assertIsNone(r['distance'])
+                self.assertEqual(r['error'], 'no path')
+
+    def test_vs_networkx(self):
+        '''Tests each engine that applies and the worker processes'''
+        g, nx_g = gen_rand_graph(60, 150)
+        queries = [(rng.randrange(60), rng.randrange(60))
+                   for _ in range(300)]
+
+        for algorithm in ('auto', 'dijkstra', 'bellman_ford'):
+            results = list(BQ.answer_queries(g, queries, algorithm,
+                                             paths=True, chunk_size=37))
+            self.check(g, nx_g, queries, results)
+
+        results = list(BQ.answer_queries(g, queries, workers=2,
+                                         chunk_size=50))
+        self.check(g, nx_g, queries, results)
+
+        unit, nx_unit = gen_rand_graph(60, 150, 1, 1)
+        results = list(BQ.answer_queries(unit, queries, 'bfs', paths=True))
+        self.check(unit, nx_unit, queries, results)
+
+    def test_errors(self):
+        '''Tests invalid nodes and engines that can't be used'''
+        g = {0: [(1, 2)], 1: [(0, 3)], 2: []}
+        results = list(BQ.answer_queries(g, [(0, 1), (0, 9), (0, 2)]))
+        self.assertEqual(results[0]['distance'], 2)
+        self.assertEqual(results[1]['error'], 'invalid node')
+        self.assertEqual(results[2]['error'], 'no path')
+
+        self.assertRaises(ValueError, list,
+                          BQ.answer_queries(g, [(0, 1)], 'dag'))
+        self.assertRaises(ValueError, list,
+                          BQ.answer_queries(g, [(0, 1)], 'nope'))
+
+        neg = {0: [(1, 1)], 1: [(0, -2)], 2: []}
+        results = list(BQ.answer_queries(neg, [(0, 1), (2, 2)]))
+        self.assertEqual(results[0]['error'], 'negative cycle')
+        self.assertEqual(results[1]['distance'], 0)
+
+    def test_main(self):
+        '''Tests the command line end to end with files and both formats'''
+        tmp = tempfile.mkdtemp()
+        graph_path = os.path.join(tmp, 'g.txt')
+        with open(graph_path, 'w') as f:
+            f.write('# from to weight\na b 1\nb c 2.5\na c 5\n')
+        json_path = os.path.join(tmp, 'g.json')
+        with open(json_path, 'w') as f:
+            json.dump({'a': [['b', 1]], 'b': [['c', 2.5]], 'c': []}, f)
+        query_path = os.path.join(tmp, 'q.txt')
+        with open(query_path, 'w') as f:
+            f.write('a c\nc,a\n')
+
+        for path in (graph_path, json_path):
+            out = io.StringIO()
+            stdout = BQ.sys.stdout
+            BQ.sys.stdout = out
+            try:
+                status = BQ.main([path, query_path, '--paths'])
+            finally:
+                BQ.sys.stdout = stdout
+            self.assertEqual(status, 0)
+            lines = [json.loads(line) for line in out.getvalue().splitlines()]
+            self.assertEqual(lines[0]['distance'], 3.5)
+            self.assertEqual(lines[0]['path'], ['a', 'b', 'c'])
+            self.assertEqual(lines[1]['error'], 'no path')
+
+        # Queries from stdin, which is left open for the caller
+        out = io.StringIO()
+        stdin, stdout = BQ.sys.stdin, BQ.sys.stdout
+        BQ.sys.stdin, BQ.sys.stdout = io.StringIO('a b\n'), out
+        try:
+            status = BQ.main([graph_path])
+            self.assertFalse(BQ.sys.stdin.closed)
+        finally:
+            BQ.sys.stdin, BQ.sys.stdout = stdin, stdout
+        self.assertEqual(status, 0)
+        self.assertEqual(json.loads(out.getvalue())['distance'], 1)
+
+        out = io.StringIO()
+        BQ.write_results(
+            BQ.answer_queries(BQ.load_graph(graph_path), [('a', 'c')],
+                              paths=True), out, 'csv')
+        self.assertEqual(out.getvalue(),
+                         'source,target,distance,path,error\n'
+                         'a,c,3.5,a b c,\n')
+
+    def test_csv_errors(self):
+        '''Tests CSV rows keep their columns when successful and failed
+        queries are mixed, in either order
+        '''
+        g = {0: [(1, 2)], 1: [], 2: []}
+        for queries, rows in (
+                ([(0, 1), (2, 0), (0, 9)],
+                 ['0,1,2,', '2,0,,no path', '0,9,,invalid node']),
+                ([(2, 0), (0, 1)], ['2,0,,no path', '0,1,2,'])):
+            out = io.StringIO()
+            BQ.write_results(BQ.answer_queries(g, queries), out, 'csv')
+            self.assertEqual(out.getvalue().splitlines(),
+                             ['source,target,distance,error'] + rows)
+
+        out = io.StringIO()
+        BQ.write_results(BQ.answer_queries(g, [(2, 0), (0, 1)], paths=True),
+                         out, 'csv')
+        self.assertEqual(out.getvalue().splitlines(),
+                         ['source,target,distance,path,error',
+                          '2,0,,,no path', '0,1,2,0 1,'])
+
+    def test_bad_files(self):
+        '''Tests malformed lines and missing files exit with status 2'''
+        self.assertRaises(ValueError, list, BQ.read_queries(['0 1 2']))
+        self.assertEqual(BQ.main([os.path.join(tempfile.mkdtemp(), 'x')]), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
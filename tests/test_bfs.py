@@ -0,0 +1,107 @@
+import unittest
+import random
+import networkx as nx
+import src.BFS as BFS
+import src.Dijkstra as Dijkstra
+import src.ShortestPaths as SP
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, weights):
+    '''Generates random directed graph with weights picked from weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, rng.choice(weights)))
+    return g
+
+def path_weight(g, path):
+    '''Returns the total weight of a path'''
+    return sum(dict(g[v])[u] for v, u in zip(path, path[1:]))
+
+
+class TestBFS(unittest.TestCase):
+    def test_bfs_vs_dij(self):
+        '''Tests BFS distances and paths match Dijkstra on unit weights'''
+        for w in (1, 3):
+            for _ in range(50):
+                g = gen_rand_graph(40, 80, [w])
+                dists = Dijkstra.dij(g, 0)
+
+                self.assertDictEqual(BFS.bfs(g, 0), dists)
+                for node, path in BFS.bfs_paths(g, 0).items():
+                    if path:
+                        self.assertEqual(path_weight(g, path), dists[node])
+                    else:
+                        self.assertEqual(dists[node], float('inf'))
+
+    def test_zero_one_bfs_vs_dij(self):
+        '''Tests 0-1 BFS distances and paths match Dijkstra'''
+        for _ in range(100):
+            g = gen_rand_graph(40, 80, [0, 1])
+            dists = Dijkstra.dij(g, 0)
+
+            self.assertDictEqual(BFS.zero_one_bfs(g, 0), dists)
+            for node, path in BFS.zero_one_bfs_paths(g, 0).items():
+                if path:
+                    self.assertEqual(path_weight(g, path), dists[node])
+                else:
+                    self.assertEqual(dists[node], float('inf'))
+
+    def test_target(self):
+        '''Tests the target distances, paths and NoPathError'''
+        g = {0: [(1, 1), (2, 0)], 1: [(3, 1)], 2: [(1, 0)], 3: [], 4: []}
+
+        self.assertEqual(BFS.zero_one_bfs(g, 0, t=3), 1)
+        self.assertListEqual(BFS.zero_one_bfs_paths(g, 0, t=3), [0, 2, 1, 3])
+        with self.assertRaises(Dijkstra.NoPathError):
+            BFS.zero_one_bfs(g, 0, t=4)
+        with self.assertRaises(Dijkstra.NoPathError):
+            BFS.bfs_paths({0: [(1, 2)], 1: [], 2: []}, 0, t=2)
+
+    def test_invalid_weights(self):
+        '''Tests ValueError is raised for weights the engine can't use'''
+        with self.assertRaises(ValueError):
+            BFS.bfs({0: [(1, 1), (2, 2)], 1: [], 2: []}, 0)
+        with self.assertRaises(ValueError):
+            BFS.zero_one_bfs({0: [(1, 1), (2, 2)], 1: [], 2: []}, 0)
+        with self.assertRaises(ValueError):
+            BFS.bfs({0: [(1, -1)], 1: [(0, -1)]}, 0)
+
+    def test_early_exit(self):
+        '''Tests a target stops the search before the rest of the graph'''
+        scanned = []
+        class Recording(dict):
+            def __getitem__(self, v):
+                scanned.append(v)
+                return dict.__getitem__(self, v)
+
+        chain = Recording({v: [(v + 1, 1)] for v in range(99)})
+        chain[99] = []
+        self.assertEqual(BFS.bfs(chain, 0, t=3), 3)
+        self.assertListEqual(scanned, [0, 1, 2])
+
+        del scanned[:]
+        self.assertListEqual(BFS.zero_one_bfs_paths(chain, 0, t=2), [0, 1, 2])
+        self.assertListEqual(scanned, [0, 1])
+
+        distances, prev = BFS.construct_paths(chain, 0, targets=[5, 2])
+        self.assertEqual((distances[2], distances[5]), (2, 5))
+        self.assertEqual(distances[7], float('inf'))
+
+    def test_dispatch(self):
+        '''Tests shortest_paths() routes unit and {0, 1} weights to BFS'''
+        unit = {0: [(1, 2)], 1: [(0, 2), (2, 2)], 2: []}
+        binary = {0: [(1, 0)], 1: [(0, 1), (2, 1)], 2: []}
+
+        self.assertEqual(SP.shortest_paths(unit, 0, 2, return_engine=True),
+                         (4, 'bfs'))
+        self.assertEqual(SP.shortest_paths(binary, 0, 2, return_engine=True),
+                         (1, 'zero_one_bfs'))
+
+
+if __name__ == '__main__':
+    unittest.main()
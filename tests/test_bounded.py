@@ -0,0 +1,86 @@
+import unittest
+import random
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+def hop_distances(g, src, k):
+    '''Shortest distances using at most k edges, one full copy per hop'''
+    d = {src: 0}
+    for _ in range(k):
+        new_d = dict(d)
+        for v, dist_v in d.items():
+            for u, w in g[v]:
+                if dist_v + w < new_d.get(u, float('Inf')):
+                    new_d[u] = dist_v + w
+        d = new_d
+    return d
+
+
+class TestBounded(unittest.TestCase):
+    def test_max_distance(self):
+        '''Tests dij only returns the nodes within the radius'''
+        for _ in range(100):
+            g = gen_rand_graph(30, 90)
+            radius = rng.randint(0, 40)
+            dists = Dijkstra.dij(g, 0)
+            bounded = Dijkstra.dij(g, 0, max_distance=radius)
+
+            self.assertDictEqual(bounded, {node: d for node, d in dists.items()
+                                           if d <= radius})
+            paths = Dijkstra.dij_paths(g, 0, max_distance=radius)
+            self.assertSetEqual(set(paths), set(bounded))
+
+    def test_max_distance_target(self):
+        '''Tests NoPathError for targets outside of the radius'''
+        g = {0: [(1, 5)], 1: [(2, 5)], 2: []}
+
+        self.assertEqual(Dijkstra.dij(g, 0, t=2, max_distance=10), 10)
+        self.assertListEqual(Dijkstra.dij_paths(g, 0, t=1, max_distance=5),
+                             [0, 1])
+        with self.assertRaises(Dijkstra.NoPathError):
+            Dijkstra.dij(g, 0, t=2, max_distance=9)
+        with self.assertRaises(Dijkstra.NoPathError):
+            Dijkstra.dij_paths(g, 0, t=2, max_distance=9)
+
+    def test_max_hops(self):
+        '''Tests the k hop distances and paths with negative weights'''
+        for _ in range(100):
+            g = gen_rand_graph(15, 40, start=-5)
+            k = rng.randint(0, 8)
+            dists = BF.bellman_ford(g, 0, max_hops=k)
+
+            self.assertDictEqual(dists, hop_distances(g, 0, k))
+            for node, path in BF.bf_paths(g, 0, max_hops=k).items():
+                if not path:
+                    self.assertNotIn(node, dists)
+                    continue
+                self.assertLessEqual(len(path) - 1, k)
+                cost = sum(min(w for x, w in g[v] if x == u)
+                           for v, u in zip(path, path[1:]))
+                self.assertEqual(cost, dists[node])
+
+    def test_max_hops_target(self):
+        '''Tests a shorter path with more hops is not used'''
+        g = {0: [(1, 1), (3, 10)], 1: [(2, 1)], 2: [(3, 1)], 3: []}
+
+        self.assertEqual(BF.bellman_ford(g, 0, target=3, max_hops=2), 10)
+        self.assertEqual(BF.bellman_ford(g, 0, target=3, max_hops=3), 3)
+        self.assertListEqual(BF.bf_paths(g, 0, target=3, max_hops=2), [0, 3])
+        with self.assertRaises(BF.NoPathError):
+            BF.bellman_ford(g, 0, target=2, max_hops=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import random
+import numpy as np
+import networkx as nx
+from src.DistanceMatrix import distance_matrix
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph and a NetworkX version'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(0, 20)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+def nx_matrix(nx_g, sources, targets):
+    '''Distance matrix from NetworkX's Dijkstra'''
+    matrix = np.full((len(sources), len(targets)), np.inf)
+    for i, s in enumerate(sources):
+        dists = nx.single_source_dijkstra_path_length(nx_g, s)
+        for j, t in enumerate(targets):
+            matrix[i, j] = dists.get(t, np.inf)
+    return matrix
+
+
+class TestDistanceMatrix(unittest.TestCase):
+    def test_vs_networkx(self):
+        '''Tests both methods against NetworkX on random graphs'''
+        for _ in range(20):
+            g, nx_g = gen_rand_graph(80, 200)
+            sources = rng.sample(range(80), 8)
+            targets = rng.sample(range(80), 10)
+            expected = nx_matrix(nx_g, sources, targets)
+
+            np.testing.assert_array_equal(
+                distance_matrix(g, sources, targets), expected)
+            for limit in (1, 5, 1000):
+                np.testing.assert_array_equal(
+                    distance_matrix(g, sources, targets, method='buckets',
+                                    bucket_limit=limit), expected)
+
+    def test_workers(self):
+        '''Tests the parallel results are in source order'''
+        g, nx_g = gen_rand_graph(60, 180)
+        sources = list(range(0, 60, 3))
+        targets = list(range(1, 60, 7))
+        expected = nx_matrix(nx_g, sources, targets)
+
+        np.testing.assert_array_equal(
+            distance_matrix(g, sources, targets, workers=3), expected)
+        np.testing.assert_array_equal(
+            distance_matrix(g, sources, targets, method='buckets', workers=2),
+            expected)
+
+    def test_invalid(self):
+        '''Tests ValueError for bad nodes and methods'''
+        g = {0: [(1, 1)], 1: []}
+
+        self.assertEqual(distance_matrix(g, [0], []).shape, (1, 0))
+        with self.assertRaises(ValueError):
+            distance_matrix(g, [0], [2])
+        with self.assertRaises(ValueError):
+            distance_matrix(g, [0], [1], method='floyd')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,143 @@
+import os
+import math
+import struct
+import unittest
+import random
+import tempfile
+import numpy as np
+import scipy.sparse as sp
+import src.BellmanFord as BF
+from src.ExternalBellmanFord import (EdgeFile, EdgeFileWriter, EdgeFileError,
+                                     write_edge_file, external_bellman_ford)
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=-2, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+
+class TestExternalBellmanFord(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'edges.bin')
+
+    def test_distances(self):
+        '''Tests distances, previous nodes and negative cycles against
+        bellman_ford for many chunk sizes
+        '''
+        for _ in range(100):
+            n = rng.randint(1, 40)
+            g = gen_rand_graph(n, rng.randint(0, 3 * n))
+            write_edge_file(self.path, g, chunk_edges=rng.randint(1, 10))
+            try:
+                expected = BF.bellman_ford(g, 0)
+            except BF.NegativeCycleError:
+                self.assertRaises(BF.NegativeCycleError,
+                                  external_bellman_ford, self.path, 0)
+                continue
+
+            dist, prev = external_bellman_ford(self.path, 0)
+            for v in g:
+                self.assertEqual(dist[v], expected.get(v, math.inf))
+                if v != 0 and prev[v] != -1:
+                    u = prev[v]
+                    self.assertTrue(any(x == v and dist[u] + w == dist[v]
+                                        for x, w in g[u]))
+            self.assertEqual(prev[0], 0)
+
+    def test_target(self):
+        '''Tests the distance to a target and missing paths'''
+        g = {0: [(1, 4), (2, 1)], 1: [(3, -2)], 2: [(1, 1)], 3: [], 4: []}
+        write_edge_file(self.path, g)
+        self.assertEqual(external_bellman_ford(self.path, 0, 3), 0)
+        self.assertRaises(BF.NoPathError, external_bellman_ford,
+                          self.path, 0, 4)
+        self.assertRaises(ValueError, external_bellman_ford, self.path, 5)
+        self.assertRaises(ValueError, external_bellman_ford, self.path, 0, 9)
+
+    def test_skipped_chunks(self):
+        '''Tests chunks whose sources didn't change aren't read'''
+        n = 1000
+        g = {v: [(v + 1, 1)] if v + 1 < n else [] for v in range(n)}
+        write_edge_file(self.path, g, chunk_edges=10)
+        stats = {}
+        dist, prev = external_bellman_ford(self.path, 0, stats=stats)
+        self.assertEqual(dist.tolist(), list(range(n)))
+        # Improvements flow forward through the chunks within one pass
+        self.assertEqual(stats['passes'], 1)
+        self.assertEqual(stats['chunks_read'], 100)
+
+        g = {v: [(v - 1, 1)] if v else [] for v in range(n)}
+        write_edge_file(self.path, g, chunk_edges=10)
+        stats = {}
+        dist, prev = external_bellman_ford(self.path, n - 1, stats=stats)
+        self.assertEqual(dist.tolist(), list(range(n))[::-1])
+        # Each chunk is solved in memory, then each pass only reads the
+        # one chunk of the node that changed
+        self.assertEqual(stats['passes'], 100)
+        self.assertEqual(stats['chunks_read'], 100)
+        self.assertEqual(stats['chunks_skipped'], 100 * 99)
+
+    def test_inputs(self):
+        '''Tests CSR matrices, edge arrays and the batch writer give the
+        same file
+        '''
+        g = gen_rand_graph(50, 200, 1, 20)
+        src = [v for v in g for u, w in g[v]]
+        dst = [u for v in g for u, w in g[v]]
+        weight = [w for v in g for u, w in g[v]]
+        write_edge_file(self.path, g)
+        expected = EdgeFile(self.path).records.copy()
+
+        write_edge_file(self.path, (np.array(src), np.array(dst),
+                                    np.array(weight)))
+        self.assertEqual(EdgeFile(self.path).records.tolist(),
+                         expected.tolist())
+
+        with EdgeFileWriter(self.path, 50, chunk_edges=7) as writer:
+            for a in range(0, len(src), 13):
+                writer.add(src[a:a + 13], dst[a:a + 13], weight[a:a + 13])
+        edges = EdgeFile(self.path)
+        self.assertEqual(edges.records.tolist(), expected.tolist())
+        self.assertEqual(edges.num_chunks, -(-len(src) // 7))
+
+        matrix = sp.csr_matrix((np.ones(3), ([0, 0, 2], [1, 2, 1])),
+                               shape=(3, 3))
+        write_edge_file(self.path, matrix)
+        self.assertEqual(external_bellman_ford(self.path, 0)[0].tolist(),
+                         [0, 1, 1])
+
+    def test_errors(self):
+        '''Tests invalid edges and files'''
+        writer = EdgeFileWriter(self.path, 3)
+        self.assertRaises(ValueError, writer.add, [1, 0], [0, 0], [1, 1])
+        self.assertRaises(ValueError, writer.add, [0], [3], [1])
+        self.assertRaises(ValueError, writer.add, [0, 1], [0], [1])
+        writer.add([2], [0], [1])
+        self.assertRaises(ValueError, writer.add, [1], [0], [1])
+        writer.close()
+        self.assertRaises(ValueError, write_edge_file, self.path,
+                          {'a': [], 'b': []})
+
+        with open(self.path, 'wb') as f:
+            f.write(b'not an edge file' * 300)
+        self.assertRaises(EdgeFileError, EdgeFile, self.path)
+        with open(self.path, 'wb') as f:
+            f.write(b'')
+        self.assertRaises(EdgeFileError, EdgeFile, self.path)
+
+        write_edge_file(self.path, {0: [(1, 1)], 1: []})
+        with open(self.path, 'r+b') as f:
+            f.seek(8)
+            f.write(struct.pack('<I', 99))
+        self.assertRaises(EdgeFileError, EdgeFile, self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
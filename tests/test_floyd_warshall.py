@@ -0,0 +1,96 @@
+import unittest
+import random
+import numpy as np
+import networkx as nx
+from src.FloydWarshall import floyd_warshall, fw_path
+from src.BellmanFord import NegativeCycleError, NoPathError
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, low=0, high=20):
+    '''Generates random directed graph and a NetworkX version'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(low, high)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+def nx_matrix(nx_g, n):
+    '''All pairs distance matrix from NetworkX'''
+    matrix = np.full((n, n), np.inf)
+    for s, dists in nx.all_pairs_bellman_ford_path_length(nx_g):
+        for t, d in dists.items():
+            matrix[s, t] = d
+    return matrix
+
+def path_length(g, path):
+    '''Sums the weights along a path'''
+    weights = {(v, u): w for v in g for u, w in g[v]}
+    return sum(weights[path[i], path[i + 1]] for i in range(len(path) - 1))
+
+
+class TestFloydWarshall(unittest.TestCase):
+    def test_vs_networkx(self):
+        '''Tests the distances for several block sizes'''
+        for _ in range(10):
+            g, nx_g = gen_rand_graph(70, 400)
+            expected = nx_matrix(nx_g, 70)
+            for block_size in (1, 8, 33, 128):
+                np.testing.assert_array_equal(
+                    floyd_warshall(g, block_size=block_size), expected)
+
+    def test_negative_weights(self):
+        '''Tests negative weights on a DAG'''
+        nx_g = nx.gn_graph(60, seed=1).reverse()
+        g = {node: [] for node in nx_g}
+        for u, v in nx_g.edges:
+            w = rng.randint(-10, 10)
+            g[u].append((v, w))
+            nx_g.edges[u, v]['weight'] = w
+
+        np.testing.assert_array_equal(floyd_warshall(g, block_size=16),
+                                      nx_matrix(nx_g, 60))
+
+    def test_paths(self):
+        '''Tests the next hop paths have the shortest distances'''
+        g, nx_g = gen_rand_graph(50, 200)
+        dist, nxt = floyd_warshall(g, next_hops=True, block_size=7)
+        np.testing.assert_array_equal(dist, nx_matrix(nx_g, 50))
+
+        for s in g:
+            for t in g:
+                if dist[s, t] == np.inf:
+                    self.assertRaises(NoPathError, fw_path, g, nxt, s, t)
+                else:
+                    path = fw_path(g, nxt, s, t)
+                    self.assertEqual(path[0], s)
+                    self.assertEqual(path[-1], t)
+                    self.assertEqual(path_length(g, path), dist[s, t])
+
+    def test_node_names(self):
+        '''Tests graphs keyed by names instead of 0..V-1'''
+        g = {'a': [('b', 1), ('c', 5)], 'b': [('c', 2)], 'c': []}
+        dist, nxt = floyd_warshall(g, next_hops=True)
+        self.assertEqual(dist[0, 2], 3)
+        self.assertEqual(fw_path(g, nxt, 'a', 'c'), ['a', 'b', 'c'])
+        self.assertEqual(fw_path(g, nxt, 'c', 'c'), ['c'])
+
+    def test_negative_cycle(self):
+        '''Tests NegativeCycleError'''
+        g = {0: [(1, 1)], 1: [(2, -3)], 2: [(0, 1)], 3: []}
+        self.assertRaises(NegativeCycleError, floyd_warshall, g)
+        self.assertRaises(NegativeCycleError, floyd_warshall, {0: [(0, -1)]})
+
+    def test_invalid(self):
+        '''Tests TypeError and the empty graph'''
+        self.assertRaises(TypeError, floyd_warshall, [(0, 1)])
+        self.assertEqual(floyd_warshall({}).shape, (0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,152 @@
+import unittest
+import random
+import threading
+import operator
+import networkx as nx
+import src.Dijkstra as Dijkstra
+import src.BellmanFord as BF
+from src.FrozenGraph import FrozenGraph
+from src.PreparedGraph import PreparedGraph
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, low=0, high=20):
+    '''Generates random directed graph and a NetworkX version'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(low, high)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+def path_length(g, path):
+    '''Sums the weights along a path'''
+    weights = {(v, u): w for v in g for u, w in g[v]}
+    return sum(weights[path[i], path[i + 1]] for i in range(len(path) - 1))
+
+
+class TestFrozenGraph(unittest.TestCase):
+    def test_vs_engines(self):
+        '''Tests every query against the dict based engines'''
+        for _ in range(20):
+            g, nx_g = gen_rand_graph(60, 150)
+            fg = FrozenGraph(g)
+            s = rng.randrange(60)
+
+            self.assertEqual(fg.dij(s), Dijkstra.dij(g, s))
+            self.assertEqual(fg.bellman_ford(s), BF.bellman_ford(g, s))
+            expected = nx.single_source_dijkstra_path_length(nx_g, s)
+            for t in g:
+                if t in expected:
+                    self.assertEqual(fg.dij(s, t), expected[t])
+                    self.assertEqual(fg.bellman_ford(s, t), expected[t])
+                    for path in (fg.dij_paths(s, t), fg.bf_paths(s, t)):
+                        self.assertEqual(path_length(g, path), expected[t])
+                else:
+                    self.assertRaises(Dijkstra.NoPathError, fg.dij, s, t)
+                    self.assertRaises(Dijkstra.NoPathError, fg.bf_paths,
+                                      s, t)
+
+            paths = fg.dij_paths(s)
+            self.assertEqual(set(node for node in paths if paths[node]),
+                             set(expected))
+
+    def test_negative_weights(self):
+        '''Tests Bellman Ford with negative weights and cycles'''
+        g = {'a': [('b', 4), ('c', 2)], 'b': [('d', -3)],
+             'c': [('b', 1)], 'd': [], 'e': [('a', 1)]}
+        fg = FrozenGraph(g)
+        self.assertEqual(fg.bellman_ford('a'),
+                         {'a': 0, 'b': 3, 'c': 2, 'd': 0})
+        self.assertEqual(fg.bf_paths('a', 'd'), ['a', 'c', 'b', 'd'])
+        self.assertRaises(ValueError, fg.dij, 'a')
+
+        cycle = FrozenGraph({0: [(1, 1)], 1: [(0, -2)], 2: []})
+        self.assertRaises(BF.NegativeCycleError, cycle.bellman_ford, 0)
+        self.assertEqual(cycle.bellman_ford(2), {2: 0})
+
+    def test_frozen(self):
+        '''Tests the graph is copied, validated and can't be changed'''
+        g = {0: [(1, 2)], 1: []}
+        fg = FrozenGraph(g)
+        g[0].append((1, 1))
+        self.assertEqual(fg.dij(0, 1), 2)
+        self.assertEqual(fg[0], ((1, 2),))
+        self.assertEqual(fg.to_dict(), {0: [(1, 2)], 1: []})
+        self.assertRaises(AttributeError, setattr, fg, 'adj', ())
+        self.assertRaises(AttributeError, setattr, fg, 'other', 1)
+        self.assertRaises(TypeError, operator.setitem, fg.index, 0, 1)
+        self.assertRaises(TypeError, operator.delitem, fg.index, 0)
+        self.assertEqual(fg.index[1], 1)
+
+        self.assertRaises(TypeError, FrozenGraph, [])
+        self.assertRaises(ValueError, FrozenGraph, {0: [(5, 1)]})
+        self.assertRaises(TypeError, FrozenGraph, {0: [(0, '1')]})
+        self.assertRaises(ValueError, fg.dij, 7)
+        self.assertRaises(ValueError, fg.bf_paths, 0, 7)
+
+    def test_threads(self):
+        '''Tests concurrent queries match the serial results'''
+        g, nx_g = gen_rand_graph(300, 1200)
+        fg = FrozenGraph(g)
+        queries = [(rng.randrange(300), rng.randrange(300))
+                   for _ in range(400)]
+        expected = [Dijkstra.dij(g, s)[t] for s, t in queries]
+        results = [None] * len(queries)
+
+        def worker(offset):
+            for i in range(offset, len(queries), 8):
+                s, t = queries[i]
+                try:
+                    results[i] = fg.dij(s, t)
+                except Dijkstra.NoPathError:
+                    results[i] = float('inf')
+
+        threads = [threading.Thread(target=worker, args=(i,))
+                   for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, expected)
+
+    def test_single_thread(self):
+        '''Tests many queries on one shared workspace match fresh
+        searches and leave it clean, failed ones too
+        '''
+        g, nx_g = gen_rand_graph(30, 60)
+        fg = FrozenGraph(g, threads=False)
+        self.assertFalse(fg.threads)
+        for _ in range(300):
+            s, t = rng.randrange(30), rng.randrange(30)
+            self.assertEqual(fg.dij(s), Dijkstra.dij(g, s))
+            self.assertEqual(fg.bellman_ford(s), BF.bellman_ford(g, s))
+            try:
+                expected = Dijkstra.dij(g, s, t)
+            except Dijkstra.NoPathError:
+                self.assertRaises(Dijkstra.NoPathError, fg.dij, s, t)
+                self.assertRaises(Dijkstra.NoPathError, fg.bf_paths, s, t)
+            else:
+                self.assertEqual(fg.dij(s, t), expected)
+                self.assertEqual(fg.bf_paths(s, t)[-1], t)
+        self.assertEqual(list(fg._ws.prev), [-1] * 30)
+        self.assertEqual(fg._ws.touched, [])
+
+        fg = FrozenGraph({0: [(1, 1)], 1: [(0, -2)], 2: [(0, 1)]},
+                         threads=False)
+        self.assertRaises(BF.NegativeCycleError, fg.bellman_ford, 2)
+        self.assertRaises(ValueError, fg.dij, 0)
+        self.assertEqual(fg._ws.touched, [])
+
+        pg = PreparedGraph(g)
+        self.assertIs(type(pg), FrozenGraph)
+        self.assertFalse(pg.threads)
+        self.assertEqual(pg.dij(0), Dijkstra.dij(g, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+import random
+import numpy as np
+import src.Dijkstra as Dijkstra
+from src.GridGraph import grid_search, grid_dij, grid_dij_paths, \
+    grid_path, grid_to_dict
+
+SEED = 47
+rng = random.Random(SEED)
+np_rng = np.random.default_rng(SEED)
+
+
+def gen_rand_raster(rows, cols, blocked=0.15):
+    '''Generates a raster of costs in [0, 9] with some inf cells'''
+    cost = np.array([[float(rng.randint(0, 9)) for _ in range(cols)]
+                     for _ in range(rows)])
+    cost[np_rng.random((rows, cols)) < blocked] = np.inf
+    return cost
+
+def path_length(g, path):
+    '''Sums the weights along a path'''
+    return sum(dict(g[v])[u] for v, u in zip(path, path[1:]))
+
+
+class TestGridGraph(unittest.TestCase):
+    def test_vs_dict(self):
+        '''Tests distances and paths against dij on the expanded dict'''
+        for _ in range(100):
+            rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+            cost = gen_rand_raster(rows, cols)
+            connectivity = rng.choice([4, 8])
+            g = grid_to_dict(cost, connectivity)
+            s = (rng.randrange(rows), rng.randrange(cols))
+            full = Dijkstra.dij(g, s)
+
+            dist = grid_dij(cost, s, connectivity=connectivity)
+            for cell, d in full.items():
+                self.assertAlmostEqual(dist[cell], d)
+
+            paths = grid_dij_paths(cost, s, connectivity=connectivity)
+            self.assertSetEqual(set(paths), set(g))
+            for cell, path in paths.items():
+                if full[cell] == float('inf'):
+                    self.assertEqual(path, [])
+                else:
+                    self.assertEqual((path[0], path[-1]), (s, cell))
+                    self.assertAlmostEqual(path_length(g, path), full[cell])
+
+            t = (rng.randrange(rows), rng.randrange(cols))
+            if full[t] == float('inf'):
+                self.assertRaises(Dijkstra.NoPathError, grid_dij, cost, s, t,
+                                  connectivity=connectivity)
+            else:
+                self.assertAlmostEqual(
+                    grid_dij(cost, s, t, connectivity=connectivity), full[t])
+                path = grid_dij_paths(cost, s, t, connectivity=connectivity)
+                self.assertAlmostEqual(path_length(g, path), full[t])
+
+    def test_bounded(self):
+        '''Tests cells further than max_distance are not reached'''
+        for _ in range(50):
+            cost = gen_rand_raster(10, 10)
+            s = (rng.randrange(10), rng.randrange(10))
+            radius = rng.randint(0, 30)
+            full = grid_dij(cost, s)
+            dist, prev = grid_search(cost, s, max_distance=radius)
+            expected = np.where(full <= radius, full, np.inf)
+            np.testing.assert_allclose(dist, expected)
+            self.assertTrue(((prev == -1) == np.isinf(expected)).all())
+
+    def test_multi_source(self):
+        '''Tests each cell gets the distance to its nearest source'''
+        for _ in range(50):
+            cost = gen_rand_raster(10, 10)
+            sources = list({(rng.randrange(10), rng.randrange(10))
+                            for _ in range(rng.randint(1, 4))})
+            nearest = np.minimum.reduce([grid_dij(cost, s) for s in sources])
+            dist, prev = grid_search(cost, sources)
+            np.testing.assert_allclose(dist, nearest)
+
+            for cell in zip(*np.nonzero(np.isfinite(nearest))):
+                path = grid_path(prev, cell)
+                self.assertIn(path[0], sources)
+                self.assertEqual(path[-1], cell)
+
+    def test_delta(self):
+        '''Tests every bucket width gives the same distances'''
+        cost = gen_rand_raster(20, 20)
+        expected = grid_dij(cost, (0, 0), connectivity=8)
+        for delta in (0.1, 1, 7, 1000):
+            dist, _ = grid_search(cost, (0, 0), connectivity=8, delta=delta)
+            np.testing.assert_allclose(dist, expected)
+
+    def test_invalid(self):
+        '''Tests bad rasters, cells and connectivity'''
+        cost = np.ones((3, 3))
+        self.assertRaises(ValueError, grid_dij, -cost, (0, 0))
+        self.assertRaises(ValueError, grid_dij, np.ones(3), (0, 0))
+        self.assertRaises(ValueError, grid_dij, cost, (3, 0))
+        self.assertRaises(ValueError, grid_dij, cost, (0, 0), (0, -1))
+        self.assertRaises(ValueError, grid_dij, cost, [])
+        self.assertRaises(ValueError, grid_dij, cost, (0, 0),
+                          connectivity=6)
+
+        walled = np.array([[1, np.nan, 1]])
+        self.assertRaises(Dijkstra.NoPathError, grid_dij, walled, (0, 0),
+                          (0, 2))
+        self.assertEqual(grid_dij(walled, (0, 1), (0, 2)), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import os
+import math
+import unittest
+import random
+import tempfile
+import src.Dijkstra as Dijkstra
+from src.HubLabels import HubLabels, importance_order
+from src.Snapshot import SnapshotError, StaleSnapshotError, save_snapshot
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=0, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+def exact(g, s, t):
+    '''Returns dij(g, s, t) or infinity if there is no path'''
+    try:
+        return Dijkstra.dij(g, s, t)
+    except Dijkstra.NoPathError:
+        return math.inf
+
+
+class TestHubLabels(unittest.TestCase):
+    def assertOracle(self, labels, g):
+        for s in g:
+            for t in g:
+                d = exact(g, s, t)
+                if d == math.inf:
+                    self.assertRaises(Dijkstra.NoPathError,
+                                      labels.distance, s, t)
+                else:
+                    self.assertEqual(labels.distance(s, t), d)
+
+    def test_distances(self):
+        '''Tests every pair against dij, including zero weights and
+        unreachable pairs
+        '''
+        for _ in range(10):
+            g = gen_rand_graph(40, 70)
+            self.assertOracle(HubLabels(g), g)
+
+    def test_orders(self):
+        '''Tests labels are exact whatever the order'''
+        g = gen_rand_graph(40, 100)
+        for order in (list(g), list(g)[::-1], rng.sample(list(g), 40)):
+            self.assertOracle(HubLabels(g, order), g)
+
+    def test_sorted_labels(self):
+        '''Tests every label is sorted by hub and has distinct hubs'''
+        g = gen_rand_graph(100, 300)
+        labels = HubLabels(g)
+        for offsets, hubs in ((labels.out_offsets, labels.out_hubs),
+                              (labels.in_offsets, labels.in_hubs)):
+            for i in range(len(g)):
+                label = hubs[offsets[i]:offsets[i + 1]].tolist()
+                self.assertEqual(label, sorted(set(label)))
+            self.assertEqual(offsets[-1], len(hubs))
+        self.assertEqual(labels.size, len(labels.out_hubs)
+                         + len(labels.in_hubs))
+
+    def test_string_nodes(self):
+        '''Tests nodes that are not 0..V-1'''
+        g = {'a': [('b', 1), ('c', 4)], 'b': [('c', 2)], 'c': [('a', 1)],
+             'd': [('a', 3)]}
+        labels = HubLabels(g)
+        self.assertEqual(labels.distance('a', 'c'), 3)
+        self.assertEqual(labels.distance('d', 'c'), 6)
+        self.assertEqual(labels.distance('c', 'c'), 0)
+        self.assertRaises(Dijkstra.NoPathError, labels.distance, 'a', 'd')
+
+    def test_importance_order(self):
+        '''Tests the middle of a path ranks above its ends'''
+        g = {i: [(i + 1, 1), (i - 1, 1)] for i in range(1, 20)}
+        g[0] = [(1, 1)]
+        g[20] = [(19, 1)]
+        order = importance_order(g)
+        self.assertEqual(sorted(order), sorted(g))
+        self.assertLess(order.index(10), order.index(0))
+        self.assertLess(order.index(10), order.index(20))
+
+    def test_save_load(self):
+        '''Tests memory mapped labels answer the same'''
+        path = os.path.join(tempfile.mkdtemp(), 'labels.snap')
+        g = gen_rand_graph(60, 150)
+        labels = HubLabels(g)
+        labels.save(path, g)
+
+        loaded = HubLabels.load(path, g)
+        self.assertFalse(loaded.out_hubs.flags.writeable)
+        self.assertEqual(loaded.nbytes, labels.nbytes)
+        self.assertOracle(loaded, g)
+
+        changed = dict(g)
+        changed[0] = changed[0] + [(1, 1)]
+        self.assertRaises(StaleSnapshotError, HubLabels.load, path, changed)
+        save_snapshot(path, g)
+        self.assertRaises(SnapshotError, HubLabels.load, path, g)
+
+    def test_prune(self):
+        '''Tests construct_sparse doesn't relax the edges of pruned nodes'''
+        g = {0: [(1, 1), (2, 5)], 1: [(2, 1), (3, 1)], 2: [(4, 1)], 3: [],
+             4: []}
+        settled = []
+
+        def prune(v, d):
+            settled.append((v, d))
+            return v == 1
+        distances, prev = Dijkstra.construct_sparse(g.__getitem__, 0,
+                                                    prune=prune)
+        self.assertEqual(distances, {0: 0, 1: 1, 2: 5, 4: 6})
+        self.assertEqual(settled, [(0, 0), (1, 1), (2, 5), (4, 6)])
+
+    def test_errors(self):
+        '''Tests invalid input'''
+        g = {0: [(1, 1)], 1: []}
+        labels = HubLabels(g)
+        self.assertRaises(ValueError, labels.distance, 5, 0)
+        self.assertRaises(ValueError, labels.distance, 0, 'a')
+        self.assertRaises(TypeError, HubLabels, [(1, 1)])
+        self.assertRaises(ValueError, HubLabels, {0: [(1, -1)], 1: []})
+        self.assertRaises(ValueError, HubLabels, {0: [(1, 1)]})
+        self.assertRaises(ValueError, HubLabels, g, [0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import unittest
+import random
+import src.Dijkstra as Dijkstra
+import src.BellmanFord as BellmanFord
+from src.BellmanFord import NegativeCycleError
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+def lattice(p):
+    '''Neighbors of a point on an infinite 4-connected grid'''
+    x, y = p
+    return [((x + 1, y), 1), ((x - 1, y), 1), ((x, y + 1), 1), ((x, y - 1), 1)]
+
+
+class TestImplicit(unittest.TestCase):
+    def test_vs_dict(self):
+        '''Tests a neighbors function gives the same results as the dict,
+        only the reached nodes are in the results
+        '''
+        for _ in range(100):
+            g = gen_rand_graph(40, 70)
+            s = rng.randrange(40)
+            t = rng.randrange(40)
+            neighbors = g.__getitem__
+            full = Dijkstra.dij(g, s)
+            reached = {v: d for v, d in full.items() if d != float('inf')}
+
+            self.assertDictEqual(Dijkstra.dij(neighbors, s), reached)
+            self.assertDictEqual(BellmanFord.bellman_ford(neighbors, s),
+                                 reached)
+            self.assertDictEqual(BellmanFord.bellman_ford(g, s), reached)
+
+            paths = Dijkstra.dij_paths(neighbors, s)
+            self.assertSetEqual(set(paths), set(reached))
+            bf = BellmanFord.bf_paths(neighbors, s)
+            self.assertSetEqual(set(bf), set(reached))
+            for v in reached:
+                self.assertEqual((paths[v][0], paths[v][-1]), (s, v))
+                self.assertEqual((bf[v][0], bf[v][-1]), (s, v))
+
+            if t in reached:
+                self.assertEqual(Dijkstra.dij(neighbors, s, t), full[t])
+                self.assertEqual(BellmanFord.bellman_ford(neighbors, s, t),
+                                 full[t])
+            else:
+                self.assertRaises(Dijkstra.NoPathError, Dijkstra.dij, neighbors, s, t)
+                self.assertRaises(BellmanFord.NoPathError, BellmanFord.bf_paths,
+                                  neighbors, s, t)
+
+            radius = rng.randint(0, 40)
+            self.assertDictEqual(
+                Dijkstra.dij(neighbors, s, max_distance=radius),
+                {v: d for v, d in reached.items() if d <= radius})
+
+    def test_infinite_graph(self):
+        '''Tests searches that stop on an infinite grid'''
+        self.assertEqual(Dijkstra.dij(lattice, (0, 0), (3, -4)), 7)
+        path = Dijkstra.dij_paths(lattice, (0, 0), (2, 2))
+        self.assertEqual(len(path), 5)
+        self.assertEqual((path[0], path[-1]), ((0, 0), (2, 2)))
+
+        ball = Dijkstra.dij(lattice, (0, 0), max_distance=3)
+        self.assertEqual(len(ball), 25)
+        self.assertEqual(Dijkstra.dij(lattice, (0, 0), targets=[(1, 1), (0, 5)]),
+                         {(1, 1): 2, (0, 5): 5})
+
+        # Targets are read more than once, a generator must work too
+        targets = ((x, x) for x in range(3))
+        self.assertEqual(Dijkstra.dij(lattice, (0, 0), targets=targets),
+                         {(0, 0): 0, (1, 1): 2, (2, 2): 4})
+        paths = Dijkstra.dij_paths(lattice, (0, 0),
+                                   targets=(t for t in [(0, 1)]))
+        self.assertEqual(paths, {(0, 1): [(0, 0), (0, 1)]})
+        g = {0: [(1, 1)], 1: []}
+        self.assertEqual(Dijkstra.dij(g, 0, targets=iter([1])), {1: 1})
+
+        hops = BellmanFord.bellman_ford(lattice, (0, 0), max_hops=2)
+        self.assertEqual(len(hops), 13)
+        self.assertEqual(hops[(1, 1)], 2)
+        self.assertEqual(
+            BellmanFord.bf_paths(lattice, (0, 0), (0, 2), max_hops=2),
+            [(0, 0), (0, 1), (0, 2)])
+
+    def test_negative_weights(self):
+        '''Tests negative weights and negative cycles on implicit graphs'''
+        g = {0: [(1, 4), (2, 1)], 1: [(3, -3)], 2: [(1, 1)], 3: []}
+        self.assertEqual(BellmanFord.bellman_ford(g.__getitem__, 0),
+                         {0: 0, 1: 2, 2: 1, 3: -1})
+        self.assertEqual(BellmanFord.bf_paths(g.__getitem__, 0, 3),
+                         [0, 2, 1, 3])
+
+        cycle = {0: [(1, 1)], 1: [(2, -2)], 2: [(1, 1)]}
+        self.assertRaises(NegativeCycleError, BellmanFord.bellman_ford,
+                          cycle.__getitem__, 0)
+
+        # Infinite chain that is cheaper every step back to the start
+        def spiral(v):
+            return [(v + 1, -1), (0, 0)] if v < 50 else [(0, 0)]
+        self.assertRaises(NegativeCycleError, BellmanFord.bf_paths,
+                          spiral, 0)
+
+    def test_invalid(self):
+        '''Tests bad arguments with a neighbors function'''
+        self.assertRaises(ValueError, Dijkstra.dij, lattice, (0, 0), (1, 1),
+                          targets=[(1, 1)])
+
+
+if __name__ == '__main__':
+    unittest.main()
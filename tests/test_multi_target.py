@@ -0,0 +1,84 @@
+import unittest
+import random
+import src.Dijkstra as Dijkstra
+from src.Reachability import ReachabilityIndex
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+def path_length(g, path):
+    '''Sums the smallest weights along a path'''
+    total = 0
+    for v, u in zip(path, path[1:]):
+        total += min(w for x, w in g[v] if x == u)
+    return total
+
+
+class TestMultiTarget(unittest.TestCase):
+    def test_vs_full_search(self):
+        '''Tests every target against a full search, with and without a
+        reachability index and a radius
+        '''
+        for _ in range(100):
+            g = gen_rand_graph(40, 70)
+            s = rng.randrange(40)
+            targets = rng.sample(range(40), rng.randint(1, 8))
+            full = Dijkstra.dij(g, s)
+            reach = ReachabilityIndex(g)
+
+            for r in (None, reach):
+                dists = Dijkstra.dij(g, s, targets=targets, reach=r)
+                self.assertDictEqual(dists, {t: full[t] for t in targets})
+
+                paths = Dijkstra.dij_paths(g, s, targets=targets, reach=r)
+                self.assertSetEqual(set(paths), set(targets))
+                for t, path in paths.items():
+                    if full[t] == float('inf'):
+                        self.assertEqual(path, [])
+                    else:
+                        self.assertEqual((path[0], path[-1]), (s, t))
+                        self.assertEqual(path_length(g, path), full[t])
+
+            radius = rng.randint(0, 40)
+            bounded = Dijkstra.dij(g, s, max_distance=radius, targets=targets)
+            self.assertDictEqual(bounded, {
+                t: full[t] if full[t] <= radius else float('inf')
+                for t in targets})
+
+    def test_stops_early(self):
+        '''Tests the search stops once the targets are settled'''
+        g = {i: [(i + 1, 1)] for i in range(1000)}
+        g[1000] = []
+        calls = []
+
+        class Counting(dict):
+            def __getitem__(self, key):
+                calls.append(key)
+                return dict.__getitem__(self, key)
+
+        self.assertEqual(Dijkstra.dij(Counting(g), 0, targets=[3, 5]),
+                         {3: 3, 5: 5})
+        self.assertLess(len(calls), 10)
+
+    def test_invalid(self):
+        '''Tests bad targets and giving both t and targets'''
+        g = {0: [(1, 1)], 1: [], 2: []}
+        self.assertEqual(Dijkstra.dij(g, 0, targets=[]), {})
+        self.assertEqual(Dijkstra.dij_paths(g, 0, targets=[2, 0]),
+                         {2: [], 0: [0]})
+        self.assertRaises(ValueError, Dijkstra.dij, g, 0, targets=[7])
+        self.assertRaises(ValueError, Dijkstra.dij_paths, g, 0, 1,
+                          targets=[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import random
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+from src.MultiWeightGraph import MultiWeightGraph
+
+SEED = 47
+rng = random.Random(SEED)
+
+COLUMNS = ('time', 'distance', 'toll')
+
+
+def gen_rand_graph(n, m):
+    '''Generates a random multi weight graph and one dict per column'''
+    multi = {node: [] for node in range(n)}
+    for _ in range(m):
+        multi[rng.randrange(n)].append(
+            (rng.randrange(n),) + tuple(rng.randint(0, 20)
+                                           for _ in COLUMNS))
+
+    dicts = {name: {v: [(edge[0], edge[i + 1]) for edge in multi[v]]
+                    for v in multi}
+             for i, name in enumerate(COLUMNS)}
+    return MultiWeightGraph(multi, COLUMNS), dicts
+
+
+class TestMultiWeight(unittest.TestCase):
+    def test_vs_dicts(self):
+        '''Tests every engine on each column against a dict per column'''
+        for _ in range(30):
+            g, dicts = gen_rand_graph(40, 120)
+            s = rng.randrange(40)
+            for name in COLUMNS:
+                d = dicts[name]
+                self.assertEqual(Dijkstra.dij(g, s, weight=name),
+                                 Dijkstra.dij(d, s))
+                self.assertEqual(Dijkstra.dij_paths(g, s, weight=name),
+                                 Dijkstra.dij_paths(d, s))
+                self.assertEqual(BF.bellman_ford(g, s, weight=name),
+                                 BF.bellman_ford(d, s))
+                self.assertEqual(BF.bf_paths(g, s, weight=name),
+                                 BF.bf_paths(d, s))
+                self.assertEqual(dict(g.metric(name)), d)
+
+    def test_columns(self):
+        '''Tests adding a column and switching metrics per query'''
+        g = MultiWeightGraph({'a': [('b', 1, 10), ('c', 5, 1)],
+                              'b': [('c', 1, 10)], 'c': []},
+                             ('time', 'toll'))
+        self.assertEqual(Dijkstra.dij_paths(g, 'a', 'c', weight='time'),
+                         ['a', 'b', 'c'])
+        self.assertEqual(Dijkstra.dij_paths(g, 'a', 'c', weight='toll'),
+                         ['a', 'c'])
+
+        self.assertEqual(list(g.edges()),
+                         [('a', 'b'), ('a', 'c'), ('b', 'c')])
+        g.add_column('hops', [1, 1, 1])
+        self.assertEqual(Dijkstra.dij(g, 'a', 'c', weight='hops'), 1)
+        self.assertRaises(ValueError, g.add_column, 'hops', [1, 1, 1])
+        self.assertRaises(ValueError, g.add_column, 'x', [1])
+
+    def test_invalid(self):
+        '''Tests bad columns and graphs'''
+        g, dicts = gen_rand_graph(5, 5)
+        self.assertRaises(ValueError, Dijkstra.dij, g, 0, weight='nope')
+        self.assertRaises(ValueError, Dijkstra.dij, g, 0)
+        self.assertRaises(ValueError, BF.bellman_ford, g, 0)
+        self.assertRaises(TypeError, Dijkstra.dij, dicts['time'], 0,
+                          weight='time')
+        self.assertRaises(ValueError, MultiWeightGraph, {0: [(0, 1)]},
+                          COLUMNS)
+        self.assertRaises(ValueError, MultiWeightGraph, {0: [(1, 1)]},
+                          ('time',))
+        self.assertRaises(ValueError, MultiWeightGraph, {}, ('a', 'a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+from tests.perf_check import compare, fit_exponent, noise
+
+
+def results(times, exponent):
+    '''Builds run_matrix() style results for one algorithm'''
+    return {'algorithms': {'dij': {
+        'runs': {str(n): runs for n, runs in times.items()},
+        'exponent': exponent}}}
+
+
+class TestPerfCheck(unittest.TestCase):
+    def test_fit_exponent(self):
+        '''Tests the fitted exponent of exact power laws'''
+        sizes = [1000, 2000, 4000, 8000]
+        for k in (1, 1.5, 2, 3):
+            self.assertAlmostEqual(
+                fit_exponent(sizes, [3e-7 * n ** k for n in sizes]), k)
+
+    def test_pass(self):
+        '''Tests noise within the tolerance passes'''
+        base = results({1000: [1.0, 1.2], 2000: [2.0, 2.5]}, 1.0)
+        cur = results({1000: [1.1, 1.5], 2000: [1.9, 2.0]}, 1.1)
+        rows, failures = compare(base, cur, tolerance=0.25)
+        self.assertEqual(failures, [])
+        self.assertEqual([row[4] for row in rows], [1.1, 0.95])
+
+    def test_one_noisy_size(self):
+        '''Tests one slow size alone doesn't fail the gate'''
+        base = results({n: [1.0] for n in (1, 2, 3, 4)}, 1.0)
+        cur = results({1: [1.6], 2: [1.0], 3: [1.0], 4: [1.0]}, 1.0)
+        rows, failures = compare(base, cur, tolerance=0.25)
+        self.assertEqual(failures, [])
+        self.assertEqual(rows[0][5], 'slower')
+
+    def test_slowdown(self):
+        '''Tests a slowdown at every size fails the gate'''
+        base = results({1000: [1.0], 2000: [2.0]}, 1.0)
+        cur = results({1000: [1.5], 2000: [3.0]}, 1.0)
+        rows, failures = compare(base, cur, tolerance=0.25)
+        self.assertEqual(len(failures), 1)
+        self.assertIn('50.0% slower', failures[0])
+
+    def test_noisy_repeats(self):
+        '''Tests the tolerance is widened for algorithms whose repeats
+        are far apart
+        '''
+        base = results({1000: [1.0, 1.1, 1.1]}, 1.0)
+        cur = results({1000: [1.4, 1.6, 1.8]}, 1.0)
+        self.assertAlmostEqual(noise(cur['algorithms']['dij']['runs']),
+                               1.6 / 1.4 - 1)
+        rows, failures = compare(base, cur, tolerance=0.25)
+        self.assertEqual(failures, [])
+
+        cur = results({1000: [1.4, 1.45, 1.5]}, 1.0)
+        rows, failures = compare(base, cur, tolerance=0.25)
+        self.assertIn('tolerance 30.0%', failures[0])
+
+    def test_growth(self):
+        '''Tests a higher growth exponent fails even when the times at
+        the small sizes are faster
+        '''
+        base = results({1000: [1.0]}, 1.0)
+        cur = results({1000: [0.5]}, 2.0)
+        rows, failures = compare(base, cur, exponent_tolerance=0.3)
+        self.assertEqual(len(failures), 1)
+        self.assertIn('n^2.00', failures[0])
+
+    def test_new_algorithm(self):
+        '''Tests algorithms missing from the baseline are not failures'''
+        cur = results({1000: [1.0]}, 1.0)
+        rows, failures = compare({'algorithms': {}}, cur)
+        self.assertEqual(failures, [])
+        self.assertEqual(rows[0][5], 'new')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import io
+import os
+import json
+import pstats
+import random
+import unittest
+import tempfile
+import src.BatchQuery as BQ
+import src.Dijkstra as Dijkstra
+import src.BellmanFord as BF
+from src.Profiling import profile_call, PHASES, _phase
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+
+class TestProfiling(unittest.TestCase):
+    def test_cprofile_phases(self):
+        '''Tests the search, heap and path phases get their time'''
+        g = gen_rand_graph(2000, 8000)
+        result, report = profile_call(Dijkstra.dij_paths, g, 0)
+        self.assertEqual(result, Dijkstra.dij_paths(g, 0))
+        self.assertEqual(set(report.phases), set(PHASES))
+        for phase in ('heap operations', 'relaxation', 'path reconstruction'):
+            self.assertGreater(report.phases[phase], 0, phase)
+        self.assertIsNone(report.samples)
+
+        names = [name for name, calls, own, cum in report.top_functions()]
+        self.assertTrue(any('construct_arrays' in name for name in names))
+        self.assertIn('phase (cProfile)', report.format())
+
+        _, report = profile_call(BF.bellman_ford, g, 0)
+        self.assertEqual(report.phases['path reconstruction'], 0)
+        self.assertGreater(report.phases['relaxation'], 0)
+
+    def test_phase_names(self):
+        '''Tests the engine functions and generic names are classified by
+        their real module
+        '''
+        src_dir = os.path.dirname(Dijkstra.__file__)
+        def phase(module, func):
+            return _phase(os.path.join(src_dir, module + '.py'), func)
+
+        self.assertEqual(phase('ShortestPaths', '_run_dag'), 'relaxation')
+        self.assertEqual(phase('SparseGraph', '__getitem__'), 'relaxation')
+        self.assertEqual(phase('Dijkstra', '__getitem__'), 'initialization')
+        self.assertEqual(phase('FrozenGraph', '__getitem__'), 'other')
+        self.assertEqual(_phase(__file__, '_run_dag'), 'other')
+
+    def test_sampling(self):
+        '''Tests samples are taken with full stacks'''
+        g = gen_rand_graph(5000, 20000)
+        result, report = profile_call(Dijkstra.dij_paths, g, 0,
+                                      mode='sample', interval=0.0005,
+                                      repeat=5)
+        self.assertIsNone(report.stats)
+        self.assertGreater(sum(report.samples.values()), 0)
+        self.assertTrue(any('Dijkstra:dij_paths' in stack
+                            for stack in report.samples))
+        fractions = report.phase_fractions()
+        self.assertAlmostEqual(sum(fractions.values()), 1)
+        self.assertGreater(fractions['relaxation'], 0)
+
+    def test_files(self):
+        '''Tests the collapsed stacks and stats files'''
+        g = gen_rand_graph(5000, 20000)
+        _, report = profile_call(Dijkstra.dij, g, 0, mode='both', repeat=3)
+        tmp = tempfile.mkdtemp()
+
+        folded = os.path.join(tmp, 'out.folded')
+        report.write_collapsed(folded)
+        with open(folded) as f:
+            for line in f:
+                stack, count = line.rsplit(' ', 1)
+                self.assertGreater(int(count), 0)
+                self.assertNotIn(' ', stack)
+
+        prof = os.path.join(tmp, 'out.prof')
+        report.dump_stats(prof)
+        self.assertTrue(pstats.Stats(prof).stats)
+
+        _, report = profile_call(Dijkstra.dij, g, 0)
+        self.assertRaises(ValueError, report.write_collapsed, folded)
+        self.assertRaises(ValueError, profile_call, Dijkstra.dij, g, 0,
+                          mode='trace')
+
+    def test_batch_query(self):
+        '''Tests --profile keeps the output and writes the files'''
+        tmp = tempfile.mkdtemp()
+        graph_path = os.path.join(tmp, 'g.txt')
+        with open(graph_path, 'w') as f:
+            f.write('a b 1\nb c 2\n')
+        query_path = os.path.join(tmp, 'q.txt')
+        with open(query_path, 'w') as f:
+            f.write('a c\nc a\n')
+        prefix = os.path.join(tmp, 'run')
+
+        out, err = io.StringIO(), io.StringIO()
+        stdout, stderr = BQ.sys.stdout, BQ.sys.stderr
+        BQ.sys.stdout, BQ.sys.stderr = out, err
+        try:
+            status = BQ.main([graph_path, query_path, '--profile', 'both',
+                              '--profile-out', prefix])
+        finally:
+            BQ.sys.stdout, BQ.sys.stderr = stdout, stderr
+
+        self.assertEqual(status, 0)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([line['distance'] for line in lines], [3, None])
+        self.assertIn('phase (cProfile)', err.getvalue())
+        self.assertTrue(os.path.exists(prefix + '.prof'))
+        self.assertTrue(os.path.exists(prefix + '.folded'))
+
+
+if __name__ == '__main__':
+    unittest.main()
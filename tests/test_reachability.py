@@ -0,0 +1,92 @@
+import unittest
+import random
+import networkx as nx
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+import src.ShortestPaths as SP
+from src.Reachability import ReachabilityIndex, strongly_connected
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph and a NetworkX version'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(start, end)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+
+class TestReachability(unittest.TestCase):
+    def test_components(self):
+        '''Tests the components match NetworkX and are in reverse
+        topological order
+        '''
+        for _ in range(20):
+            g, nx_g = gen_rand_graph(60, 90)
+            comp, num_components = strongly_connected(g)
+
+            self.assertEqual(num_components,
+                             nx.number_strongly_connected_components(nx_g))
+            for scc in nx.strongly_connected_components(nx_g):
+                self.assertEqual(len({comp[node] for node in scc}), 1)
+            for v in g:
+                for u, w in g[v]:
+                    self.assertGreaterEqual(comp[v], comp[u])
+
+    def test_can_reach(self):
+        '''Tests bitset and interval labels against NetworkX'''
+        for _ in range(10):
+            g, nx_g = gen_rand_graph(50, 70)
+            bitsets = ReachabilityIndex(g)
+            intervals = ReachabilityIndex(g, bitset_limit=0)
+
+            for s in g:
+                reachable = nx.descendants(nx_g, s) | {s}
+                self.assertSetEqual(set(bitsets.reachable_nodes(s)), reachable)
+                self.assertSetEqual(set(intervals.reachable_nodes(s)),
+                                    reachable)
+                for t in g:
+                    self.assertEqual(bitsets.can_reach(s, t), t in reachable)
+                    self.assertEqual(intervals.can_reach(s, t), t in reachable)
+
+    def test_engines(self):
+        '''Tests the engines fail fast and prune with the index'''
+        for _ in range(20):
+            g, nx_g = gen_rand_graph(40, 60, start=-2)
+            reach = ReachabilityIndex(g)
+
+            try:
+                dists = BF.bellman_ford(g, 0)
+            except BF.NegativeCycleError:
+                with self.assertRaises(BF.NegativeCycleError):
+                    BF.bellman_ford(g, 0, reach=reach)
+                continue
+
+            self.assertDictEqual(BF.bellman_ford(g, 0, reach=reach), dists)
+            for t in g:
+                if t in dists:
+                    self.assertTrue(BF.bf_paths(g, 0, t, reach=reach))
+                else:
+                    with self.assertRaises(BF.NoPathError):
+                        BF.bf_paths(g, 0, t, reach=reach)
+                    with self.assertRaises(Dijkstra.NoPathError):
+                        Dijkstra.dij(g, 0, t, reach=reach)
+
+    def test_dispatch_fail_fast(self):
+        '''Tests shortest_paths() fails fast for unreachable targets'''
+        g = {0: [(1, 1)], 1: [(0, 1)], 2: [(0, 1)]}
+
+        with self.assertRaises(SP.NoPathError):
+            SP.shortest_paths(g, 0, 2)
+        self.assertFalse(SP.reachability_index(g).can_reach(0, 2))
+        self.assertIs(SP.reachability_index(g), SP.reachability_index(g))
+
+
+if __name__ == '__main__':
+    unittest.main()
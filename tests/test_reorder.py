@@ -0,0 +1,120 @@
+import unittest
+import random
+import src.Dijkstra as Dijkstra
+import src.BellmanFord as BF
+from src.Reorder import ReorderedGraph, permutation, METHODS
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end] and
+    randomly shuffled node ids
+    '''
+    ids = rng.sample(range(10 * n), n)
+    g = {node: [] for node in ids}
+    for _ in range(m):
+        g[rng.choice(ids)].append((rng.choice(ids),
+                                      rng.randint(start, end)))
+    return g
+
+def path_length(g, path):
+    '''Sums the smallest weights along a path'''
+    return sum(min(w for x, w in g[v] if x == u)
+               for v, u in zip(path, path[1:]))
+
+
+class TestReorder(unittest.TestCase):
+    def test_permutation(self):
+        '''Tests every method orders each node exactly once'''
+        for _ in range(20):
+            g = gen_rand_graph(50, 80)
+            for method in METHODS:
+                order = permutation(g, method)
+                self.assertEqual(sorted(order), sorted(g))
+
+    def test_locality(self):
+        '''Tests the orders put a shuffled path back in path order'''
+        ids = rng.sample(range(1000), 100)
+        g = {v: [] for v in rng.sample(ids, 100)}
+        for v, u in zip(ids, ids[1:]):
+            g[v].append((u, 1))
+
+        for method in ('bfs', 'rcm'):
+            rg = ReorderedGraph(g, method)
+            gaps = [abs(rg.position[v] - rg.position[u])
+                    for v, u in zip(ids, ids[1:])]
+            self.assertLessEqual(max(gaps), 2, method)
+
+        # Depth first goes one way from the start then jumps back once
+        rg = ReorderedGraph(g, 'dfs')
+        gaps = [abs(rg.position[v] - rg.position[u])
+                for v, u in zip(ids, ids[1:])]
+        self.assertLessEqual(sum(gap > 1 for gap in gaps), 1)
+
+    def test_vs_original(self):
+        '''Tests results in the original nodes match the engines'''
+        for _ in range(30):
+            g = gen_rand_graph(40, 80)
+            nodes = list(g)
+            s, t = rng.choice(nodes), rng.choice(nodes)
+            rg = ReorderedGraph(g, rng.choice(METHODS))
+            full = Dijkstra.dij(g, s)
+
+            self.assertEqual(list(rg.dij(s).items()), list(full.items()))
+            self.assertEqual(rg.dij(s, max_distance=30),
+                             Dijkstra.dij(g, s, max_distance=30))
+            self.assertEqual(rg.bellman_ford(s),
+                             {v: d for v, d in full.items()
+                              if d != float('inf')})
+
+            paths = rg.dij_paths(s)
+            bf = rg.bf_paths(s)
+            self.assertEqual(list(paths), nodes)
+            for v in nodes:
+                if full[v] == float('inf'):
+                    self.assertEqual(paths[v], [])
+                    self.assertEqual(bf[v], [])
+                else:
+                    self.assertEqual(path_length(g, paths[v]), full[v])
+                    self.assertEqual(path_length(g, bf[v]), full[v])
+
+            if full[t] == float('inf'):
+                self.assertRaises(Dijkstra.NoPathError, rg.dij, s, t)
+                self.assertRaises(BF.NoPathError, rg.bf_paths, s, t)
+            else:
+                self.assertEqual(rg.dij(s, t), full[t])
+                self.assertEqual(rg.bellman_ford(s, t), full[t])
+                self.assertEqual(path_length(g, rg.dij_paths(s, t)), full[t])
+                path = rg.bf_paths(s, t)
+                self.assertEqual((path[0], path[-1]), (s, t))
+
+    def test_negative_and_hops(self):
+        '''Tests negative weights, cycles and max_hops with string nodes'''
+        g = {'a': [('b', 4), ('c', 1)], 'b': [('d', -3)], 'c': [('b', 1)],
+             'd': []}
+        rg = ReorderedGraph(g, 'rcm')
+        self.assertEqual(rg.bellman_ford('a'),
+                         {'a': 0, 'b': 2, 'c': 1, 'd': -1})
+        self.assertEqual(rg.bf_paths('a', 'd'), ['a', 'c', 'b', 'd'])
+        self.assertEqual(rg.bellman_ford('a', max_hops=1),
+                         {'a': 0, 'b': 4, 'c': 1})
+        self.assertEqual(rg.bf_paths('a', max_hops=2)['d'], ['a', 'b', 'd'])
+
+        cycle = ReorderedGraph({'x': [('y', 1)], 'y': [('x', -2)]})
+        self.assertRaises(BF.NegativeCycleError, cycle.bellman_ford, 'x')
+
+    def test_invalid(self):
+        '''Tests bad methods, graphs and nodes'''
+        g = {0: [(1, 1)], 1: []}
+        self.assertRaises(ValueError, ReorderedGraph, g, 'random')
+        self.assertRaises(TypeError, ReorderedGraph, [(0, 1)])
+        self.assertRaises(ValueError, ReorderedGraph, {0: [(5, 1)]})
+        rg = ReorderedGraph(g)
+        self.assertRaises(ValueError, rg.dij, 7)
+        self.assertRaises(ValueError, rg.bf_paths, 0, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,117 @@
+import math
+import unittest
+import random
+import numpy as np
+import scipy.sparse as sp
+import src.Dijkstra as Dijkstra
+from src.SearchSession import DijkstraSession
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m, start=0, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    g = {node: [] for node in range(n)}
+    for _ in range(m):
+        g[rng.randrange(n)].append((rng.randrange(n),
+                                       rng.randint(start, end)))
+    return g
+
+def path_length(g, path):
+    '''Sums the smallest weights along a path'''
+    return sum(min(w for x, w in g[v] if x == u)
+               for v, u in zip(path, path[1:]))
+
+
+class TestSearchSession(unittest.TestCase):
+    def test_targets(self):
+        '''Tests queries in any order against dij and dij_paths'''
+        for _ in range(20):
+            g = gen_rand_graph(100, 300)
+            expected = Dijkstra.dij(g, 0)
+            session = DijkstraSession(g, 0)
+            for t in rng.sample(list(g), 100):
+                if expected[t] == math.inf:
+                    self.assertRaises(Dijkstra.NoPathError,
+                                      session.distance, t)
+                    self.assertRaises(Dijkstra.NoPathError, session.path, t)
+                    continue
+                self.assertEqual(session.distance(t), expected[t])
+                path = session.path(t)
+                self.assertEqual((path[0], path[-1]), (0, t))
+                self.assertEqual(path_length(g, path), expected[t])
+            self.assertEqual(session.distances(), expected)
+
+    def test_resumes(self):
+        '''Tests settled targets are answered without searching and the
+        search resumes where it stopped
+        '''
+        calls = []
+        g = {i: [(i + 1, 1)] for i in range(99)}
+        g[99] = []
+
+        def neighbors(v):
+            calls.append(v)
+            return g[v]
+        session = DijkstraSession(neighbors, 0)
+        self.assertEqual(session.distance(10), 10)
+        self.assertEqual(calls, list(range(11)))
+        self.assertEqual(session.distance(5), 5)
+        self.assertEqual(session.path(7), list(range(8)))
+        self.assertEqual(len(calls), 11)
+        self.assertEqual(session.distance(50), 50)
+        self.assertEqual(calls, list(range(51)))
+        self.assertFalse(session.done)
+
+        # Every node is expanded once over all queries
+        session.distances()
+        self.assertEqual(calls, list(range(100)))
+        self.assertTrue(session.done)
+
+    def test_work_bound(self):
+        '''Tests k queries expand no more nodes than one full search'''
+        g = gen_rand_graph(300, 1500)
+        calls = []
+
+        def neighbors(v):
+            calls.append(v)
+            return g[v]
+        session = DijkstraSession(neighbors, 0)
+        for t in rng.sample(list(g), 50):
+            try:
+                session.distance(t)
+            except Dijkstra.NoPathError:
+                pass
+        self.assertEqual(len(calls), len(set(calls)))
+        self.assertEqual(list(session.settled), calls)
+
+    def test_graph_types(self):
+        '''Tests string nodes, matrices and zero weights'''
+        g = {'a': [('b', 0), ('c', 3)], 'b': [('c', 1)], 'c': [], 'd': []}
+        session = DijkstraSession(g, 'a')
+        self.assertEqual(session.path('c'), ['a', 'b', 'c'])
+        self.assertEqual(session.distance('b'), 0)
+        self.assertEqual(session.distances(),
+                         {'a': 0, 'b': 0, 'c': 1, 'd': math.inf})
+
+        matrix = sp.csr_matrix((np.array([2.0, 1.0, 4.0]),
+                                ([0, 1, 0], [1, 2, 2])), shape=(3, 3))
+        session = DijkstraSession(matrix, 0)
+        self.assertEqual(session.distance(2), 3)
+        self.assertEqual(session.path(2), [0, 1, 2])
+
+    def test_errors(self):
+        '''Tests invalid nodes'''
+        g = {0: [(1, 1)], 1: [], 2: []}
+        self.assertRaises(ValueError, DijkstraSession, g, 5)
+        self.assertRaises(ValueError, DijkstraSession, g, [0])
+        session = DijkstraSession(g, 0)
+        self.assertRaises(ValueError, session.distance, 'x')
+        self.assertRaises(ValueError, session.path, 9)
+        self.assertRaises(Dijkstra.NoPathError, session.distance, 2)
+        self.assertEqual(session.distance(1), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import unittest
+import random
+import networkx as nx
+import src.BellmanFord as BF
+import src.Dijkstra as Dijkstra
+import src.ShortestPaths as SP
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def construct_nx_graph(g):
+    '''Constructs the directed graph using the NetworkX library and
+    adds all nodes, edges, and weights from input dict
+    '''
+    dg = nx.DiGraph()
+
+    for node in g:
+        dg.add_node(node)
+
+    for node in g:
+        for edge, weight in g[node]:
+            dg.add_edge(node, edge, weight=weight)
+
+    return dg
+
+def gen_rand_graph(n, m, start=1, end=20):
+    '''Generates random directed graph with weights in [start, end]'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(start, end)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+
+class TestShortestPaths(unittest.TestCase):
+    def test_properties(self):
+        '''Tests the cached graph properties'''
+        g = {0: [(1, 1), (2, 1)], 1: [(2, 1)], 2: []}
+        props = SP.graph_properties(g)
+
+        self.assertEqual(props.num_nodes, 3)
+        self.assertEqual(props.num_edges, 3)
+        self.assertTrue(props.is_acyclic)
+        self.assertTrue(props.is_unit)
+        self.assertTrue(props.is_binary)
+        self.assertFalse(props.has_negative)
+        self.assertListEqual(props.topo_order, [0, 1, 2])
+        self.assertIs(SP.graph_properties(g), props)
+
+        g[3] = []
+        self.assertEqual(SP.graph_properties(g).num_nodes, 4)
+
+    def test_engine_selection(self):
+        '''Tests each kind of graph is routed to the right engine'''
+        dag = {0: [(1, -2)], 1: [(2, 3)], 2: []}
+        cyclic = {0: [(1, 2)], 1: [(0, 3), (2, 4)], 2: []}
+        negative = {0: [(1, 2)], 1: [(0, 3), (2, -4)], 2: []}
+
+        self.assertEqual(SP.select_engine(dag), 'dag')
+        self.assertEqual(SP.select_engine(cyclic), 'dijkstra')
+        self.assertEqual(SP.select_engine(negative), 'bellman_ford')
+
+        dist, engine = SP.shortest_paths(negative, 0, 2, return_engine=True)
+        self.assertEqual(dist, -2)
+        self.assertEqual(engine, 'bellman_ford')
+
+    def test_vs_networkx(self):
+        '''Tests every engine against NetworkX on random graphs'''
+        for _ in range(50):
+            g, nx_g = gen_rand_graph(30, 90, start=-3)
+            try:
+                nx_dists = nx.single_source_bellman_ford_path_length(nx_g, 0)
+            except nx.NetworkXUnbounded:
+                with self.assertRaises(SP.NegativeCycleError):
+                    SP.shortest_paths(g, 0)
+                continue
+
+            self.assertDictEqual(SP.shortest_paths(g, 0), nx_dists)
+            SP.clear_cache(g)
+
+        for _ in range(50):
+            g, nx_g = gen_rand_graph(30, 90)
+            nx_dists = nx.single_source_dijkstra_path_length(nx_g, 0)
+            dists, engine = SP.shortest_paths(g, 0, return_engine=True)
+
+            self.assertDictEqual(dists, nx_dists)
+            for node, path in SP.shortest_paths(g, 0, paths=True).items():
+                self.assertEqual(nx.path_weight(nx_g, path, 'weight'),
+                                 nx_dists[node])
+
+    def test_non_int_nodes(self):
+        '''Tests negative weights work with nodes that aren't 0..V-1'''
+        g = {'a': [('b', 4), ('c', 1)], 'b': [('a', 1), ('d', -3)],
+             'c': [('b', 1)], 'd': []}
+
+        self.assertEqual(SP.select_engine(g), 'bellman_ford')
+        self.assertEqual(SP.shortest_paths(g, 'a', 'd'), -1)
+        self.assertListEqual(SP.shortest_paths(g, 'a', 'd', paths=True),
+                             ['a', 'c', 'b', 'd'])
+
+    def test_no_path(self):
+        '''Tests NoPathError can be caught as either engine's error'''
+        g = {0: [(1, 2)], 1: [(0, 1)], 2: []}
+
+        with self.assertRaises(BF.NoPathError):
+            SP.shortest_paths(g, 0, 2)
+        with self.assertRaises(Dijkstra.NoPathError):
+            SP.shortest_paths(g, 0, 2, paths=True)
+        with self.assertRaises(ValueError):
+            SP.shortest_paths(g, 0, 3)
+
+    def test_cache_invalidation(self):
+        '''Tests added edges are noticed on their own and changed weights
+        after invalidate()
+        '''
+        g = {0: [(1, 2)], 1: [(2, 3)], 2: [(0, 5)]}
+        self.assertEqual(SP.select_engine(g), 'dijkstra')
+        self.assertEqual(SP.shortest_paths(g, 0, 2), 5)
+
+        g[1][0] = (2, -4)
+        self.assertEqual(SP.select_engine(g), 'dijkstra')
+        SP.invalidate(g)
+        self.assertEqual(SP.select_engine(g), 'bellman_ford')
+        self.assertEqual(SP.shortest_paths(g, 0, 2), -2)
+
+        g[2].append((1, 1))
+        self.assertEqual(SP.graph_properties(g).num_edges, 4)
+        with self.assertRaises(SP.NegativeCycleError):
+            SP.shortest_paths(g, 0)
+
+        g[3] = []
+        self.assertEqual(SP.graph_properties(g).num_nodes, 4)
+
+    def test_target_early_exit(self):
+        '''Tests queries with a target stop once it is settled and give
+        the same results as the full search
+        '''
+        scanned = []
+        class Recording(dict):
+            def __getitem__(self, v):
+                scanned.append(v)
+                return dict.__getitem__(self, v)
+
+        chains = {
+            'bfs': [1] * 99,
+            'zero_one_bfs': [0, 1] * 49 + [1],
+            'dag': list(range(99, 0, -1)),
+            'dijkstra': list(range(99, 0, -1)),
+        }
+        for engine, weights in chains.items():
+            g = Recording({v: [(v + 1, w)] for v, w in enumerate(weights)})
+            g[99] = []
+            if engine == 'dijkstra':
+                g[99] = [(0, 1)]
+            SP.reachability_index(g)
+
+            del scanned[:]
+            dist, used = SP.shortest_paths(g, 0, 5, return_engine=True)
+            self.assertEqual(used, engine)
+            self.assertEqual(dist, sum(weights[:5]))
+            self.assertLess(len(scanned), 10)
+            self.assertListEqual(SP.shortest_paths(g, 0, 5, paths=True),
+                                 [0, 1, 2, 3, 4, 5])
+            self.assertEqual(SP.shortest_paths(g, 0)[5], dist)
+
+    def test_cache_bounded(self):
+        '''Tests only the last CACHE_SIZE graphs are kept alive'''
+        SP.clear_cache()
+        refs = []
+        for i in range(SP.CACHE_SIZE * 3):
+            g = {0: [(1, i + 1)], 1: []}
+            SP.shortest_paths(g, 0)
+            refs.append(g)
+        self.assertEqual(len(SP._cache), SP.CACHE_SIZE)
+        self.assertIs(SP._cache[id(refs[-1])][0], refs[-1])
+
+    def test_infinite_weight(self):
+        '''Tests infinite weights don't break the property scan'''
+        g = {0: [(1, float('inf')), (2, 1)], 1: [], 2: [(0, 1)]}
+        self.assertFalse(SP.graph_properties(g).is_integer)
+        self.assertEqual(SP.shortest_paths(g, 0, 2), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
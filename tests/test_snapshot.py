@@ -0,0 +1,169 @@
+import os
+import unittest
+import random
+import tempfile
+import numpy as np
+import networkx as nx
+import src.Dijkstra as Dijkstra
+from src.Reachability import ReachabilityIndex
+from src.Snapshot import (save_snapshot, load_snapshot, graph_fingerprint,
+                          SnapshotError, StaleSnapshotError)
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, rng.randint(0, 20)))
+    return g
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(), 'graph.snap')
+
+    def test_round_trip(self):
+        '''Tests trees, tables and both kinds of reachability labels'''
+        g = gen_rand_graph(200, 300)
+        trees = {}
+        for s in (0, 17, 150):
+            index, nodes, dist, prev = Dijkstra.construct_arrays(g, s)
+            trees[s] = (dist, prev)
+        table = np.arange(12, dtype=np.int32).reshape(3, 4)
+
+        for limit in (8192, 0):
+            reach = ReachabilityIndex(g, bitset_limit=limit)
+            save_snapshot(self.path, g, reach=reach, trees=trees,
+                          arrays={'landmarks': table})
+            snap = load_snapshot(self.path, g)
+
+            self.assertEqual(sorted(snap.sources), [0, 17, 150])
+            for s in trees:
+                dist, prev = snap.tree(s)
+                np.testing.assert_array_equal(dist, trees[s][0])
+                np.testing.assert_array_equal(prev, trees[s][1])
+                for t in rng.sample(range(200), 20):
+                    try:
+                        expected = Dijkstra.dij_paths(g, s, t)
+                    except Dijkstra.NoPathError:
+                        self.assertRaises(Dijkstra.NoPathError,
+                                          snap.path, s, t)
+                    else:
+                        self.assertEqual(Dijkstra.dij(g, s, t),
+                                         dist[t])
+                        self.assertEqual(snap.path(s, t)[-1], t)
+
+            np.testing.assert_array_equal(snap.arrays['landmarks'], table)
+            self.assertEqual(snap.arrays['landmarks'].dtype, np.int32)
+
+            loaded = snap.reach
+            self.assertEqual(loaded.comp, reach.comp)
+            self.assertEqual(loaded.members, reach.members)
+            for _ in range(300):
+                s, t = rng.randrange(200), rng.randrange(200)
+                self.assertEqual(loaded.can_reach(s, t),
+                                 reach.can_reach(s, t))
+            self.assertEqual(loaded.reachable_nodes(5),
+                             reach.reachable_nodes(5))
+
+    def test_node_names(self):
+        '''Tests graphs keyed by names instead of 0..V-1'''
+        g = {'a': [('b', 1)], 'b': [('c', 2)], 'c': [], 'd': [('a', 1)]}
+        index, nodes, dist, prev = Dijkstra.construct_arrays(g, 'a')
+        save_snapshot(self.path, g, ReachabilityIndex(g),
+                      trees={'a': (dist, prev)})
+        snap = load_snapshot(self.path, g)
+        self.assertEqual(snap.path('a', 'c'), ['a', 'b', 'c'])
+        self.assertTrue(snap.reach.can_reach('d', 'c'))
+        self.assertFalse(snap.reach.can_reach('c', 'd'))
+        self.assertIsNone(load_snapshot(self.path, g).arrays.get('x'))
+
+    def test_stale(self):
+        '''Tests snapshots for a changed graph are rejected'''
+        g = gen_rand_graph(50, 100)
+        save_snapshot(self.path, g, ReachabilityIndex(g))
+
+        changed = {v: list(edges) for v, edges in g.items()}
+        changed[0].append((1, 99))
+        self.assertNotEqual(graph_fingerprint(g), graph_fingerprint(changed))
+        self.assertRaises(StaleSnapshotError, load_snapshot, self.path,
+                          changed)
+        self.assertIsNotNone(load_snapshot(self.path, g).reach)
+
+    def test_precomputed_fingerprint(self):
+        '''Tests a fingerprint given by the caller is checked in place of
+        hashing the graph
+        '''
+        g = gen_rand_graph(50, 100)
+        fingerprint = graph_fingerprint(g)
+        save_snapshot(self.path, g, ReachabilityIndex(g),
+                      fingerprint=fingerprint)
+
+        self.assertIsNotNone(
+            load_snapshot(self.path, g, fingerprint=fingerprint).reach)
+        self.assertRaises(StaleSnapshotError, load_snapshot, self.path, g,
+                          fingerprint='0' * 64)
+        smaller = {v: g[v] for v in range(49)}
+        self.assertRaises(StaleSnapshotError, load_snapshot, self.path,
+                          smaller, fingerprint=fingerprint)
+
+    def test_close(self):
+        '''Tests the memory map is released by close() and with blocks'''
+        g = gen_rand_graph(50, 100)
+        index, nodes, dist, prev = Dijkstra.construct_arrays(g, 0)
+        save_snapshot(self.path, g, trees={0: (dist, prev)},
+                      arrays={'table': np.arange(10)})
+
+        with load_snapshot(self.path, g) as snap:
+            self.assertEqual(snap.arrays['table'].sum(), 45)
+            self.assertFalse(snap.closed)
+        self.assertTrue(snap.closed)
+        self.assertEqual(snap.sources, [])
+        snap.close()
+
+        snap = load_snapshot(self.path, g)
+        table = snap.arrays['table']
+        self.assertRaises(BufferError, snap.close)
+        self.assertTrue(snap.closed)
+        self.assertEqual(table.sum(), 45)
+
+    def test_bad_files(self):
+        '''Tests files that aren't snapshots'''
+        with open(self.path, 'wb') as f:
+            f.write(b'not a snapshot at all')
+        self.assertRaises(SnapshotError, load_snapshot, self.path, {})
+
+        open(self.path, 'wb').close()
+        self.assertRaises(SnapshotError, load_snapshot, self.path, {})
+
+        save_snapshot(self.path, {})
+        with open(self.path, 'r+b') as f:
+            f.seek(8)
+            f.write(b'\x63\0\0\0')
+        self.assertRaises(SnapshotError, load_snapshot, self.path, {})
+
+    def test_corrupt_files(self):
+        '''Tests truncated files and broken headers raise SnapshotError'''
+        g = gen_rand_graph(50, 100)
+        save_snapshot(self.path, g, ReachabilityIndex(g),
+                      arrays={'table': np.arange(1000)})
+        with open(self.path, 'rb') as f:
+            data = f.read()
+
+        header_end = data.index(b'}}}') + 3
+        for broken in (data[:header_end + 16],   # array data cut off
+                       data[:header_end - 10],   # header cut off
+                       data.replace(b'"arrays"', b'"arrayz"'),
+                       data.replace(b'"fingerprint": ', b'"fingerprint" ')):
+            with open(self.path, 'wb') as f:
+                f.write(broken)
+            self.assertRaises(SnapshotError, load_snapshot, self.path, g)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import unittest
+import random
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse import csgraph
+import src.Dijkstra as Dijkstra
+import src.BellmanFord as BF
+from src.SparseGraph import CSRGraph, as_graph
+
+SEED = 47
+rng = random.Random(SEED)
+np_rng = np.random.default_rng(SEED)
+
+
+def gen_rand_edges(n, m, start=1, end=20):
+    '''Generates random (src, dst, weight) edge arrays without repeated
+    edges, since building a scipy matrix adds them up
+    '''
+    pairs = list({(rng.randrange(n), rng.randrange(n))
+                  for _ in range(m)})
+    rng.shuffle(pairs)
+    src = np.array([v for v, u in pairs], dtype=np.int64)
+    dst = np.array([u for v, u in pairs], dtype=np.int64)
+    weight = np_rng.integers(start, end + 1, len(pairs))
+    return src, dst, weight
+
+def to_dict(n, src, dst, weight):
+    '''Builds the graph dict of the edge arrays'''
+    g = {node: [] for node in range(n)}
+    for v, u, w in zip(src.tolist(), dst.tolist(), weight.tolist()):
+        g[v].append((u, w))
+    return g
+
+
+class TestSparseGraph(unittest.TestCase):
+    def test_vs_dict(self):
+        '''Tests matrices and edge arrays give the same results as the
+        graph dict and scipy
+        '''
+        for _ in range(50):
+            n = rng.randint(1, 40)
+            edges = gen_rand_edges(n, rng.randint(0, 3 * n))
+            g = to_dict(n, *edges)
+            matrix = sp.csr_matrix((edges[2], (edges[0], edges[1])),
+                                   shape=(n, n))
+            s = rng.randrange(n)
+
+            expected = Dijkstra.dij(g, s)
+            for graph in (matrix, matrix.tocoo(),
+                          CSRGraph.from_edges(*edges, num_nodes=n)):
+                self.assertDictEqual(Dijkstra.dij(graph, s), expected)
+                self.assertDictEqual(BF.bellman_ford(graph, s),
+                                     BF.bellman_ford(g, s))
+
+                paths = Dijkstra.dij_paths(graph, s)
+                bf = BF.bf_paths(graph, s)
+                for t in range(n):
+                    if expected[t] == float('inf'):
+                        self.assertEqual(paths[t], [])
+                        self.assertEqual(bf[t], [])
+                    else:
+                        self.assertEqual((paths[t][0], paths[t][-1]), (s, t))
+                        self.assertEqual((bf[t][0], bf[t][-1]), (s, t))
+
+            reference = csgraph.dijkstra(matrix, indices=s)
+            np.testing.assert_allclose(list(expected.values()), reference)
+
+    def test_negative_weights(self):
+        '''Tests Bellman Ford on a matrix with negative weights'''
+        edges = (np.array([0, 0, 1, 2]), np.array([1, 2, 3, 1]),
+                 np.array([4.0, 1.0, -3.0, 1.0]))
+        self.assertEqual(BF.bellman_ford(edges, 0),
+                         {0: 0, 1: 2, 2: 1, 3: -1})
+        self.assertEqual(BF.bf_paths(edges, 0, 3), [0, 2, 1, 3])
+
+        cycle = sp.csr_matrix(([1.0, -2.0, 1.0], ([0, 1, 2], [1, 2, 1])),
+                              shape=(3, 3))
+        self.assertRaises(BF.NegativeCycleError, BF.bellman_ford, cycle, 0)
+
+    def test_zero_copy(self):
+        '''Tests the CSR arrays are shared, not copied'''
+        matrix = sp.random(50, 50, density=0.1, format='csr',
+                           random_state=np_rng)
+        graph = as_graph(matrix)
+        self.assertIsInstance(graph, CSRGraph)
+        self.assertTrue(np.shares_memory(graph.indices, matrix.indices))
+        self.assertTrue(np.shares_memory(graph.data, matrix.data))
+        self.assertIs(as_graph(graph), graph)
+
+        g = {0: []}
+        self.assertIs(as_graph(g), g)
+
+    def test_from_edges(self):
+        '''Tests edge arrays keep duplicate and zero weight edges'''
+        graph = CSRGraph.from_edges([2, 0, 2, 0], [1, 2, 1, 1],
+                                    [5, 0, 3, 9], num_nodes=4)
+        self.assertEqual(len(graph), 4)
+        self.assertEqual(dict(graph), {0: [(2, 0), (1, 9)], 1: [],
+                                       2: [(1, 5), (1, 3)], 3: []})
+        self.assertEqual(Dijkstra.dij(graph, 0, 1), 3)
+        self.assertNotIn(4, graph)
+        self.assertRaises(KeyError, graph.__getitem__, -1)
+        self.assertEqual(list(graph.lazy[2]), [(1, 5), (1, 3)])
+        self.assertRaises(KeyError, graph.lazy.__getitem__, 4)
+
+    def test_numpy_ids(self):
+        '''Tests NumPy integer sources and targets, as read from the
+        arrays, are accepted
+        '''
+        edges = (np.array([0, 0, 1, 2]), np.array([1, 2, 3, 1]),
+                 np.array([4.0, 1.0, -3.0, 1.0]))
+        s, t = edges[0][0], edges[1][2]
+        self.assertIsInstance(s, np.int64)
+        self.assertEqual(BF.bellman_ford(edges, s, t), -1)
+        self.assertEqual(BF.bf_paths(edges, s, t), [0, 2, 1, 3])
+        matrix = sp.csr_matrix((edges[2].clip(0), edges[:2]), shape=(4, 4))
+        self.assertEqual(Dijkstra.dij(matrix, s, t), 2)
+        self.assertRaises(TypeError, BF.bellman_ford, edges, 0.0)
+
+    def test_invalid(self):
+        '''Tests bad matrices and edge arrays'''
+        self.assertRaises(ValueError, as_graph, sp.csr_matrix((2, 3)))
+        self.assertRaises(ValueError, CSRGraph.from_edges, [0, 1], [1], [1])
+        self.assertRaises(ValueError, CSRGraph.from_edges, [0], [5], [1],
+                          num_nodes=3)
+        self.assertRaises(ValueError, CSRGraph.from_edges, [-1], [0], [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
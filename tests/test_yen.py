@@ -0,0 +1,64 @@
+import unittest
+import random
+import itertools
+import networkx as nx
+import src.Dijkstra as Dijkstra
+import src.Yen as Yen
+
+SEED = 47
+rng = random.Random(SEED)
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with random weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=rng)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = rng.randint(1, 20)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+
+class TestYen(unittest.TestCase):
+    def test_vs_networkx(self):
+        '''Tests the k shortest distances match NetworkX's simple paths'''
+        for _ in range(30):
+            g, nx_g = gen_rand_graph(25, 80)
+            if not nx.has_path(nx_g, 0, 24):
+                continue
+
+            nx_paths = itertools.islice(
+                nx.shortest_simple_paths(nx_g, 0, 24, weight='weight'), 10)
+            nx_dists = [nx.path_weight(nx_g, p, 'weight') for p in nx_paths]
+
+            for use_reverse in (True, False):
+                paths = Yen.k_shortest_paths(g, 0, 24, 10,
+                                             use_reverse=use_reverse)
+                self.assertListEqual([d for d, p in paths], nx_dists)
+                for dist, path in paths:
+                    self.assertEqual(len(set(path)), len(path))
+                    self.assertEqual(nx.path_weight(nx_g, path, 'weight'),
+                                     dist)
+
+    def test_fewer_than_k(self):
+        '''Tests every path is returned when there are fewer than k'''
+        g = {0: [(1, 1), (2, 2)], 1: [(3, 1)], 2: [(3, 1)], 3: []}
+
+        self.assertListEqual(Yen.k_shortest_paths(g, 0, 3, 5),
+                             [(2, [0, 1, 3]), (3, [0, 2, 3])])
+        self.assertListEqual(Yen.k_shortest_paths(g, 0, 0, 5), [(0, [0])])
+
+    def test_no_path(self):
+        '''Tests NoPathError is raised when there is no path'''
+        g = {0: [(1, 1)], 1: [], 2: []}
+
+        with self.assertRaises(Dijkstra.NoPathError):
+            Yen.k_shortest_paths(g, 0, 2, 3)
+        with self.assertRaises(Dijkstra.NoPathError):
+            Yen.k_shortest_paths(g, 0, 2, 3, use_reverse=False)
+
+
+if __name__ == '__main__':
+    unittest.main()
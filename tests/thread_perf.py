@@ -0,0 +1,66 @@
+# Benchmarks multi threaded query throughput on a FrozenGraph
+#
+# Runs the same batch of point to point Dijkstra queries from thread
+# pools of increasing size. With the GIL the throughput stays about
+# flat, on a free threaded (no GIL) CPython build it should scale with
+# the number of cores
+#
+# Outputs:
+#     - Python build and whether the GIL is enabled
+#     - Time and queries per second for each number of threads
+import os
+import sys
+import time
+import random
+import concurrent.futures
+import networkx as nx
+import src.Dijkstra as Dijkstra
+from src.FrozenGraph import FrozenGraph
+
+N = 20000
+M = 80000
+QUERIES = 2000
+THREADS = [1, 2, 4, 8]
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph with random weights'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=0)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        g[u].append((v, random.randint(1, 20)))
+    return g
+
+def query(fg, s, t):
+    try:
+        return fg.dij(s, t)
+    except Dijkstra.NoPathError:
+        return None
+
+def run(fg, queries, threads):
+    '''Returns time to answer every query with a pool of threads'''
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as pool:
+        t0 = time.perf_counter()
+        list(pool.map(lambda q: query(fg, *q), queries, chunksize=16))
+        t1 = time.perf_counter()
+
+    return t1 - t0
+
+
+random.seed(0)
+fg = FrozenGraph(gen_rand_graph(N, M))
+queries = [(random.randrange(N), random.randrange(N))
+           for _ in range(QUERIES)]
+gil = sys._is_gil_enabled() if hasattr(sys, '_is_gil_enabled') else True
+
+print('----- Threaded Queries (n=%i m=%i, %i queries) -----\n'
+      % (N, M, QUERIES))
+print('Python %s, GIL %s, %i cores\n'
+      % (sys.version.split()[0], 'enabled' if gil else 'disabled',
+         os.cpu_count() or 1))
+run(fg, queries[:100], 1)  # warm up
+for threads in THREADS:
+    elapsed = run(fg, queries, threads)
+    print('%2i threads              --> %f (%.0f queries/s)'
+          % (threads, elapsed, QUERIES / elapsed))
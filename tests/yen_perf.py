@@ -0,0 +1,96 @@
+# Benchmarks our Yen's k shortest paths versus NetworkX's
+# shortest_simple_paths and a naive Yen that copies the graph per spur
+#
+# Compares:
+#     - Yen with the reverse tree vs. without it
+#     - Our Yen vs. NetworkX shortest_simple_paths
+#     - Our Yen vs. naive Yen calling dij_paths on graph copies
+#
+# Outputs:
+#     - Average time per query for each
+import time
+import random
+import itertools
+import networkx as nx
+import src.Dijkstra as Dijkstra
+import src.Yen as Yen
+
+SIZES = [(200, 1000), (1000, 5000), (5000, 25000)]
+K = 10
+QUERIES = 5
+
+
+def gen_rand_graph(n, m):
+    '''Generates random directed graph and a NetworkX version'''
+    nx_g = nx.gnm_random_graph(n, m, directed=True, seed=n)
+    g = {node: [] for node in nx_g}
+
+    for u, v in nx_g.edges:
+        w = random.randint(1, 20)
+        g[u].append((v, w))
+        nx_g.edges[u, v]['weight'] = w
+    return (g, nx_g)
+
+def naive_yen(g, s, t, k):
+    '''Yen's algorithm that copies the graph for every spur search'''
+    paths = [Dijkstra.dij_paths(g, s, t)]
+    candidates = []
+
+    while len(paths) < k:
+        last = paths[-1]
+        for i in range(len(last) - 1):
+            root = last[:i + 1]
+            copy = {v: [(u, w) for u, w in edges
+                        if u not in root[:-1]]
+                    for v, edges in g.items() if v not in root[:-1]}
+            for p in paths:
+                if p[:i + 1] == root and len(p) > i + 1:
+                    copy[p[i]] = [(u, w) for u, w in copy[p[i]]
+                                  if u != p[i + 1]]
+            try:
+                path = root[:-1] + Dijkstra.dij_paths(copy, last[i], t)
+            except Dijkstra.NoPathError:
+                continue
+            if path not in candidates and path not in paths:
+                candidates.append(path)
+        if not candidates:
+            break
+        candidates.sort(key=lambda p: sum(dict(g[v])[u]
+                                          for v, u in zip(p, p[1:])))
+        paths.append(candidates.pop(0))
+    return paths
+
+def avg_time(func, queries):
+    '''Returns average time of func over the queries'''
+    t0 = time.perf_counter()
+    for s, t in queries:
+        func(s, t)
+    t1 = time.perf_counter()
+
+    return (t1 - t0) / len(queries)
+
+
+random.seed(0)
+print('----- Time to Find %i Shortest Paths -----\n' % K)
+for n, m in SIZES:
+    g, nx_g = gen_rand_graph(n, m)
+    queries = []
+    while len(queries) < QUERIES:
+        s, t = random.randrange(n), random.randrange(n)
+        if s != t and nx.has_path(nx_g, s, t):
+            queries.append((s, t))
+
+    yen = avg_time(lambda s, t: Yen.k_shortest_paths(g, s, t, K), queries)
+    yen_fwd = avg_time(lambda s, t: Yen.k_shortest_paths(
+        g, s, t, K, use_reverse=False), queries)
+    nx_yen = avg_time(lambda s, t: list(itertools.islice(
+        nx.shortest_simple_paths(nx_g, s, t, weight='weight'), K)), queries)
+    naive = avg_time(lambda s, t: naive_yen(g, s, t, K), queries)
+
+    print('n=%i m=%i' % (n, m))
+    print('Our Yen (reverse tree) --> %f' % yen)
+    print('Our Yen (forward only) --> %f' % yen_fwd)
+    print('NetworkX simple paths  --> %f' % nx_yen)
+    print('Naive Yen (copies)     --> %f' % naive)
+    print('Speedup vs. NetworkX: %.2fx  vs. naive: %.2fx\n'
+          % (nx_yen / yen, naive / yen))